@@ -0,0 +1,108 @@
+"""
+Event-loop latency benchmark for password hashing during a login storm.
+A minimal ASGI app exposes /ping (cheap) and /login (bcrypt verify); /ping is
+sampled while a burst of concurrent logins runs, first with bcrypt called inline
+in the handler (the previous pattern), then through modules.passwords' thread pool.
+
+    python auth_benchmark.py [logins] [rounds]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import bcrypt
+import httpx
+from fastapi import FastAPI
+
+PING_INTERVAL = 0.005
+
+
+def build_app(passwords, hashed, offloaded):
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.post("/login")
+    async def login():
+        if offloaded:
+            ok = await passwords.verify_password("hunter22", hashed)
+        else:
+            ok = bcrypt.checkpw(b"hunter22", hashed.encode("utf-8"))
+        return {"ok": ok}
+
+    return app
+
+
+def summarize(name, samples):
+    samples = sorted(samples)
+    p95 = samples[max(0, int(len(samples) * 0.95) - 1)]
+    print(f"{name:<22} /ping n={len(samples):<4} p50 {statistics.median(samples) * 1000:7.1f} ms   p95 {p95 * 1000:7.1f} ms   max {samples[-1] * 1000:7.1f} ms")
+    return p95
+
+
+async def storm(app, logins):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        done = asyncio.Event()
+        samples = []
+
+        async def ping(arrival):
+            await client.get("/ping")
+            samples.append(time.perf_counter() - arrival)
+
+        async def prober():
+            # Open loop: a ping is due every 5 ms whether or not earlier ones finished,
+            # and latency is measured from when it was due, so a blocked loop counts
+            t0 = time.perf_counter()
+            tasks = []
+            i = 0
+            while not done.is_set():
+                await asyncio.sleep(PING_INTERVAL)
+                # Every ping that came due while we were away, including during a stall
+                while t0 + (i + 1) * PING_INTERVAL <= time.perf_counter():
+                    i += 1
+                    tasks.append(asyncio.create_task(ping(t0 + i * PING_INTERVAL)))
+            await asyncio.gather(*tasks)
+
+        probe = asyncio.create_task(prober())
+        await asyncio.sleep(0.05)
+        start = time.perf_counter()
+        results = await asyncio.gather(*(client.post("/login") for _ in range(logins)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await probe
+        assert all(r.json()["ok"] for r in results)
+        return samples, elapsed
+
+
+async def run(logins, rounds):
+    from modules import passwords
+
+    hashed = bcrypt.hashpw(b"hunter22", bcrypt.gensalt(rounds=rounds)).decode("utf-8")
+    print(f"{logins} concurrent logins, bcrypt rounds {rounds}, pool workers {passwords.BCRYPT_WORKERS}")
+    inline, inline_elapsed = await storm(build_app(passwords, hashed, offloaded=False), logins)
+    pooled, pooled_elapsed = await storm(build_app(passwords, hashed, offloaded=True), logins)
+    passwords.shutdown_password_pool()
+    b = summarize("inline bcrypt", inline)
+    p = summarize("thread pool", pooled)
+    print(f"storm duration: inline {inline_elapsed:.2f} s, pool {pooled_elapsed:.2f} s")
+    print(f"/ping p95 improvement: {b / p:.0f}x")
+
+
+def main():
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    os.environ.setdefault("BCRYPT_MAX_PENDING", str(logins))
+    asyncio.run(run(logins, rounds))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Skill-analysis reuse
+An analysis is fully determined by the resume, the company/role, whether DSA picks were
+asked for, and the data it was computed from (job catalog, skill taxonomy, resource
+catalog, DSA file). That tuple hashes to a memo_key stored on the analysis, so a repeat
+request returns the existing analysis instead of recomputing and inserting a duplicate.
+Each user's latest resume (id and skills) is also cached for a short TTL. The cache is only
+trusted when its id matches the latest resume id in the database, which the server reads
+with an index-only find_one, so an upload handled by another worker is seen at once.
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from modules.dsa_data import get_store as get_dsa_store
+from modules.job_data import JOB_DATABASE
+from modules.learning_resources import catalog_fingerprint
+from skills_taxonomy import SKILLS_DATABASE
+
+ANALYSIS_MEMO_SIZE = int(os.environ.get("ANALYSIS_MEMO_SIZE", "2048"))
+LATEST_RESUME_TTL = float(os.environ.get("LATEST_RESUME_TTL", "60"))
+LATEST_RESUME_CACHE_SIZE = int(os.environ.get("LATEST_RESUME_CACHE_SIZE", "10000"))
+
+# The job catalog and taxonomy are code, so their hash is fixed for the process
+_STATIC_VERSION = hashlib.sha256(
+    json.dumps([JOB_DATABASE, SKILLS_DATABASE], sort_keys=True).encode("utf-8")
+).hexdigest()[:16]
+
+
+def analysis_data_version(include_dsa: bool = False) -> str:
+    parts = [_STATIC_VERSION, catalog_fingerprint()]
+    if include_dsa:
+        parts.append(str(get_dsa_store().mtime))
+    return ":".join(parts)
+
+
+def memo_key(resume_id: str, company: str, role: str, include_dsa: bool = False) -> str:
+    raw = json.dumps([
+        resume_id, company.strip().lower(), role.strip().lower(), include_dsa, analysis_data_version(include_dsa),
+    ])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+class AnalysisMemo:
+    """memo_key -> analysis (LRU), and user_id -> latest resume (TTL + LRU)."""
+
+    def __init__(self, max_analyses: int = ANALYSIS_MEMO_SIZE, resume_ttl: float = LATEST_RESUME_TTL,
+                 max_resumes: int = LATEST_RESUME_CACHE_SIZE):
+        self.max_analyses = max_analyses
+        self.resume_ttl = resume_ttl
+        self.max_resumes = max_resumes
+        self._analyses: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._resumes: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.stats_counts = {
+            "memory_hits": 0, "db_hits": 0, "computed": 0,
+            "resume_hits": 0, "resume_misses": 0,
+        }
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        analysis = self._analyses.get(key)
+        if analysis is not None:
+            self._analyses.move_to_end(key)
+            self.stats_counts["memory_hits"] += 1
+        return analysis
+
+    def put(self, key: str, analysis: Dict[str, Any], computed: bool = True) -> None:
+        """Remember an analysis that was just computed, or (computed=False) found in the database."""
+        self.stats_counts["computed" if computed else "db_hits"] += 1
+        self._analyses[key] = analysis
+        self._analyses.move_to_end(key)
+        while len(self._analyses) > self.max_analyses:
+            self._analyses.popitem(last=False)
+
+    def latest_resume(self, user_id: str, resume_id: str) -> Optional[Dict[str, Any]]:
+        """The cached resume if it is still `resume_id`, the user's latest one."""
+        entry = self._resumes.get(user_id)
+        if entry is None or entry[0] <= time.monotonic() or entry[1]["id"] != resume_id:
+            self._resumes.pop(user_id, None)
+            self.stats_counts["resume_misses"] += 1
+            return None
+        self.stats_counts["resume_hits"] += 1
+        return entry[1]
+
+    def set_latest_resume(self, user_id: str, resume: Dict[str, Any]) -> None:
+        self._resumes[user_id] = (time.monotonic() + self.resume_ttl, resume)
+        self._resumes.move_to_end(user_id)
+        while len(self._resumes) > self.max_resumes:
+            self._resumes.popitem(last=False)
+
+    def forget_user(self, user_id: str) -> None:
+        self._resumes.pop(user_id, None)
+        # Keep none of a deleted account's analyses in memory
+        self._analyses = OrderedDict((k, a) for k, a in self._analyses.items() if a.get("user_id") != user_id)
+
+    def stats(self) -> Dict[str, Any]:
+        c = self.stats_counts
+        requests = c["memory_hits"] + c["db_hits"] + c["computed"]
+        resume_lookups = c["resume_hits"] + c["resume_misses"]
+        return {
+            **c,
+            "hit_rate": round((c["memory_hits"] + c["db_hits"]) / requests, 3) if requests else 0.0,
+            "resume_hit_rate": round(c["resume_hits"] / resume_lookups, 3) if resume_lookups else 0.0,
+            "entries": len(self._analyses),
+        }
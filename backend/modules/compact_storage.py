@@ -0,0 +1,120 @@
+"""
+Compact storage for resumes and analyses
+Resume text is zlib-compressed into a side collection (resume_texts) and only read
+when asked for. Roadmap/resource bundles are stored once per content hash in
+learning_bundles; analyses keep just the bundle_id and are expanded on read.
+"""
+
+import hashlib
+import json
+import os
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bson import Binary
+
+RESUME_TEXT_LEVEL = int(os.environ.get("RESUME_TEXT_LEVEL", "6"))
+BUNDLE_LRU_SIZE = int(os.environ.get("BUNDLE_LRU_SIZE", "1024"))
+
+_bundle_stats = {"stored": 0, "deduplicated": 0, "read_hits": 0, "read_misses": 0}
+# bundle_id -> {learning_roadmap, learning_resources}; bundles are immutable, so no expiry
+_bundles: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+
+def compress_text(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), RESUME_TEXT_LEVEL)
+
+
+def decompress_text(blob: bytes) -> str:
+    return zlib.decompress(blob).decode("utf-8")
+
+
+async def store_resume_text(collection, resume_id: str, user_id: str, text: str) -> None:
+    await collection.insert_one({
+        "resume_id": resume_id,
+        "user_id": user_id,
+        "encoding": "zlib",
+        "text": Binary(compress_text(text)),
+        "length": len(text),
+    })
+
+
+async def load_resume_text(collection, resume: Dict[str, Any]) -> Optional[str]:
+    """Full text of a resume; older documents still carry it inline."""
+    if "text" in resume:
+        return resume["text"]
+    doc = await collection.find_one({"resume_id": resume["id"]}, {"_id": 0, "text": 1})
+    return decompress_text(doc["text"]) if doc else None
+
+
+def bundle_id(roadmap: str, resources: Optional[Dict[str, List[Dict[str, Any]]]]) -> str:
+    canonical = json.dumps([roadmap, resources], sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+def _remember(bid: str, bundle: Dict[str, Any]) -> None:
+    _bundles[bid] = bundle
+    _bundles.move_to_end(bid)
+    while len(_bundles) > BUNDLE_LRU_SIZE:
+        _bundles.popitem(last=False)
+
+
+async def store_bundle(collection, roadmap: str, resources: Optional[Dict[str, List[Dict[str, Any]]]]) -> str:
+    """Content-addressed upsert of a roadmap/resources bundle; returns its id."""
+    bid = bundle_id(roadmap, resources)
+    if bid in _bundles:
+        _bundle_stats["deduplicated"] += 1
+        return bid
+    result = await collection.update_one(
+        {"_id": bid},
+        {"$setOnInsert": {
+            "learning_roadmap": roadmap,
+            "learning_resources": resources,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }},
+        upsert=True,
+    )
+    _bundle_stats["stored" if result.upserted_id is not None else "deduplicated"] += 1
+    _remember(bid, {"learning_roadmap": roadmap, "learning_resources": resources})
+    return bid
+
+
+async def expand_bundles(collection, analyses: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Inline learning_roadmap/learning_resources into analyses that reference a bundle_id."""
+    analyses = list(analyses)
+    wanted = {a["bundle_id"] for a in analyses if "bundle_id" in a}
+    missing = [bid for bid in wanted if bid not in _bundles]
+    _bundle_stats["read_hits"] += len(wanted) - len(missing)
+    _bundle_stats["read_misses"] += len(missing)
+    if missing:
+        async for doc in collection.find({"_id": {"$in": missing}}):
+            _remember(doc["_id"], {
+                "learning_roadmap": doc["learning_roadmap"],
+                "learning_resources": doc.get("learning_resources"),
+            })
+    for a in analyses:
+        bid = a.pop("bundle_id", None)
+        if bid is not None:
+            a.update(_bundles.get(bid, {"learning_roadmap": "", "learning_resources": None}))
+    return analyses
+
+
+def split_analysis(doc: Dict[str, Any]) -> Tuple[Dict[str, Any], str, Optional[Dict[str, Any]]]:
+    """(analysis without the bundle fields, roadmap, resources)."""
+    doc = dict(doc)
+    roadmap = doc.pop("learning_roadmap")
+    resources = doc.pop("learning_resources", None)
+    return doc, roadmap, resources
+
+
+def bundle_store_stats() -> Dict[str, Any]:
+    writes = _bundle_stats["stored"] + _bundle_stats["deduplicated"]
+    reads = _bundle_stats["read_hits"] + _bundle_stats["read_misses"]
+    return {
+        **_bundle_stats,
+        "dedup_ratio": round(_bundle_stats["deduplicated"] / writes, 3) if writes else 0.0,
+        "read_hit_ratio": round(_bundle_stats["read_hits"] / reads, 3) if reads else 0.0,
+        "cached": len(_bundles),
+    }
@@ -0,0 +1,64 @@
+"""
+Declarative MongoDB index registry
+Every index the server's queries rely on, per collection. Applied at startup with
+create_indexes, which is a no-op for indexes that already exist with the same options.
+"""
+
+import logging
+from typing import Any, Dict, List, Tuple
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from modules.news_feed import NEWS_RETENTION
+
+logger = logging.getLogger(__name__)
+
+IndexSpec = Tuple[List[Tuple[str, int]], Dict[str, Any]]
+
+# Per-user history, newest first, keyset-paginated on (created_at, id)
+USER_HISTORY: IndexSpec = ([("user_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], {})
+
+INDEXES: Dict[str, List[IndexSpec]] = {
+    "users": [
+        # Login / identity lookups; also makes concurrent registrations of one email fail
+        ([("email", ASCENDING)], {"unique": True}),
+        ([("id", ASCENDING)], {"unique": True}),
+    ],
+    "resumes": [USER_HISTORY],
+    "resume_texts": [
+        ([("resume_id", ASCENDING)], {"unique": True}),
+        ([("user_id", ASCENDING)], {}),
+    ],
+    "skill_analyses": [
+        USER_HISTORY,
+        # Analysis reuse lookups; unique so concurrent identical requests store one analysis
+        ([("user_id", ASCENDING), ("memo_key", ASCENDING)],
+         {"unique": True, "partialFilterExpression": {"memo_key": {"$exists": True}}}),
+    ],
+    "career_test_results": [USER_HISTORY],
+    "dsa_progress": [
+        # One document per user; concurrent first writes fail instead of duplicating
+        ([("user_id", ASCENDING)], {"unique": True}),
+    ],
+    "news_articles": [
+        # TTL on last-seen time, the (publishedAt, id) keyset index, and the startup
+        # "first seen since" scan that rebuilds trending skills
+        ([("ingested_at", ASCENDING)], {"expireAfterSeconds": NEWS_RETENTION}),
+        ([("publishedAt", DESCENDING), ("id", DESCENDING)], {}),
+        ([("first_seen", ASCENDING)], {}),
+    ],
+}
+
+
+async def ensure_indexes(db, registry: Dict[str, List[IndexSpec]] = INDEXES) -> Dict[str, List[str]]:
+    """Create every registered index; returns collection -> index names. Failures are logged per collection."""
+    created = {}
+    for name, specs in registry.items():
+        models = [IndexModel(keys, **options) for keys, options in specs]
+        try:
+            created[name] = await db[name].create_indexes(models)
+        except OperationFailure as e:
+            # e.g. an existing index with the same keys but different options
+            logger.warning("Could not create indexes on %s: %s", name, e)
+    return created
@@ -0,0 +1,207 @@
+"""
+Sandboxed document parsing
+PDF/DOCX text extraction runs in a child process, one process per document, with
+rlimits on CPU time and address space and a wall-clock deadline enforced by the parent.
+A crafted file (decompression bomb, pathological page content) gets its own process
+killed instead of exhausting the API worker. DOCX archives are also rejected up front
+when their declared uncompressed size is too large. Every failure surfaces as
+ValueError, which the routes report as a 400.
+Children are forked from a multiprocessing forkserver that has the parsers imported
+already, so a document costs a fork rather than an interpreter start-up.
+Each user may hold at most PARSE_MAX_PER_USER of the PARSE_MAX_CONCURRENCY slots, so one
+client sending bombs cannot keep every slot busy for PARSE_CPU_SECONDS at a time. The
+default runs two children per core: the kernel then time-slices a bomb against the
+uploads beside it instead of making them queue behind it.
+"""
+
+import asyncio
+import io
+import logging
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:
+    HAS_RESOURCE = False
+
+logger = logging.getLogger(__name__)
+
+PARSE_SANDBOX_ENABLED = os.environ.get("PARSE_SANDBOX_ENABLED", "1") == "1"
+PARSE_CPU_SECONDS = int(os.environ.get("PARSE_CPU_SECONDS", "5"))
+PARSE_MEMORY_MB = int(os.environ.get("PARSE_MEMORY_MB", "512"))
+PARSE_TIMEOUT = float(os.environ.get("PARSE_TIMEOUT", "10"))
+PARSE_MAX_CONCURRENCY = int(os.environ.get("PARSE_MAX_CONCURRENCY", str(2 * (os.cpu_count() or 1))))
+PARSE_MAX_PER_USER = int(os.environ.get("PARSE_MAX_PER_USER", str(max(1, PARSE_MAX_CONCURRENCY // 2))))
+MAX_DOCUMENT_BYTES = int(os.environ.get("MAX_DOCUMENT_MB", "10")) * 1024 * 1024
+DOCX_MAX_UNCOMPRESSED_BYTES = int(os.environ.get("DOCX_MAX_UNCOMPRESSED_MB", "64")) * 1024 * 1024
+MAX_TEXT_CHARS = 1_000_000
+
+if "forkserver" in multiprocessing.get_all_start_methods():
+    _context = multiprocessing.get_context("forkserver")
+    _context.set_forkserver_preload(["modules.resume_parser", "modules.document_sandbox"])
+else:
+    _context = multiprocessing.get_context("spawn")
+
+
+# ---------- child process ----------
+
+def _apply_limits() -> None:
+    if not HAS_RESOURCE:
+        return
+    # CPU time restarts at zero in a forked child: SIGXCPU at the soft limit, SIGKILL a second later
+    resource.setrlimit(resource.RLIMIT_CPU, (PARSE_CPU_SECONDS, PARSE_CPU_SECONDS + 1))
+    memory = PARSE_MEMORY_MB * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+    resource.setrlimit(resource.RLIMIT_FSIZE, (0, 0))
+    resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+
+
+def _check_archive(file_bytes: bytes) -> None:
+    """Reject DOCX zip bombs by their declared sizes (zipfile never inflates past them)."""
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(file_bytes))
+    except zipfile.BadZipFile:
+        return  # the parser reports it
+    if sum(info.file_size for info in archive.infolist()) > DOCX_MAX_UNCOMPRESSED_BYTES:
+        raise ValueError("Document expands beyond the allowed size.")
+
+
+def parse_document(file_bytes: bytes, filename: str) -> str:
+    """extract_text with every failure turned into a ValueError (used in the child, or in-process when unsandboxed)."""
+    from modules import resume_parser
+
+    try:
+        if filename.lower().endswith(".docx"):
+            _check_archive(file_bytes)
+        return resume_parser.extract_text(file_bytes, filename)[:MAX_TEXT_CHARS]
+    except MemoryError:
+        raise ValueError("Document is too large to parse.")
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Failed to parse file: {str(e)}")
+
+
+def _parse_child(conn, file_bytes: bytes, filename: str) -> None:
+    from modules import resume_parser
+
+    _apply_limits()
+    if resume_parser.HAS_PYMUPDF:
+        # Hostile PDFs produce a stream of MuPDF errors; keep them out of the server log
+        resume_parser.fitz.TOOLS.mupdf_display_errors(False)
+    try:
+        result = {"text": parse_document(file_bytes, filename)}
+    except ValueError as e:
+        result = {"error": str(e)}
+    conn.send(result)
+    conn.close()
+
+
+# ---------- parent ----------
+
+class DocumentSandbox:
+    """Runs extract_text in rlimited child processes, at most max_concurrency at a time (max_per_user per user)."""
+
+    def __init__(self, timeout: float = PARSE_TIMEOUT, max_concurrency: int = PARSE_MAX_CONCURRENCY,
+                 max_bytes: int = MAX_DOCUMENT_BYTES, max_per_user: int = PARSE_MAX_PER_USER):
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.max_bytes = max_bytes
+        self.max_per_user = min(max_per_user, max_concurrency)
+        self._slots = asyncio.Semaphore(max_concurrency)
+        # user -> [semaphore, requests holding or waiting for it]; dropped when unused
+        self._user_slots: Dict[str, list] = {}
+        # Threads that start children and wait on their pipes
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stats = {"parsed": 0, "rejected": 0, "timeouts": 0, "limit_kills": 0, "user_waits": 0}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="parse")
+        return self._executor
+
+    async def start(self) -> None:
+        """Start the forkserver now rather than on the first upload."""
+        if _context.get_start_method() == "forkserver":
+            from multiprocessing import forkserver
+
+            await asyncio.get_running_loop().run_in_executor(self._get_executor(), forkserver.ensure_running)
+
+    def _run(self, file_bytes: bytes, filename: str) -> Optional[Dict[str, Any]]:
+        """Parse in a child; None if it was killed or overran the deadline."""
+        receiver, sender = _context.Pipe(duplex=False)
+        proc = _context.Process(target=_parse_child, args=(sender, file_bytes, filename), daemon=True)
+        answered = False
+        try:
+            proc.start()
+            sender.close()
+            if not receiver.poll(self.timeout):
+                self._stats["timeouts"] += 1
+                logger.warning("Parsing %s overran the %.0fs deadline", filename, self.timeout)
+                return None
+            try:
+                result = receiver.recv()
+                answered = True
+                return result
+            except (EOFError, OSError):
+                # Died without answering: SIGXCPU, SIGKILL, or the address-space limit
+                proc.join(1.0)
+                self._stats["limit_kills"] += 1
+                logger.warning("Parsing %s stopped at the sandbox limits (exit code %s)", filename, proc.exitcode)
+                return {"error": "Document exceeded the parsing limits."}
+        finally:
+            receiver.close()
+            if answered:
+                proc.join(1.0)  # exits on its own once it has answered
+            if proc.is_alive():
+                proc.kill()
+            proc.join()
+
+    @asynccontextmanager
+    async def _user_slot(self, user_id: Optional[str]):
+        """Hold one of `user_id`'s max_per_user slots (no limit without a user)."""
+        if user_id is None:
+            yield
+            return
+        entry = self._user_slots.setdefault(user_id, [asyncio.Semaphore(self.max_per_user), 0])
+        entry[1] += 1
+        try:
+            if entry[0].locked():
+                self._stats["user_waits"] += 1
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._user_slots[user_id]
+
+    async def extract_text(self, file_bytes: bytes, filename: str, user_id: Optional[str] = None) -> str:
+        """Text of a PDF/DOCX; raises ValueError if it is rejected, fails, or hits a limit."""
+        if len(file_bytes) > self.max_bytes:
+            self._stats["rejected"] += 1
+            raise ValueError(f"File is too large (max {self.max_bytes // (1024 * 1024)} MB).")
+        async with self._user_slot(user_id), self._slots:
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), self._run, file_bytes, filename
+            )
+        if result is None:
+            raise ValueError("Document took too long to parse.")
+        if "error" in result:
+            self._stats["rejected"] += 1
+            raise ValueError(result["error"])
+        self._stats["parsed"] += 1
+        return result["text"]
+
+    async def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "active_users": len(self._user_slots), "start_method": _context.get_start_method()}
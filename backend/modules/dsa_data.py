@@ -1,37 +1,208 @@
 """
 Module 3: DSA Tracker by Company
 Loads problems from dsa_problems.json (Striver SDE Sheet / Love Babbar 450 style)
+The file is parsed once into an in-memory index (company -> topic -> problems, case-folded keys)
+and reloaded atomically when its mtime changes.
 """
 
+import hashlib
 import json
+import logging
+import os
+import threading
+import time
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
 
 ROOT = Path(__file__).resolve().parent.parent
 DSA_JSON = ROOT / "data" / "dsa_problems.json"
+# Append-only problem ID -> bit ordinal registry; keeps progress bitmaps stable across data changes.
+# Generated offline with `python -m modules.dsa_data` whenever dsa_problems.json gains problems;
+# the server only reads it.
+DSA_ID_REGISTRY = ROOT / "data" / "dsa_problem_ids.json"
 
+# How often (seconds) to stat the file for changes
+DSA_RELOAD_CHECK_INTERVAL = float(os.environ.get("DSA_RELOAD_CHECK_INTERVAL", "5"))
 
-def load_dsa_problems() -> List[Dict[str, Any]]:
-    """Load DSA problems from JSON."""
+
+def normalize_problem_url(url: str) -> str:
+    """Canonical form of a problem URL: lowercase host + path, no scheme/www/query/trailing slash."""
+    parsed = urlparse(url.strip().lower())
+    host = parsed.netloc.removeprefix("www.")
+    return f"{host}{parsed.path.rstrip('/')}"
+
+
+def problem_id(url: str) -> str:
+    """Stable problem ID: the LeetCode slug (e.g. 'two-sum'), else a hash of the normalised URL."""
+    normalized = normalize_problem_url(url)
+    host, _, path = normalized.partition("/")
+    if host == "leetcode.com" and path.startswith("problems/"):
+        return path.rsplit("/", 1)[-1]
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:12]
+
+
+class DSAStore:
+    """Immutable snapshot of dsa_problems.json with lookup indexes."""
+
+    def __init__(self, data: List[Dict[str, Any]], mtime: float, ordinals: Optional[Dict[str, int]] = None):
+        self.data = data
+        self.mtime = mtime
+        # problem ID -> bit ordinal (new IDs are appended, existing ones never move)
+        self.ordinals: Dict[str, int] = dict(ordinals or {})
+        self.new_ids = 0
+        # Canonical problem table (one entry per normalised URL) and reverse references
+        self.problems: Dict[str, Dict[str, Any]] = {}
+        self.id_by_url: Dict[str, str] = {}
+        self.problem_refs: Dict[str, Dict[str, List[str]]] = {}
+        # company key -> topic key -> [{topic, problems}] chunks in file order
+        self.by_company: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        self.chunks_by_company: Dict[str, List[Dict[str, Any]]] = {}
+        # Bitmasks of problem ordinals, for popcount-based progress
+        self.company_masks: Dict[str, int] = {}
+        self.topic_masks: Dict[Tuple[str, str], int] = {}
+        self.company_names: Dict[str, str] = {}
+        topic_names: Dict[str, Dict[str, str]] = {}
+
+        for d in data:
+            company_key = d["company"].casefold()
+            topic_key = d["topic"].casefold()
+            problems = []
+            for p in d.get("problems", []):
+                pid = problem_id(p["url"])
+                if pid not in self.ordinals:
+                    self.ordinals[pid] = len(self.ordinals)
+                    self.new_ids += 1
+                problem = self.problems.setdefault(pid, {"id": pid, **p})
+                self.id_by_url[normalize_problem_url(p["url"])] = pid
+                topics = self.problem_refs.setdefault(pid, {}).setdefault(d["company"], [])
+                if d["topic"] not in topics:
+                    topics.append(d["topic"])
+                problems.append(problem)
+                bit = 1 << self.ordinals[pid]
+                self.company_masks[company_key] = self.company_masks.get(company_key, 0) | bit
+                self.topic_masks[(company_key, topic_key)] = self.topic_masks.get((company_key, topic_key), 0) | bit
+            chunk = {"topic": d["topic"], "problems": problems}
+            self.by_company.setdefault(company_key, {}).setdefault(topic_key, []).append(chunk)
+            self.chunks_by_company.setdefault(company_key, []).append(chunk)
+            topic_names.setdefault(company_key, {})[topic_key] = d["topic"]
+            self.company_names[company_key] = d["company"]
+
+        self.companies = sorted(self.company_names.values())
+        self.topics_by_company = {c: sorted(t.values()) for c, t in topic_names.items()}
+        self.topic_names = topic_names
+        self.id_by_ordinal: Dict[int, str] = {o: pid for pid, o in self.ordinals.items()}
+        self.all_mask = 0
+        for pid in self.problems:
+            self.all_mask |= 1 << self.ordinals[pid]
+
+    def ids_from_mask(self, mask: int) -> List[str]:
+        """Problem IDs for the set bits of an ordinal mask, in ordinal order."""
+        ids = []
+        while mask:
+            low = mask & -mask
+            ids.append(self.id_by_ordinal[low.bit_length() - 1])
+            mask ^= low
+        return ids
+
+    def normalized(self) -> Dict[str, Any]:
+        """Catalog with each problem sent once; companies/topics reference problem IDs."""
+        return {
+            "problems": self.problems,
+            "companies": [
+                {
+                    "company": d["company"],
+                    "topic": d["topic"],
+                    "problem_ids": [problem_id(p["url"]) for p in d.get("problems", [])],
+                }
+                for d in self.data
+            ],
+        }
+
+
+_store: Optional[DSAStore] = None
+_last_check = 0.0
+_reload_lock = threading.Lock()
+
+
+def _load_registry() -> Dict[str, int]:
     try:
-        with open(DSA_JSON, "r", encoding="utf-8") as f:
+        with open(DSA_ID_REGISTRY, "r", encoding="utf-8") as f:
             return json.load(f)
-    except Exception:
-        return []
+    except FileNotFoundError:
+        return {}
+
+
+def _save_registry(ordinals: Dict[str, int]) -> None:
+    tmp = DSA_ID_REGISTRY.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(ordinals.items(), key=lambda kv: kv[1])), f, indent=0)
+        f.write("\n")
+    os.replace(tmp, DSA_ID_REGISTRY)
+
+
+def _read_store(mtime: float) -> DSAStore:
+    with open(DSA_JSON, "r", encoding="utf-8") as f:
+        store = DSAStore(json.load(f), mtime, _load_registry())
+    if store.new_ids:
+        # Appended in file order, so every worker derives the same ordinals until the registry is updated
+        logger.warning(
+            "%d DSA problems are missing from %s; run `python -m modules.dsa_data` to register them",
+            store.new_ids, DSA_ID_REGISTRY.name,
+        )
+    return store
+
+
+def update_registry() -> int:
+    """Append ordinals for problems not yet in the registry; returns how many were added."""
+    with open(DSA_JSON, "r", encoding="utf-8") as f:
+        store = DSAStore(json.load(f), 0.0, _load_registry())
+    if store.new_ids:
+        _save_registry(store.ordinals)
+    return store.new_ids
+
+
+def get_store() -> DSAStore:
+    """Current snapshot; re-reads the file (at most every check interval) if its mtime changed."""
+    global _store, _last_check
+    now = time.monotonic()
+    if _store is not None and now - _last_check < DSA_RELOAD_CHECK_INTERVAL:
+        return _store
+
+    with _reload_lock:
+        _last_check = now
+        try:
+            mtime = os.stat(DSA_JSON).st_mtime
+        except OSError:
+            if _store is None:
+                _store = DSAStore([], 0.0)
+            return _store
+        if _store is None or mtime != _store.mtime:
+            try:
+                _store = _read_store(mtime)  # swap in a fully built snapshot
+                logger.info("Loaded %d DSA topic lists", len(_store.data))
+            except Exception as e:
+                logger.warning("Could not load %s: %s", DSA_JSON, e)
+                if _store is None:
+                    _store = DSAStore([], 0.0)
+    return _store
+
+
+def load_dsa_problems() -> List[Dict[str, Any]]:
+    """Load DSA problems from JSON."""
+    return get_store().data
 
 
 def get_companies() -> List[str]:
     """Get unique company names."""
-    data = load_dsa_problems()
-    return sorted(set(d["company"] for d in data))
+    return get_store().companies
 
 
 def get_topics_by_company(company: str) -> List[str]:
     """Get topics for a company."""
-    data = load_dsa_problems()
-    return sorted(
-        set(d["topic"] for d in data if d["company"].lower() == company.lower())
-    )
+    return get_store().topics_by_company.get(company.casefold(), [])
 
 
 def get_problems(company: str, topic: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -39,18 +210,49 @@ def get_problems(company: str, topic: Optional[str] = None) -> List[Dict[str, An
     Get DSA problems for a company, optionally filtered by topic.
     Returns list of {topic, problems: [{title, url, difficulty}]}
     """
-    data = load_dsa_problems()
-    result = []
-    for d in data:
-        if d["company"].lower() != company.lower():
-            continue
-        if topic and d["topic"].lower() != topic.lower():
-            continue
-        result.append({
-            "topic": d["topic"],
-            "problems": d.get("problems", []),
-        })
-    return result
+    store = get_store()
+    if topic:
+        return store.by_company.get(company.casefold(), {}).get(topic.casefold(), [])
+    return store.chunks_by_company.get(company.casefold(), [])
+
+
+def get_problem_companies(pid: str) -> Optional[Dict[str, Any]]:
+    """Which companies (and under which topics) ask a problem; None if the ID is unknown."""
+    store = get_store()
+    problem = store.problems.get(pid)
+    if problem is None:
+        return None
+    refs = store.problem_refs[pid]
+    return {
+        "problem": problem,
+        "companies": [{"company": c, "topics": refs[c]} for c in sorted(refs)],
+    }
+
+
+def get_cross_company_problems(companies: List[str], mode: str = "intersection", topic: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Problems asked by all (intersection) or any (union) of the given companies,
+    optionally within one topic; computed from the per-company ordinal masks.
+    Most widely asked first.
+    """
+    if mode not in ("intersection", "union"):
+        raise ValueError("mode must be 'intersection' or 'union'")
+    store = get_store()
+    masks = []
+    for company in companies:
+        key = company.casefold()
+        if topic:
+            masks.append(store.topic_masks.get((key, topic.casefold()), 0))
+        else:
+            masks.append(store.company_masks.get(key, 0))
+    if not masks:
+        return []
+    mask = masks[0]
+    for m in masks[1:]:
+        mask = mask & m if mode == "intersection" else mask | m
+    ids = store.ids_from_mask(mask)
+    ids.sort(key=lambda pid: (-len(store.problem_refs[pid]), store.problems[pid]["title"]))
+    return [{**store.problems[pid], "companies": sorted(store.problem_refs[pid])} for pid in ids]
 
 
 def get_all_problems_flat(company: str, topic: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -64,3 +266,7 @@ def get_all_problems_flat(company: str, topic: Optional[str] = None) -> List[Dic
                 "topic": c["topic"],
             })
     return flat
+
+
+if __name__ == "__main__":
+    print(f"Registered {update_registry()} new problem IDs in {DSA_ID_REGISTRY}")
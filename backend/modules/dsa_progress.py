@@ -0,0 +1,116 @@
+"""
+Module 3b: Per-user DSA progress
+Each user has one document holding two bitmaps (solved / attempted) over the stable
+problem ordinals from dsa_data. Completion counts per company and topic are popcounts
+of the user's bitmap ANDed with the store's precomputed masks.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Tuple
+
+from pymongo.errors import DuplicateKeyError
+
+from modules.dsa_data import DSAStore
+
+MAX_UPDATE_RETRIES = 5
+
+
+class ProgressConflictError(RuntimeError):
+    """Raised when concurrent updates keep winning the version check."""
+
+
+def bitmap_to_int(bitmap: bytes) -> int:
+    """Bit i of the int is bit (i % 8) of byte (i // 8)."""
+    return int.from_bytes(bitmap or b"", "little")
+
+
+def int_to_bitmap(mask: int) -> bytes:
+    return mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+
+
+def _ordinal_mask(store: DSAStore, problem_ids: Iterable[str]) -> int:
+    mask = 0
+    for pid in problem_ids:
+        if pid not in store.problems:
+            raise ValueError(f"Unknown problem id: {pid}")
+        mask |= 1 << store.ordinals[pid]
+    return mask
+
+
+def apply_update(
+    solved: int, attempted: int, store: DSAStore,
+    mark_solved: Iterable[str] = (), mark_attempted: Iterable[str] = (), reset: Iterable[str] = (),
+) -> Tuple[int, int]:
+    """Move problems to solved / attempted / untouched; a problem is in at most one bitmap."""
+    to_solved = _ordinal_mask(store, mark_solved)
+    to_attempted = _ordinal_mask(store, mark_attempted)
+    to_reset = _ordinal_mask(store, reset)
+    solved = (solved & ~(to_attempted | to_reset)) | to_solved
+    attempted = (attempted & ~(to_solved | to_reset)) | (to_attempted & ~to_solved)
+    return solved, attempted
+
+
+async def load_progress(collection, user_id: str) -> Tuple[int, int, int]:
+    """(solved mask, attempted mask, document version) for a user."""
+    doc = await collection.find_one({"user_id": user_id}, {"_id": 0})
+    if not doc:
+        return 0, 0, 0
+    return bitmap_to_int(doc.get("solved")), bitmap_to_int(doc.get("attempted")), doc.get("version", 0)
+
+
+async def update_progress(
+    collection, user_id: str, store: DSAStore,
+    mark_solved: List[str], mark_attempted: List[str], reset: List[str],
+) -> Tuple[int, int]:
+    """Apply a bulk status update with optimistic concurrency (version check + retry)."""
+    for _ in range(MAX_UPDATE_RETRIES):
+        solved, attempted, version = await load_progress(collection, user_id)
+        solved, attempted = apply_update(solved, attempted, store, mark_solved, mark_attempted, reset)
+        try:
+            result = await collection.update_one(
+                {"user_id": user_id, "version": version} if version else {"user_id": user_id, "version": {"$exists": False}},
+                {
+                    "$set": {
+                        "solved": int_to_bitmap(solved),
+                        "attempted": int_to_bitmap(attempted),
+                        "version": version + 1,
+                        "updated_at": datetime.now(timezone.utc).isoformat(),
+                    }
+                },
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            continue  # lost the race to create the document
+        if result.matched_count or result.upserted_id is not None:
+            return solved, attempted
+    raise ProgressConflictError("Progress update conflicted too many times; retry")
+
+
+def _counts(mask: int, solved: int, attempted: int) -> Dict[str, int]:
+    return {
+        "total": mask.bit_count(),
+        "solved": (mask & solved).bit_count(),
+        "attempted": (mask & attempted).bit_count(),
+    }
+
+
+def summarize_progress(store: DSAStore, solved: int, attempted: int) -> Dict[str, Any]:
+    """Everything the DSA dashboard needs, from two bitmaps and the precomputed masks."""
+    solved &= store.all_mask
+    attempted &= store.all_mask
+    companies = {}
+    for company_key, mask in store.company_masks.items():
+        companies[store.company_names[company_key]] = {
+            **_counts(mask, solved, attempted),
+            "topics": {
+                name: _counts(store.topic_masks[(company_key, topic_key)], solved, attempted)
+                for topic_key, name in store.topic_names[company_key].items()
+            },
+        }
+    return {
+        "solved_ids": store.ids_from_mask(solved),
+        "attempted_ids": store.ids_from_mask(attempted),
+        "overall": _counts(store.all_mask, solved, attempted),
+        "companies": companies,
+    }
+
@@ -0,0 +1,87 @@
+"""
+Skill-gap-driven DSA recommendations
+Missing skills map to DSA topics through a static weight table; candidates are the
+union of the target company's precomputed topic masks, and only the top-k are ranked.
+"""
+
+import heapq
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+from modules.dsa_data import get_store
+from skills_taxonomy import normalize_skill
+
+DSA_RECOMMENDATIONS_LIMIT = int(os.environ.get("DSA_RECOMMENDATIONS_LIMIT", "10"))
+
+# normalized skill -> {topic key (casefolded): weight}
+SKILL_TOPICS: Dict[str, Dict[str, float]] = {
+    "algorithms": {"arrays": 1.0, "strings": 1.0, "graphs": 1.0, "trees": 0.8, "linked list": 0.6},
+    "data structures": {"linked list": 1.0, "trees": 1.0, "arrays": 0.8, "graphs": 0.8, "strings": 0.5},
+    "problem solving": {"arrays": 1.0, "strings": 1.0, "linked list": 0.5, "trees": 0.5, "graphs": 0.5},
+    "competitive programming": {"arrays": 1.0, "graphs": 1.0, "strings": 0.8, "trees": 0.8},
+    "graph algorithms": {"graphs": 1.0, "trees": 0.5},
+    "graphs": {"graphs": 1.0},
+    "trees": {"trees": 1.0},
+    "linked lists": {"linked list": 1.0},
+    "arrays": {"arrays": 1.0},
+    "strings": {"strings": 1.0},
+    "dynamic programming": {"arrays": 0.8, "strings": 0.8},
+    "recursion": {"trees": 1.0, "linked list": 0.5},
+}
+
+# Easier problems first within the same relevance
+DIFFICULTY_ORDER = {"Easy": 0, "Medium": 1, "Hard": 2}
+
+
+@lru_cache(maxsize=512)
+def _recommend(mtime: float, company_key: str, skills: Tuple[str, ...], k: int) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    # Keyed by store mtime so a reload of the DSA data invalidates entries naturally
+    store = get_store()
+    weights: Dict[int, float] = {}
+    reasons: Dict[int, List[str]] = {}
+    candidates = 0
+    for skill in skills:
+        for topic_key, weight in SKILL_TOPICS.get(skill, {}).items():
+            mask = store.topic_masks.get((company_key, topic_key), 0)
+            if not mask:
+                continue
+            candidates |= mask
+            weights[mask] = weights.get(mask, 0.0) + weight
+            reasons.setdefault(mask, []).append(skill)
+
+    def rank(pid: str) -> tuple:
+        bit = 1 << store.ordinals[pid]
+        score = sum(w for mask, w in weights.items() if mask & bit)
+        problem = store.problems[pid]
+        return (-score, -len(store.problem_refs[pid]), DIFFICULTY_ORDER.get(problem.get("difficulty"), 3), problem["title"])
+
+    top = heapq.nsmallest(k, store.ids_from_mask(candidates), key=rank)
+    result = []
+    for pid in top:
+        bit = 1 << store.ordinals[pid]
+        matched = sorted({s for mask, ss in reasons.items() if mask & bit for s in ss})
+        result.append((pid, tuple(matched)))
+    return tuple(result)
+
+
+def recommend_dsa_problems(
+    missing_skills: List[str], company: str, limit: int = DSA_RECOMMENDATIONS_LIMIT,
+) -> List[Dict[str, Any]]:
+    """Top-`limit` problems from the company's DSA list for the skill gaps that map to DSA topics."""
+    store = get_store()
+    skills = tuple(sorted({normalize_skill(s) for s in missing_skills} & SKILL_TOPICS.keys()))
+    if not skills or limit <= 0:
+        return []
+    company_key = company.casefold()
+    if company_key not in store.company_masks:
+        return []
+    ranked = _recommend(store.mtime, company_key, skills, limit)
+    return [
+        {
+            **store.problems[pid],
+            "topics": store.problem_refs[pid].get(store.company_names[company_key], []),
+            "skills": list(matched),
+        }
+        for pid, matched in ranked
+    ]
@@ -0,0 +1,133 @@
+"""
+Module 3c: DSA problem search
+Built once per DSA store snapshot: a token inverted index and a flattened prefix trie
+(every token prefix -> problem bitmask), plus facet masks for difficulty/company/topic.
+A query is a handful of dict lookups and big-int ANDs; facet counts are popcounts.
+Ranking inputs (lower-cased titles, title token sets) and the no-query order are
+precomputed too, so an empty query pages through a presorted list instead of sorting.
+"""
+
+import re
+from itertools import islice
+from typing import Any, Dict, List, Optional
+
+from modules.dsa_data import DSAStore, get_store
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+class DSASearchIndex:
+    def __init__(self, store: DSAStore):
+        self.store = store
+        self.token_masks: Dict[str, int] = {}
+        self.prefix_masks: Dict[str, int] = {}
+        self.difficulty_masks: Dict[str, int] = {}
+        self.topic_masks: Dict[str, int] = {}
+        self.topic_names: Dict[str, str] = {}
+        self.titles: Dict[str, str] = {}
+        self.title_tokens: Dict[str, frozenset] = {}
+
+        for pid, problem in store.problems.items():
+            bit = 1 << store.ordinals[pid]
+            self.titles[pid] = problem["title"].lower()
+            self.title_tokens[pid] = frozenset(tokenize(problem["title"]))
+            for token in self.title_tokens[pid]:
+                self.token_masks[token] = self.token_masks.get(token, 0) | bit
+                for end in range(1, len(token) + 1):
+                    prefix = token[:end]
+                    self.prefix_masks[prefix] = self.prefix_masks.get(prefix, 0) | bit
+            difficulty = problem.get("difficulty") or "Unknown"
+            self.difficulty_masks[difficulty] = self.difficulty_masks.get(difficulty, 0) | bit
+
+        for (_, topic_key), mask in store.topic_masks.items():
+            self.topic_masks[topic_key] = self.topic_masks.get(topic_key, 0) | mask
+        for names in store.topic_names.values():
+            self.topic_names.update(names)
+        # Ranking without a query: most companies first, then title
+        self.default_order: List[str] = sorted(
+            store.problems, key=lambda pid: (-len(store.problem_refs[pid]), self.titles[pid])
+        )
+
+    def match(self, q: str) -> int:
+        """Mask of problems whose title has every query token (the last one as a prefix)."""
+        tokens = tokenize(q)
+        if not tokens:
+            return self.store.all_mask
+        mask = self.prefix_masks.get(tokens[-1], 0)
+        for token in tokens[:-1]:
+            mask &= self.token_masks.get(token, 0)
+            if not mask:
+                break
+        return mask
+
+    def _score(self, pid: str, q: str, tokens: List[str]) -> tuple:
+        title = self.titles[pid]
+        title_tokens = self.title_tokens[pid]
+        return (
+            -(title == q),
+            -title.startswith(q),
+            -sum(t in title_tokens for t in tokens),
+            -len(self.store.problem_refs[pid]),
+            title,
+        )
+
+    def search(
+        self,
+        q: str = "",
+        difficulty: Optional[str] = None,
+        company: Optional[str] = None,
+        topic: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        store = self.store
+        mask = self.match(q)
+        if difficulty:
+            mask &= next((m for d, m in self.difficulty_masks.items() if d.lower() == difficulty.lower()), 0)
+        if company:
+            mask &= store.company_masks.get(company.casefold(), 0)
+        if topic:
+            mask &= self.topic_masks.get(topic.casefold(), 0)
+
+        facets = {
+            "difficulty": {d: (mask & m).bit_count() for d, m in self.difficulty_masks.items() if mask & m},
+            "company": {
+                store.company_names[c]: (mask & m).bit_count() for c, m in store.company_masks.items() if mask & m
+            },
+            "topic": {self.topic_names[t]: (mask & m).bit_count() for t, m in self.topic_masks.items() if mask & m},
+        }
+
+        q_norm = q.strip().lower()
+        tokens = tokenize(q_norm)
+        if tokens:
+            ids = store.ids_from_mask(mask)
+            ids.sort(key=lambda pid: self._score(pid, q_norm, tokens))
+            page = ids[offset:offset + limit]
+        else:
+            matching = (pid for pid in self.default_order if mask >> store.ordinals[pid] & 1)
+            page = list(islice(matching, offset, offset + limit))
+        return {
+            "total": mask.bit_count(),
+            "results": [{**store.problems[pid], "companies": sorted(store.problem_refs[pid])} for pid in page],
+            "facets": facets,
+        }
+
+
+_index: Optional[DSASearchIndex] = None
+
+
+def get_search_index() -> DSASearchIndex:
+    """Index for the current store snapshot (rebuilt when the DSA file is reloaded)."""
+    global _index
+    store = get_store()
+    if _index is None or _index.store is not store:
+        _index = DSASearchIndex(store)
+    return _index
+
+
+def search_problems(q: str = "", **filters) -> Dict[str, Any]:
+    return get_search_index().search(q, **filters)
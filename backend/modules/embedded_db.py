@@ -0,0 +1,680 @@
+"""
+Embedded in-process document store (STORAGE_BACKEND=memory)
+Implements the subset of the Motor API the server uses - find / find_one with
+projection, sort, limit and keyset filters, count_documents, insert_one / insert_many,
+update_one with $set / $setOnInsert / $unset / $inc and upsert, delete_one / delete_many,
+bulk_write of UpdateOne / InsertOne, and create_indexes - with MongoDB's semantics for
+those operations, including unique and partial unique indexes (DuplicateKeyError) and
+TTL indexes. Each operation runs to completion without yielding, so it is atomic with
+respect to other requests on the event loop, as a single-document write is in MongoDB.
+Data lives only as long as the process: use it for tests, benchmarks and local runs.
+"""
+
+import copy
+import datetime
+import functools
+import re
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from pymongo.results import BulkWriteResult, DeleteResult, InsertManyResult, InsertOneResult, UpdateResult
+
+DUPLICATE_KEY = 11000
+_MISSING = object()
+# Expired TTL documents are removed at most this often (MongoDB's monitor runs every 60s)
+TTL_SWEEP_INTERVAL = 1.0
+
+
+# ---------- values, comparison, matching ----------
+
+def _type_rank(value: Any) -> int:
+    # BSON comparison order for the types the server stores
+    if value is None or value is _MISSING:
+        return 1
+    if isinstance(value, bool):
+        return 8
+    if isinstance(value, (int, float)):
+        return 2
+    if isinstance(value, str):
+        return 3
+    if isinstance(value, dict):
+        return 4
+    if isinstance(value, list):
+        return 5
+    if isinstance(value, bytes):
+        return 6
+    if isinstance(value, ObjectId):
+        return 7
+    if isinstance(value, datetime.datetime):
+        return 9
+    return 10
+
+
+def _normalize(value: Any) -> Any:
+    # MongoDB stores datetimes as UTC instants, so naive and aware values compare
+    if isinstance(value, datetime.datetime) and value.tzinfo is not None:
+        return value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def compare(a: Any, b: Any) -> int:
+    """Three-way comparison in BSON order (missing sorts with null)."""
+    ra, rb = _type_rank(a), _type_rank(b)
+    if ra != rb:
+        return -1 if ra < rb else 1
+    if ra == 1:
+        return 0
+    if ra == 5:
+        for x, y in zip(a, b):
+            c = compare(x, y)
+            if c:
+                return c
+        return (len(a) > len(b)) - (len(a) < len(b))
+    if ra == 4:
+        return compare(list(a.items()), list(b.items()))
+    a, b = _normalize(a), _normalize(b)
+    return (a > b) - (a < b)
+
+
+def get_path(doc: Any, path: str) -> Any:
+    """Value at a dotted path, or _MISSING."""
+    value = doc
+    for part in path.split("."):
+        if isinstance(value, dict):
+            value = value.get(part, _MISSING)
+        elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        else:
+            return _MISSING
+        if value is _MISSING:
+            return _MISSING
+    return value
+
+
+def _candidates(value: Any) -> List[Any]:
+    # A query on an array field matches the array itself or any of its elements
+    if isinstance(value, list):
+        return [value, *value]
+    return [value]
+
+
+def _equals(value: Any, target: Any) -> bool:
+    if target is None:
+        return value is _MISSING or any(v is None for v in _candidates(value))
+    if value is _MISSING:
+        return False
+    return any(_type_rank(v) == _type_rank(target) and compare(v, target) == 0 for v in _candidates(value))
+
+
+def _compare_op(value: Any, target: Any, accept) -> bool:
+    # Range operators only match values of the same type class, as in MongoDB
+    if value is _MISSING:
+        return target is None and accept(0)
+    return any(_type_rank(v) == _type_rank(target) and accept(compare(v, target)) for v in _candidates(value))
+
+
+def _match_operators(value: Any, spec: Dict[str, Any]) -> bool:
+    for op, target in spec.items():
+        if op == "$eq":
+            ok = _equals(value, target)
+        elif op == "$ne":
+            ok = not _equals(value, target)
+        elif op == "$gt":
+            ok = _compare_op(value, target, lambda c: c > 0)
+        elif op == "$gte":
+            ok = _compare_op(value, target, lambda c: c >= 0)
+        elif op == "$lt":
+            ok = _compare_op(value, target, lambda c: c < 0)
+        elif op == "$lte":
+            ok = _compare_op(value, target, lambda c: c <= 0)
+        elif op == "$in":
+            ok = any(_equals(value, t) for t in target)
+        elif op == "$nin":
+            ok = not any(_equals(value, t) for t in target)
+        elif op == "$exists":
+            ok = (value is not _MISSING) == bool(target)
+        elif op == "$regex":
+            flags = re.IGNORECASE if "i" in spec.get("$options", "") else 0
+            ok = any(isinstance(v, str) and re.search(target, v, flags) for v in _candidates(value))
+        elif op == "$options":
+            continue
+        elif op == "$not":
+            ok = not _match_operators(value, target)
+        else:
+            raise OperationFailure(f"unknown operator: {op}")
+        if not ok:
+            return False
+    return True
+
+
+def matches(doc: Dict[str, Any], query: Optional[Dict[str, Any]]) -> bool:
+    """True if `doc` satisfies a MongoDB filter document."""
+    for key, condition in (query or {}).items():
+        if key == "$and":
+            ok = all(matches(doc, q) for q in condition)
+        elif key == "$or":
+            ok = any(matches(doc, q) for q in condition)
+        elif key == "$nor":
+            ok = not any(matches(doc, q) for q in condition)
+        elif key.startswith("$"):
+            raise OperationFailure(f"unknown top level operator: {key}")
+        elif isinstance(condition, dict) and condition and all(k.startswith("$") for k in condition):
+            ok = _match_operators(get_path(doc, key), condition)
+        else:
+            ok = _equals(get_path(doc, key), condition)
+        if not ok:
+            return False
+    return True
+
+
+def _sort_spec(key_or_list, direction=None) -> List[Tuple[str, int]]:
+    if isinstance(key_or_list, str):
+        return [(key_or_list, direction or 1)]
+    if isinstance(key_or_list, dict):
+        return list(key_or_list.items())
+    return [tuple(k) for k in key_or_list]
+
+
+def _sort_value(doc: Dict[str, Any], field: str, direction: int) -> Any:
+    value = get_path(doc, field)
+    if isinstance(value, list) and value:
+        # Arrays sort by their smallest element ascending, largest descending
+        ordered = sorted(value, key=functools.cmp_to_key(compare))
+        return ordered[0] if direction > 0 else ordered[-1]
+    return value
+
+
+def sort_documents(docs: List[Dict[str, Any]], spec: List[Tuple[str, int]]) -> List[Dict[str, Any]]:
+    def cmp(a, b):
+        for field, direction in spec:
+            c = compare(_sort_value(a, field, direction), _sort_value(b, field, direction))
+            if c:
+                return c if direction > 0 else -c
+        return 0
+
+    return sorted(docs, key=functools.cmp_to_key(cmp))
+
+
+def project(doc: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Apply an inclusion or exclusion projection (top-level and dotted fields)."""
+    if not projection:
+        return copy.deepcopy(doc)
+    if isinstance(projection, (list, tuple)):
+        projection = {field: 1 for field in projection}
+    fields = {k: v for k, v in projection.items() if k != "_id"}
+    include_id = bool(projection.get("_id", 1))
+    if fields and all(fields.values()):
+        result: Dict[str, Any] = {}
+        if include_id and "_id" in doc:
+            result["_id"] = copy.deepcopy(doc["_id"])
+        for field in fields:
+            value = get_path(doc, field)
+            if value is not _MISSING:
+                _set_path(result, field, copy.deepcopy(value))
+        return result
+    if fields and any(fields.values()):
+        raise OperationFailure("Cannot do exclusion and inclusion in one projection")
+    result = copy.deepcopy(doc)
+    for field in fields:
+        _unset_path(result, field)
+    if not include_id:
+        result.pop("_id", None)
+    return result
+
+
+# ---------- updates ----------
+
+def _set_path(doc: Dict[str, Any], path: str, value: Any) -> None:
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.setdefault(part, {})
+    doc[parts[-1]] = value
+
+
+def _unset_path(doc: Dict[str, Any], path: str) -> None:
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.get(part)
+        if not isinstance(doc, dict):
+            return
+    doc.pop(parts[-1], None)
+
+
+def apply_update(doc: Dict[str, Any], update: Dict[str, Any], inserting: bool = False) -> None:
+    """Apply update operators to `doc` in place."""
+    if not update or not all(k.startswith("$") for k in update):
+        raise ValueError("update only works with $ operators")
+    for op, fields in update.items():
+        if op == "$setOnInsert" and not inserting:
+            continue
+        for path, value in fields.items():
+            if path == "_id" and op != "$setOnInsert" and doc.get("_id", value) != value:
+                raise OperationFailure("Performing an update on the path '_id' would modify the immutable field '_id'")
+            if op in ("$set", "$setOnInsert"):
+                _set_path(doc, path, copy.deepcopy(value))
+            elif op == "$unset":
+                _unset_path(doc, path)
+            elif op == "$inc":
+                current = get_path(doc, path)
+                _set_path(doc, path, value if current is _MISSING else current + value)
+            else:
+                raise OperationFailure(f"Unknown modifier: {op}")
+
+
+def _upsert_seed(query: Dict[str, Any]) -> Dict[str, Any]:
+    """Equality conditions of a filter become fields of an upserted document."""
+    seed: Dict[str, Any] = {}
+    for key, condition in query.items():
+        if key == "$and":
+            for part in condition:
+                seed.update(_upsert_seed(part))
+        elif key.startswith("$"):
+            continue
+        elif isinstance(condition, dict) and condition and all(k.startswith("$") for k in condition):
+            if "$eq" in condition:
+                _set_path(seed, key, copy.deepcopy(condition["$eq"]))
+        else:
+            _set_path(seed, key, copy.deepcopy(condition))
+    return seed
+
+
+# ---------- indexes ----------
+
+class _Index:
+    def __init__(self, keys: List[Tuple[str, Any]], name: str, options: Dict[str, Any]):
+        self.keys = keys
+        self.name = name
+        self.unique = bool(options.get("unique"))
+        self.partial = options.get("partialFilterExpression")
+        self.sparse = bool(options.get("sparse"))
+        self.expire_after = options.get("expireAfterSeconds")
+        self.options = {k: v for k, v in options.items() if k not in ("key", "name")}
+
+    def applies_to(self, doc: Dict[str, Any]) -> bool:
+        if self.partial is not None and not matches(doc, self.partial):
+            return False
+        if self.sparse and all(get_path(doc, f) is _MISSING for f, _ in self.keys):
+            return False
+        return True
+
+    def key_of(self, doc: Dict[str, Any]) -> Tuple:
+        # Missing and null index the same way, as in MongoDB
+        return tuple(
+            repr(_normalize(None if (v := get_path(doc, f)) is _MISSING else v))
+            for f, _ in self.keys
+        )
+
+
+def _index_name(keys: List[Tuple[str, Any]]) -> str:
+    return "_".join(f"{field}_{direction}" for field, direction in keys)
+
+
+def _equality_terms(query: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+    """(field, string) pairs that every document matching `query` must equal."""
+    for key, condition in query.items():
+        if key == "$and":
+            for part in condition:
+                yield from _equality_terms(part)
+        elif key.startswith("$") or "." in key:
+            continue
+        elif isinstance(condition, str):
+            yield key, condition
+        elif isinstance(condition, dict) and isinstance(condition.get("$eq"), str):
+            yield key, condition["$eq"]
+
+
+def _lookup_values(doc: Dict[str, Any], field: str) -> List[str]:
+    value = doc.get(field)
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        return [v for v in value if isinstance(v, str)]
+    return []
+
+
+# ---------- cursor and collection ----------
+
+class EmbeddedCursor:
+    """Lazy query cursor: filters, sorts and projects when first iterated."""
+
+    def __init__(self, collection: "EmbeddedCollection", query, projection):
+        self._collection = collection
+        self._query = query or {}
+        self._projection = projection
+        self._sort: List[Tuple[str, int]] = []
+        self._skip = 0
+        self._limit = 0
+        self._results: Optional[Iterator[Dict[str, Any]]] = None
+
+    def sort(self, key_or_list, direction=None) -> "EmbeddedCursor":
+        self._sort = _sort_spec(key_or_list, direction)
+        return self
+
+    def skip(self, n: int) -> "EmbeddedCursor":
+        self._skip = n
+        return self
+
+    def limit(self, n: int) -> "EmbeddedCursor":
+        self._limit = n
+        return self
+
+    def batch_size(self, n: int) -> "EmbeddedCursor":
+        return self
+
+    def _execute(self) -> Iterator[Dict[str, Any]]:
+        docs = self._collection._matching(self._query)
+        if self._sort:
+            docs = sort_documents(docs, self._sort)
+        docs = docs[self._skip:]
+        if self._limit:
+            docs = docs[:abs(self._limit)]
+        return iter([project(d, self._projection) for d in docs])
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        if self._results is None:
+            self._results = self._execute()
+        try:
+            return next(self._results)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def to_list(self, length: Optional[int] = None) -> List[Dict[str, Any]]:
+        if self._results is None:
+            self._results = self._execute()
+        if length is None:
+            return list(self._results)
+        return [doc for _, doc in zip(range(length), self._results)]
+
+
+class EmbeddedCollection:
+    def __init__(self, database: "EmbeddedDatabase", name: str):
+        self.database = database
+        self.name = name
+        self._docs: Dict[Any, Dict[str, Any]] = {}
+        self._indexes: Dict[str, _Index] = {"_id_": _Index([("_id", 1)], "_id_", {"unique": True})}
+        # index name -> key -> _id, for unique indexes
+        self._unique_keys: Dict[str, Dict[Tuple, Any]] = {"_id_": {}}
+        # leading field of an index -> string value -> _ids (insertion-ordered), for equality lookups
+        self._lookups: Dict[str, Dict[str, Dict[Any, None]]] = {}
+        self._next_sweep = 0.0
+
+    # -- internals --
+
+    def _sweep_expired(self) -> None:
+        now = time.monotonic()
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + TTL_SWEEP_INTERVAL
+        for index in self._indexes.values():
+            if index.expire_after is None:
+                continue
+            field = index.keys[0][0]
+            cutoff = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) - datetime.timedelta(
+                seconds=index.expire_after
+            )
+            expired = [
+                doc for doc in self._docs.values()
+                if isinstance(v := get_path(doc, field), datetime.datetime) and _normalize(v) < cutoff
+            ]
+            for doc in expired:
+                self._remove(doc)
+
+    def _matching(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        self._sweep_expired()
+        _id = query.get("_id") if query else None
+        if _id is not None and not isinstance(_id, dict):
+            doc = self._docs.get(_id)
+            return [doc] if doc is not None and matches(doc, query) else []
+        # Narrow to the smallest equality match on an indexed field, else scan
+        candidates = None
+        for field, value in _equality_terms(query or {}):
+            table = self._lookups.get(field)
+            if table is not None:
+                ids = table.get(value, {})
+                if candidates is None or len(ids) < len(candidates):
+                    candidates = ids
+        if candidates is not None:
+            return [self._docs[i] for i in candidates if matches(self._docs[i], query)]
+        return [doc for doc in self._docs.values() if matches(doc, query)]
+
+    def _check_unique(self, doc: Dict[str, Any], replacing: Any = _MISSING) -> None:
+        for name, keys in self._unique_keys.items():
+            index = self._indexes[name]
+            if not index.applies_to(doc):
+                continue
+            owner = keys.get(index.key_of(doc), _MISSING)
+            if owner is not _MISSING and owner != replacing:
+                fields = ", ".join(f"{f}: {get_path(doc, f)!r}" for f, _ in index.keys)
+                raise DuplicateKeyError(
+                    f"E11000 duplicate key error collection: {self.database.name}.{self.name} "
+                    f"index: {name} dup key: {{ {fields} }}",
+                    DUPLICATE_KEY,
+                )
+
+    def _add(self, doc: Dict[str, Any]) -> None:
+        self._docs[doc["_id"]] = doc
+        for name, keys in self._unique_keys.items():
+            if self._indexes[name].applies_to(doc):
+                keys[self._indexes[name].key_of(doc)] = doc["_id"]
+        for field, table in self._lookups.items():
+            for value in _lookup_values(doc, field):
+                table.setdefault(value, {})[doc["_id"]] = None
+
+    def _remove(self, doc: Dict[str, Any]) -> None:
+        del self._docs[doc["_id"]]
+        for name, keys in self._unique_keys.items():
+            index = self._indexes[name]
+            if index.applies_to(doc) and keys.get(index.key_of(doc)) == doc["_id"]:
+                del keys[index.key_of(doc)]
+        for field, table in self._lookups.items():
+            for value in _lookup_values(doc, field):
+                ids = table.get(value)
+                if ids is not None:
+                    ids.pop(doc["_id"], None)
+                    if not ids:
+                        del table[value]
+
+    def _insert(self, document: Dict[str, Any]) -> Any:
+        if "_id" not in document:
+            # Like PyMongo, the generated _id is set on the caller's document
+            document["_id"] = ObjectId()
+        doc = copy.deepcopy(document)
+        self._check_unique(doc)
+        self._add(doc)
+        return doc["_id"]
+
+    def _update(self, query: Dict[str, Any], update: Dict[str, Any], upsert: bool) -> Dict[str, Any]:
+        found = self._matching(query)
+        if found:
+            current = found[0]
+            updated = copy.deepcopy(current)
+            apply_update(updated, update)
+            if updated == current:
+                return {"n": 1, "nModified": 0}
+            self._check_unique(updated, replacing=current["_id"])
+            self._remove(current)
+            self._add(updated)
+            return {"n": 1, "nModified": 1}
+        if not upsert:
+            return {"n": 0, "nModified": 0}
+        doc = _upsert_seed(query)
+        apply_update(doc, update, inserting=True)
+        return {"n": 1, "nModified": 0, "upserted": self._insert(doc)}
+
+    # -- Motor API --
+
+    def find(self, filter: Optional[Dict[str, Any]] = None, projection=None, *args, **kwargs) -> EmbeddedCursor:
+        cursor = EmbeddedCursor(self, filter, projection)
+        if kwargs.get("sort"):
+            cursor.sort(kwargs["sort"])
+        if kwargs.get("skip"):
+            cursor.skip(kwargs["skip"])
+        if kwargs.get("limit"):
+            cursor.limit(kwargs["limit"])
+        return cursor
+
+    async def find_one(self, filter: Optional[Dict[str, Any]] = None, projection=None, *args, **kwargs):
+        if filter is not None and not isinstance(filter, dict):
+            filter = {"_id": filter}
+        docs = await self.find(filter, projection, *args, **kwargs).limit(1).to_list(1)
+        return docs[0] if docs else None
+
+    async def count_documents(self, filter: Dict[str, Any], **kwargs) -> int:
+        count = len(self._matching(filter))
+        count = max(0, count - kwargs.get("skip", 0))
+        return min(count, kwargs["limit"]) if kwargs.get("limit") else count
+
+    async def insert_one(self, document: Dict[str, Any], **kwargs) -> InsertOneResult:
+        return InsertOneResult(self._insert(document), True)
+
+    async def insert_many(self, documents, ordered: bool = True, **kwargs) -> InsertManyResult:
+        ids, errors = [], []
+        for i, document in enumerate(documents):
+            try:
+                ids.append(self._insert(document))
+            except DuplicateKeyError as e:
+                errors.append({"index": i, "code": DUPLICATE_KEY, "errmsg": str(e), "op": document})
+                if ordered:
+                    break
+        if errors:
+            raise BulkWriteError({
+                "writeErrors": errors, "writeConcernErrors": [], "nInserted": len(ids),
+                "nUpserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0, "upserted": [],
+            })
+        return InsertManyResult(ids, True)
+
+    async def update_one(self, filter: Dict[str, Any], update: Dict[str, Any], upsert: bool = False, **kwargs) -> UpdateResult:
+        return UpdateResult(self._update(filter, update, upsert), True)
+
+    async def delete_one(self, filter: Dict[str, Any], **kwargs) -> DeleteResult:
+        found = self._matching(filter)[:1]
+        for doc in found:
+            self._remove(doc)
+        return DeleteResult({"n": len(found)}, True)
+
+    async def delete_many(self, filter: Dict[str, Any], **kwargs) -> DeleteResult:
+        found = self._matching(filter)
+        for doc in found:
+            self._remove(doc)
+        return DeleteResult({"n": len(found)}, True)
+
+    async def bulk_write(self, requests, ordered: bool = True, **kwargs) -> BulkWriteResult:
+        result = {
+            "writeErrors": [], "writeConcernErrors": [], "nInserted": 0,
+            "nUpserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0, "upserted": [],
+        }
+        for i, request in enumerate(requests):
+            try:
+                if isinstance(request, InsertOne):
+                    self._insert(request._doc)
+                    result["nInserted"] += 1
+                elif isinstance(request, UpdateOne):
+                    raw = self._update(request._filter, request._doc, bool(request._upsert))
+                    if "upserted" in raw:
+                        result["nUpserted"] += 1
+                        result["upserted"].append({"index": i, "_id": raw["upserted"]})
+                    else:
+                        result["nMatched"] += raw["n"]
+                        result["nModified"] += raw["nModified"]
+                else:
+                    raise TypeError(f"unsupported bulk operation: {type(request).__name__}")
+            except DuplicateKeyError as e:
+                result["writeErrors"].append({"index": i, "code": DUPLICATE_KEY, "errmsg": str(e)})
+                if ordered:
+                    break
+        if result["writeErrors"]:
+            raise BulkWriteError(result)
+        return BulkWriteResult(result, True)
+
+    async def create_indexes(self, indexes, **kwargs) -> List[str]:
+        names = []
+        for model in indexes:
+            spec = dict(model.document)
+            keys = list(spec["key"].items())
+            name = spec.get("name") or _index_name(keys)
+            options = {k: v for k, v in spec.items() if k not in ("key", "name")}
+            existing = self._indexes.get(name)
+            if existing is not None:
+                if existing.options != options:
+                    raise OperationFailure(f"An existing index has the same name as the requested index: {name}", 86)
+            else:
+                index = _Index(keys, name, options)
+                if index.unique:
+                    taken: Dict[Tuple, Any] = {}
+                    for doc in self._docs.values():
+                        if index.applies_to(doc):
+                            if index.key_of(doc) in taken:
+                                raise DuplicateKeyError(f"E11000 duplicate key error building index {name}", DUPLICATE_KEY)
+                            taken[index.key_of(doc)] = doc["_id"]
+                    self._unique_keys[name] = taken
+                self._indexes[name] = index
+                self._add_lookup(keys[0][0])
+            names.append(name)
+        return names
+
+    def _add_lookup(self, field: str) -> None:
+        if field == "_id" or "." in field or field in self._lookups:
+            return
+        table: Dict[str, Dict[Any, None]] = {}
+        for doc in self._docs.values():
+            for value in _lookup_values(doc, field):
+                table.setdefault(value, {})[doc["_id"]] = None
+        self._lookups[field] = table
+
+    async def create_index(self, keys, **kwargs) -> str:
+        from pymongo import IndexModel
+
+        return (await self.create_indexes([IndexModel(keys, **kwargs)]))[0]
+
+    async def index_information(self) -> Dict[str, Dict[str, Any]]:
+        return {name: {"key": index.keys, **index.options} for name, index in self._indexes.items()}
+
+    async def drop(self) -> None:
+        self.database._collections.pop(self.name, None)
+
+
+class EmbeddedDatabase:
+    def __init__(self, client: "EmbeddedClient", name: str):
+        self.client = client
+        self.name = name
+        self._collections: Dict[str, EmbeddedCollection] = {}
+
+    def __getitem__(self, name: str) -> EmbeddedCollection:
+        if name not in self._collections:
+            self._collections[name] = EmbeddedCollection(self, name)
+        return self._collections[name]
+
+    def __getattr__(self, name: str) -> EmbeddedCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    async def list_collection_names(self) -> List[str]:
+        return list(self._collections)
+
+
+class EmbeddedClient:
+    """Stands in for AsyncIOMotorClient; databases are created on first use."""
+
+    def __init__(self):
+        self._databases: Dict[str, EmbeddedDatabase] = {}
+
+    def __getitem__(self, name: str) -> EmbeddedDatabase:
+        if name not in self._databases:
+            self._databases[name] = EmbeddedDatabase(self, name)
+        return self._databases[name]
+
+    def get_database(self, name: str) -> EmbeddedDatabase:
+        return self[name]
+
+    async def drop_database(self, name) -> None:
+        self._databases.pop(getattr(name, "name", name), None)
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,64 @@
+"""
+Streaming history export
+Rows go from a Motor cursor straight into NDJSON or CSV chunks; only one cursor batch
+and one output chunk are held at a time, so memory is flat in the number of rows.
+"""
+
+import csv
+import io
+import json
+import os
+from typing import Any, AsyncIterator, Dict, List
+
+EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", "1000"))
+# Flush output once a chunk reaches this many bytes
+EXPORT_CHUNK_BYTES = 64 * 1024
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+# Spreadsheets evaluate cells starting with these as formulas (CSV injection)
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+ANALYSIS_EXPORT_FIELDS = [
+    "id", "user_id", "resume_id", "company", "role", "match_percentage",
+    "resume_skills", "job_skills", "missing_skills", "created_at",
+]
+CAREER_RESULT_EXPORT_FIELDS = ["id", "user_id", "career_path", "explanation", "created_at"]
+
+
+def export_media_type(fmt: str) -> str:
+    """Content type for an export format; raises ValueError for unknown formats."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(EXPORT_FORMATS)}")
+    return EXPORT_FORMATS[fmt]
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, list):
+        value = "; ".join(str(v) for v in value)
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return "" if value is None else value
+
+
+async def stream_export(cursor, fmt: str, fields: List[str]) -> AsyncIterator[bytes]:
+    """Encode documents from `cursor` as `fmt`, yielding ~EXPORT_CHUNK_BYTES chunks."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer:
+        writer.writerow(fields)
+    async for doc in cursor:
+        if writer:
+            writer.writerow([_csv_value(doc.get(f)) for f in fields])
+        else:
+            buffer.write(json.dumps({f: doc.get(f) for f in fields}, ensure_ascii=False, default=str))
+            buffer.write("\n")
+        if buffer.tell() >= EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def export_cursor(collection, query: Dict[str, Any], fields: List[str], sort: List):
+    projection = {"_id": 0, **{f: 1 for f in fields}}
+    return collection.find(query, projection).sort(sort).batch_size(EXPORT_BATCH_SIZE)
@@ -3,58 +3,35 @@ Module 1 Step 5: Recommend Learning Resources
 Uses FREE sources: YouTube API, FreeCodeCamp, Coursera (scraping), curated links
 """
 
+import asyncio
+import csv
+import hashlib
+import json
 import os
 import logging
-from typing import List, Dict, Any
+import time
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+
+from skills_taxonomy import normalize_skill
+from modules.http_client import get_http_client
+from modules.outbound import OUTBOUND_DEADLINE, CircuitOpenError, get_breaker, guarded_call
 
 logger = logging.getLogger(__name__)
 
-# Curated FREE learning resources by skill (no API needed for fallback)
-SKILL_RESOURCES = {
-    "python": [
-        {"platform": "FreeCodeCamp", "title": "Python for Everybody", "url": "https://www.freecodecamp.org/learn/scientific-computing-with-python/", "type": "course"},
-        {"platform": "YouTube", "title": "Python Full Course", "url": "https://www.youtube.com/results?search_query=python+full+course+free", "type": "video"},
-    ],
-    "javascript": [
-        {"platform": "FreeCodeCamp", "title": "JavaScript Algorithms and Data Structures", "url": "https://www.freecodecamp.org/learn/javascript-algorithms-and-data-structures/", "type": "course"},
-        {"platform": "YouTube", "title": "JavaScript Tutorial", "url": "https://www.youtube.com/results?search_query=javascript+full+course+free", "type": "video"},
-    ],
-    "react": [
-        {"platform": "FreeCodeCamp", "title": "React and Redux", "url": "https://www.freecodecamp.org/learn/front-end-development-libraries/", "type": "course"},
-        {"platform": "YouTube", "title": "React Full Course", "url": "https://www.youtube.com/results?search_query=react+full+course+free", "type": "video"},
-    ],
-    "machine learning": [
-        {"platform": "Coursera", "title": "Machine Learning (Andrew Ng)", "url": "https://www.coursera.org/learn/machine-learning", "type": "course"},
-        {"platform": "YouTube", "title": "ML Full Course", "url": "https://www.youtube.com/results?search_query=machine+learning+full+course+free", "type": "video"},
-    ],
-    "data structures": [
-        {"platform": "FreeCodeCamp", "title": "Data Structures", "url": "https://www.freecodecamp.org/learn/coding-interview-prep/data-structures/", "type": "course"},
-        {"platform": "YouTube", "title": "DSA Full Course", "url": "https://www.youtube.com/results?search_query=data+structures+algorithms+full+course", "type": "video"},
-    ],
-    "algorithms": [
-        {"platform": "FreeCodeCamp", "title": "Algorithms", "url": "https://www.freecodecamp.org/learn/coding-interview-prep/algorithms/", "type": "course"},
-    ],
-    "aws": [
-        {"platform": "YouTube", "title": "AWS Tutorial", "url": "https://www.youtube.com/results?search_query=aws+tutorial+free+full+course", "type": "video"},
-    ],
-    "docker": [
-        {"platform": "YouTube", "title": "Docker Tutorial", "url": "https://www.youtube.com/results?search_query=docker+tutorial+free", "type": "video"},
-    ],
-    "kubernetes": [
-        {"platform": "YouTube", "title": "Kubernetes Tutorial", "url": "https://www.youtube.com/results?search_query=kubernetes+tutorial+free", "type": "video"},
-    ],
-    "sql": [
-        {"platform": "FreeCodeCamp", "title": "Relational Database", "url": "https://www.freecodecamp.org/learn/relational-database/", "type": "course"},
-    ],
-    "system design": [
-        {"platform": "YouTube", "title": "System Design", "url": "https://www.youtube.com/results?search_query=system+design+interview", "type": "video"},
-    ],
-    "git": [
-        {"platform": "YouTube", "title": "Git Tutorial", "url": "https://www.youtube.com/results?search_query=git+tutorial+free", "type": "video"},
-    ],
-}
-
-# Default fallback for unknown skills
+ROOT = Path(__file__).resolve().parent.parent
+RESOURCES_CSV = ROOT / "data" / "learning_resources.csv"
+
+# Catalog rows under this skill are the fallback for skills without entries
+DEFAULT_SKILL = "*"
+LEVELS = ("beginner", "intermediate", "advanced")
+RESOURCES_PER_SKILL = int(os.environ.get("RESOURCES_PER_SKILL", "5"))
+
+# Last-resort fallback if the catalog file is missing
 DEFAULT_RESOURCES = [
     {"platform": "FreeCodeCamp", "title": "Free Coding Courses", "url": "https://www.freecodecamp.org/learn/", "type": "course"},
     {"platform": "Coursera", "title": "Free Courses", "url": "https://www.coursera.org/courses?query=free", "type": "course"},
@@ -62,61 +39,359 @@ DEFAULT_RESOURCES = [
 ]
 
 
-def get_resources_for_skill(skill: str) -> List[Dict[str, Any]]:
-    """Get curated learning resources for a skill."""
-    skill_lower = skill.lower().strip()
-    if skill_lower in SKILL_RESOURCES:
-        return SKILL_RESOURCES[skill_lower].copy()
-    return DEFAULT_RESOURCES.copy()
+class Resource:
+    """
+    One catalog entry (slotted - one per catalog row). `fallback` marks
+    generated search-page links, ranked after every curated link for the skill.
+    """
+
+    __slots__ = ("id", "skill", "level", "type", "platform", "title", "url", "rank", "fallback")
+
+    def __init__(self, id: int, skill: str, level: str, type: str, platform: str, title: str, url: str, rank: int,
+                 fallback: bool = False):
+        self.id = id
+        self.skill = skill
+        self.level = level
+        self.type = type
+        self.platform = platform
+        self.title = title
+        self.url = url
+        self.rank = rank
+        self.fallback = fallback
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "platform": self.platform,
+            "title": self.title,
+            "url": self.url,
+            "type": self.type,
+            "level": self.level,
+            "fallback": self.fallback,
+        }
+
+
+class ResourceCatalog:
+    """
+    Array-backed resource store with inverted indexes built at load time:
+    skill -> ranked record positions, and (skill, level) -> ranked positions
+    (level-agnostic "all" entries are merged into every level). Curated entries come
+    before fallback search links, then by rank.
+    """
+
+    def __init__(self, resources: Iterable[Resource]):
+        self._records: List[Resource] = list(resources)
+        postings: Dict[str, List[int]] = {}
+        for pos, r in enumerate(self._records):
+            postings.setdefault(r.skill, []).append(pos)
+
+        self._index: Dict[str, array] = {}
+        self._level_index: Dict[Tuple[str, str], array] = {}
+        for skill, positions in postings.items():
+            positions.sort(key=lambda p: (self._records[p].fallback, self._records[p].rank, self._records[p].id))
+            self._index[skill] = array("I", positions)
+            for level in LEVELS:
+                self._level_index[(skill, level)] = array(
+                    "I", (p for p in positions if self._records[p].level in (level, "all"))
+                )
+
+    @classmethod
+    def from_csv(cls, path: Path) -> "ResourceCatalog":
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            return cls(
+                Resource(
+                    id=int(row["id"]),
+                    skill=row["skill"].strip().lower(),
+                    level=row["level"].strip().lower() or "all",
+                    type=row["type"],
+                    platform=row["platform"],
+                    title=row["title"],
+                    url=row["url"],
+                    rank=int(row["rank"] or 0),
+                    fallback=row.get("fallback") == "1",
+                )
+                for row in csv.DictReader(f)
+            )
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def skills(self) -> List[str]:
+        return sorted(s for s in self._index if s != DEFAULT_SKILL)
+
+    def records(self) -> List[Resource]:
+        return list(self._records)
+
+    def lookup(self, skill: str, level: Optional[str] = None, limit: Optional[int] = None) -> List[Resource]:
+        """Ranked resources for a skill, optionally filtered to one level."""
+        if level:
+            positions = self._level_index.get((skill, level.lower()))
+        else:
+            positions = self._index.get(skill)
+        if not positions:
+            return []
+        if limit is not None:
+            positions = positions[:limit]
+        return [self._records[p] for p in positions]
+
+
+def _load_catalog(path: Path) -> ResourceCatalog:
+    try:
+        catalog = ResourceCatalog.from_csv(path)
+    except Exception as e:
+        logger.warning("Could not load resource catalog %s: %s", path, e)
+        return ResourceCatalog([])
+    logger.info("Loaded %d learning resources for %d skills", len(catalog), len(catalog.skills()))
+    return catalog
+
+
+_catalog = _load_catalog(RESOURCES_CSV)
+
+# Bumped whenever the catalog changes; part of every bundle cache key
+_catalog_version = 0
+BUNDLE_CACHE_SIZE = int(os.environ.get("ROADMAP_CACHE_SIZE", "512"))
+
+
+def catalog_version() -> int:
+    """Current version of the resource catalog."""
+    return _catalog_version
+
+
+@lru_cache(maxsize=1)
+def _fingerprint(version: int) -> str:
+    digest = hashlib.sha256()
+    for r in _catalog.records():
+        digest.update(json.dumps([r.skill, r.rank, r.to_dict()], sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def catalog_fingerprint() -> str:
+    """Content hash of the resource catalog; unlike catalog_version, stable across processes."""
+    return _fingerprint(_catalog_version)
+
+
+def _swap_catalog(catalog: ResourceCatalog) -> None:
+    global _catalog, _catalog_version
+    _catalog = catalog
+    _catalog_version += 1
+    _render_bundle.cache_clear()
+
+
+def load_catalog(path: Path = RESOURCES_CSV) -> int:
+    """(Re)load the resource catalog from CSV; invalidates cached bundles. Returns entry count."""
+    catalog = _load_catalog(path)
+    _swap_catalog(catalog)
+    return len(catalog)
+
+
+def set_skill_resources(skill: str, resources: List[Dict[str, Any]]) -> None:
+    """Replace catalog resources for a skill and invalidate cached bundles."""
+    skill = skill.lower().strip()
+    records = [r for r in _catalog.records() if r.skill != skill]
+    next_id = max((r.id for r in records), default=0) + 1
+    for rank, r in enumerate(resources):
+        records.append(Resource(
+            id=next_id + rank,
+            skill=skill,
+            level=r.get("level", "all"),
+            type=r.get("type", "course"),
+            platform=r["platform"],
+            title=r["title"],
+            url=r["url"],
+            rank=rank,
+            fallback=bool(r.get("fallback", False)),
+        ))
+    _swap_catalog(ResourceCatalog(records))
+
+
+def get_resources_for_skill(
+    skill: str, level: Optional[str] = None, limit: Optional[int] = RESOURCES_PER_SKILL
+) -> List[Dict[str, Any]]:
+    """Get ranked learning resources for a skill (index lookup), optionally for one level."""
+    key = normalize_skill(skill)
+    found = _catalog.lookup(key, level, limit) or _catalog.lookup(DEFAULT_SKILL, None, limit)
+    if not found:
+        return [dict(r) for r in DEFAULT_RESOURCES]
+    return [r.to_dict() for r in found]
 
 
 def get_learning_resources(missing_skills: List[str]) -> Dict[str, List[Dict[str, Any]]]:
     """Get resources for each missing skill."""
-    result = {}
-    for skill in missing_skills:
-        result[skill] = get_resources_for_skill(skill)
-    return result
+    return get_learning_bundle(missing_skills, "")[1]
+
+
+# YouTube Data API v3: search.list costs 100 units of the free 10k/day quota
+YOUTUBE_API_BASE = os.environ.get("YOUTUBE_API_BASE", "https://www.googleapis.com/youtube/v3")
+YOUTUBE_SEARCH_COST = 100
+YOUTUBE_DAILY_QUOTA = int(os.environ.get("YOUTUBE_DAILY_QUOTA", "10000"))
+YOUTUBE_CACHE_TTL = float(os.environ.get("YOUTUBE_CACHE_TTL", str(24 * 3600)))
+YOUTUBE_CACHE_SIZE = 1024
+YOUTUBE_CONCURRENCY = int(os.environ.get("YOUTUBE_CONCURRENCY", "4"))
+
+# (skill, max_results) -> (expires_at, videos); insertion-ordered so the oldest entry is evicted first
+_youtube_cache: "OrderedDict[Tuple[str, int], Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+_youtube_quota = {"day": None, "used": 0}
+_youtube_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _take_youtube_quota(cost: int) -> bool:
+    """Reserve quota units for today (UTC); False if the daily budget is spent."""
+    today = datetime.now(timezone.utc).date()
+    if _youtube_quota["day"] != today:
+        _youtube_quota["day"] = today
+        _youtube_quota["used"] = 0
+    if _youtube_quota["used"] + cost > YOUTUBE_DAILY_QUOTA:
+        return False
+    _youtube_quota["used"] += cost
+    return True
+
+
+def youtube_stats() -> Dict[str, Any]:
+    """Quota and cache usage for YouTube lookups."""
+    return {
+        "quota_day": str(_youtube_quota["day"]) if _youtube_quota["day"] else None,
+        "quota_used": _youtube_quota["used"],
+        "quota_budget": YOUTUBE_DAILY_QUOTA,
+        "cached_skills": len(_youtube_cache),
+    }
 
 
 async def fetch_youtube_videos(skill: str, max_results: int = 3) -> List[Dict[str, Any]]:
-    """Fetch YouTube videos for skill using YouTube Data API v3 (free 10k quota/day)."""
+    """Fetch YouTube videos for skill using YouTube Data API v3 (cached per skill, quota-budgeted)."""
+    return (await _youtube_videos(skill, max_results))[0]
+
+
+async def _youtube_videos(skill: str, max_results: int) -> Tuple[List[Dict[str, Any]], bool]:
+    """(videos, complete); complete is False when a stale or empty fallback was served."""
     api_key = os.environ.get("YOUTUBE_API_KEY")
     if not api_key:
-        return []
+        return [], True
 
-    try:
-        from googleapiclient.discovery import build
-        youtube = build("youtube", "v3", developerKey=api_key)
-        req = youtube.search().list(
-            part="snippet",
-            q=f"{skill} tutorial programming",
-            type="video",
-            maxResults=max_results,
-            relevanceLanguage="en",
-        )
-        resp = req.execute()
-        items = resp.get("items", [])
-        return [
-            {
-                "platform": "YouTube",
-                "title": i["snippet"]["title"],
-                "url": f"https://www.youtube.com/watch?v={i['id']['videoId']}",
+    key = (normalize_skill(skill), max_results)
+    cached = _youtube_cache.get(key)
+    if cached and cached[0] > time.monotonic():
+        return cached[1], True
+    fallback = (cached[1] if cached else [], False)
+
+    # Breaker open: serve whatever we have without spending quota
+    if get_breaker("youtube").is_open():
+        return fallback
+    if not _take_youtube_quota(YOUTUBE_SEARCH_COST):
+        logger.warning("YouTube daily quota budget spent - skipping %s", skill)
+        return fallback
+
+    async def search() -> Dict[str, Any]:
+        resp = await get_http_client().get(
+            f"{YOUTUBE_API_BASE}/search",
+            params={
+                "part": "snippet",
+                "q": f"{skill} tutorial programming",
                 "type": "video",
-                "thumbnail": i["snippet"].get("thumbnails", {}).get("default", {}).get("url"),
-            }
-            for i in items if i.get("id", {}).get("videoId")
-        ]
+                "maxResults": max_results,
+                "relevanceLanguage": "en",
+                "key": api_key,
+            },
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    try:
+        items = (await guarded_call("youtube", search)).get("items", [])
+    except CircuitOpenError:
+        return fallback
     except Exception as e:
-        logger.warning("YouTube API error: %s", e)
-        return []
+        logger.warning("YouTube API error: %r", e)
+        return fallback
+
+    videos = [
+        {
+            "platform": "YouTube",
+            "title": i["snippet"]["title"],
+            "url": f"https://www.youtube.com/watch?v={i['id']['videoId']}",
+            "type": "video",
+            "thumbnail": i["snippet"].get("thumbnails", {}).get("default", {}).get("url"),
+        }
+        for i in items if i.get("id", {}).get("videoId")
+    ]
+    _youtube_cache[key] = (time.monotonic() + YOUTUBE_CACHE_TTL, videos)
+    _youtube_cache.move_to_end(key)
+    while len(_youtube_cache) > YOUTUBE_CACHE_SIZE:
+        _youtube_cache.popitem(last=False)
+    return videos, True
+
+
+async def fetch_youtube_for_skills(
+    skills: List[str], max_results: int = 3, deadline: float = OUTBOUND_DEADLINE
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Fetch videos for several skills concurrently, at most YOUTUBE_CONCURRENCY in flight.
+    Skills not done within `deadline` are dropped (callers keep the curated resources).
+    """
+    return (await fetch_youtube_for_skills_checked(skills, max_results, deadline))[0]
+
+
+async def fetch_youtube_for_skills_checked(
+    skills: List[str], max_results: int = 3, deadline: float = OUTBOUND_DEADLINE
+) -> Tuple[Dict[str, List[Dict[str, Any]]], bool]:
+    """
+    fetch_youtube_for_skills plus whether the result is complete: False if any skill
+    timed out, failed, or fell back because of the quota budget or an open breaker.
+    """
+    global _youtube_semaphore
+    if not os.environ.get("YOUTUBE_API_KEY") or not skills:
+        return {}, True
+    if _youtube_semaphore is None:
+        _youtube_semaphore = asyncio.Semaphore(YOUTUBE_CONCURRENCY)
+
+    async def one(skill: str) -> Tuple[List[Dict[str, Any]], bool]:
+        async with _youtube_semaphore:
+            return await _youtube_videos(skill, max_results)
+
+    tasks = {s: asyncio.create_task(one(s)) for s in dict.fromkeys(skills)}
+    _, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+    for task in pending:
+        task.cancel()
+    finished = {s: task.result() for s, task in tasks.items() if task not in pending and not task.exception()}
+    complete = len(finished) == len(tasks) and all(done for _, done in finished.values())
+    return {s: videos for s, (videos, _) in finished.items() if videos}, complete
 
 
 def build_rule_based_roadmap(missing_skills: List[str], role: str) -> str:
     """
     Build a learning roadmap WITHOUT LLM - rule-based, specific resources.
     """
+    return get_learning_bundle(missing_skills, role)[0]
+
+
+def get_learning_bundle(missing_skills: List[str], role: str) -> Tuple[str, Dict[str, List[Dict[str, Any]]]]:
+    """
+    Get (roadmap markdown, resources by skill) for an analysis.
+    Bundles are memoized in a bounded LRU keyed by (missing skills, role, catalog version);
+    callers must treat the returned objects as read-only.
+    """
+    return _render_bundle(tuple(missing_skills), role, _catalog_version)
+
+
+def bundle_cache_stats() -> Dict[str, Any]:
+    """Hit/miss metrics for the roadmap bundle cache."""
+    info = _render_bundle.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "hit_ratio": round(info.hits / lookups, 4) if lookups else 0.0,
+        "size": info.currsize,
+        "max_size": info.maxsize,
+        "catalog_version": _catalog_version,
+    }
+
+
+@lru_cache(maxsize=BUNDLE_CACHE_SIZE)
+def _render_bundle(missing_skills: Tuple[str, ...], role: str, version: int) -> Tuple[str, Dict[str, List[Dict[str, Any]]]]:
+    """Render roadmap and resources in one pass; `version` only keys the cache."""
+    resources = {skill: get_resources_for_skill(skill) for skill in missing_skills}
+
     if not missing_skills:
-        return "You have all the required skills! Focus on building projects and practicing system design interviews."
+        return "You have all the required skills! Focus on building projects and practicing system design interviews.", resources
 
     lines = [
         f"# Learning Roadmap for {role}",
@@ -126,8 +401,7 @@ def build_rule_based_roadmap(missing_skills: List[str], role: str) -> str:
     ]
     for i, skill in enumerate(missing_skills[:10], 1):
         lines.append(f"### {i}. {skill.title()}")
-        resources = get_resources_for_skill(skill)
-        for r in resources[:2]:
+        for r in resources[skill][:2]:
             lines.append(f"- **{r['platform']}**: [{r['title']}]({r['url']})")
         lines.append("")
 
@@ -142,4 +416,4 @@ def build_rule_based_roadmap(missing_skills: List[str], role: str) -> str:
         "- Build portfolio projects to demonstrate skills",
         "- Practice on LeetCode for DSA",
     ])
-    return "\n".join(lines)
+    return "\n".join(lines), resources
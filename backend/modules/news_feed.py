@@ -3,21 +3,54 @@ Module 2: Real-Time Job News Feed
 Uses GNews API (free 100 req/day) - https://gnews.io
 """
 
+import asyncio
+import hashlib
+import json
 import os
 import logging
-from typing import List, Dict, Any
+import tempfile
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
-import httpx
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from modules.http_client import get_http_client
+from modules.outbound import CircuitOpenError, guarded_call
+from modules.pagination import fetch_page
 
 logger = logging.getLogger(__name__)
 
-GNEWS_BASE = "https://gnews.io/api/v4"
+ROOT = Path(__file__).resolve().parent.parent
+
+GNEWS_BASE = os.environ.get("GNEWS_BASE", "https://gnews.io/api/v4")
 DEFAULT_QUERIES = [
     "hiring OR recruitment OR placement",
     "tech jobs India",
     "IT hiring 2025",
 ]
 
+# News cache: fresh for NEWS_CACHE_TTL, then served stale (while one task refreshes) up to NEWS_STALE_TTL
+NEWS_CACHE_TTL = float(os.environ.get("NEWS_CACHE_TTL", "900"))
+NEWS_STALE_TTL = float(os.environ.get("NEWS_STALE_TTL", str(24 * 3600)))
+NEWS_CACHE_PATH = Path(os.environ.get("NEWS_CACHE_PATH", str(ROOT / "data" / "news_cache.json")))
+NEWS_CACHE_SIZE = int(os.environ.get("NEWS_CACHE_SIZE", "256"))
+# Custom searches come from a public endpoint: normalised, length-capped, always fetched at
+# NEWS_MAX_COUNT (so `count` doesn't split the cache) and limited to a daily share of the quota
+NEWS_MAX_COUNT = 10
+NEWS_QUERY_MAX_CHARS = 100
+NEWS_QUERY_DAILY_BUDGET = int(os.environ.get("NEWS_QUERY_DAILY_BUDGET", "25"))
+
+# Background ingestion into Mongo (hourly x 3 queries stays inside the 100 req/day free tier)
+NEWS_INGEST_INTERVAL = float(os.environ.get("NEWS_INGEST_INTERVAL", "3600"))
+NEWS_RETENTION = int(os.environ.get("NEWS_RETENTION", str(7 * 24 * 3600)))
+NEWS_INGEST_PER_QUERY = 10
+NEWS_INGEST_LEASE = "news_ingester"
+
 
 async def fetch_gnews(query: str = "hiring OR placement", lang: str = "en", country: str = "in", max_results: int = 10) -> List[Dict[str, Any]]:
     """Fetch hiring/job news from GNews API."""
@@ -35,13 +68,17 @@ async def fetch_gnews(query: str = "hiring OR placement", lang: str = "en", coun
         "token": api_key,
     }
 
+    async def search() -> Dict[str, Any]:
+        resp = await get_http_client().get(url, params=params)
+        resp.raise_for_status()
+        return resp.json()
+
     try:
-        async with httpx.AsyncClient(timeout=15) as client:
-            resp = await client.get(url, params=params)
-            resp.raise_for_status()
-            data = resp.json()
+        data = await guarded_call("gnews", search)
+    except CircuitOpenError:
+        return []
     except Exception as e:
-        logger.warning("GNews API error: %s", e)
+        logger.warning("GNews API error: %r", e)
         return []
 
     articles = data.get("articles", [])
@@ -58,12 +95,12 @@ async def fetch_gnews(query: str = "hiring OR placement", lang: str = "en", coun
 
 
 async def get_job_news(count: int = 15) -> List[Dict[str, Any]]:
-    """Aggregate job/hiring news from multiple queries."""
+    """Aggregate job/hiring news from multiple queries (fetched concurrently, merged in query order)."""
     all_articles = []
     seen_urls = set()
 
-    for q in DEFAULT_QUERIES:
-        articles = await fetch_gnews(query=q, max_results=5)
+    results = await asyncio.gather(*(fetch_gnews(query=q, max_results=5) for q in DEFAULT_QUERIES))
+    for articles in results:
         for a in articles:
             url = a.get("url", "")
             if url and url not in seen_urls:
@@ -75,3 +112,237 @@ async def get_job_news(count: int = 15) -> List[Dict[str, Any]]:
             break
 
     return all_articles[:count]
+
+
+# normalised query -> {"fetched_at": epoch seconds, "articles": [...]}; LRU-ordered and
+# persisted so restarts don't refetch
+_news_cache: "Optional[OrderedDict[str, Dict[str, Any]]]" = None
+_news_inflight: Dict[str, asyncio.Task] = {}
+_news_stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "budget_skips": 0}
+_query_budget = {"day": None, "used": 0}
+
+
+def normalize_query(query: Optional[str]) -> str:
+    """Lower-cased, whitespace-collapsed query; raises ValueError if it is too long."""
+    query = " ".join((query or "").split()).lower()
+    if len(query) > NEWS_QUERY_MAX_CHARS:
+        raise ValueError(f"Query is too long (max {NEWS_QUERY_MAX_CHARS} characters)")
+    return query
+
+
+def _take_query_budget(cost: int) -> bool:
+    """Reserve GNews requests for custom searches today (UTC); False once the budget is spent."""
+    today = datetime.now(timezone.utc).date()
+    if _query_budget["day"] != today:
+        _query_budget["day"] = today
+        _query_budget["used"] = 0
+    if _query_budget["used"] + cost > NEWS_QUERY_DAILY_BUDGET:
+        return False
+    _query_budget["used"] += cost
+    return True
+
+
+def _load_news_cache() -> "OrderedDict[str, Dict[str, Any]]":
+    global _news_cache
+    if _news_cache is None:
+        try:
+            with open(NEWS_CACHE_PATH, "r", encoding="utf-8") as f:
+                loaded = json.load(f)
+            _news_cache = OrderedDict(sorted(loaded.items(), key=lambda item: item[1]["fetched_at"]))
+        except FileNotFoundError:
+            _news_cache = OrderedDict()
+        except Exception as e:
+            logger.warning("Ignoring unreadable news cache %s: %s", NEWS_CACHE_PATH, e)
+            _news_cache = OrderedDict()
+        _evict_news_cache()
+    return _news_cache
+
+
+def _evict_news_cache() -> None:
+    while len(_news_cache) > NEWS_CACHE_SIZE:
+        _news_cache.popitem(last=False)
+
+
+def _write_news_cache(cache: Dict[str, Any]) -> None:
+    # A temp file of its own per write: workers sharing the path never write into each other's
+    tmp = None
+    try:
+        NEWS_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=NEWS_CACHE_PATH.parent, prefix=NEWS_CACHE_PATH.name + ".", suffix=".tmp", delete=False
+        ) as f:
+            tmp = f.name
+            json.dump(cache, f)
+        os.replace(tmp, NEWS_CACHE_PATH)
+    except Exception as e:
+        logger.warning("Could not persist news cache: %s", e)
+        if tmp is not None and os.path.exists(tmp):
+            os.unlink(tmp)
+
+
+async def _persist_news_cache() -> None:
+    """Write a snapshot of the cache off the event loop."""
+    await asyncio.to_thread(_write_news_cache, dict(_news_cache))
+
+
+async def _refresh_news(query: str) -> List[Dict[str, Any]]:
+    if query and not _take_query_budget(1):
+        _news_stats["budget_skips"] += 1
+        logger.warning("GNews custom search budget spent - skipping %r", query)
+        return []
+    _news_stats["refreshes"] += 1
+    if query:
+        articles = (await fetch_gnews(query=query, max_results=NEWS_MAX_COUNT))[:NEWS_MAX_COUNT]
+    else:
+        articles = await get_job_news(count=NEWS_MAX_COUNT)
+    if articles:
+        # Only a non-empty result replaces the last good one
+        cache = _load_news_cache()
+        cache[query] = {"fetched_at": time.time(), "articles": articles}
+        cache.move_to_end(query)
+        _evict_news_cache()
+        await _persist_news_cache()
+    return articles
+
+
+def _single_flight(query: str) -> asyncio.Task:
+    """The one in-flight refresh for a query, started if needed."""
+    task = _news_inflight.get(query)
+    if task is None:
+        task = asyncio.create_task(_refresh_news(query))
+        _news_inflight[query] = task
+        task.add_done_callback(lambda _: _news_inflight.pop(query, None))
+    return task
+
+
+async def get_cached_job_news(count: int = 10, query: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Job news through a TTL + stale-while-revalidate cache keyed by the normalised query
+    (count is clamped to NEWS_MAX_COUNT and sliced from the cached result).
+    Concurrent misses share one upstream fetch; stale entries are served while a
+    single background task refreshes them. Raises ValueError for an over-long query.
+    """
+    query = normalize_query(query)
+    count = max(1, min(count, NEWS_MAX_COUNT))
+    cache = _load_news_cache()
+    entry = cache.get(query)
+    age = time.time() - entry["fetched_at"] if entry else None
+    if entry:
+        cache.move_to_end(query)
+
+    if entry and age < NEWS_CACHE_TTL:
+        _news_stats["hits"] += 1
+        return entry["articles"][:count]
+    if entry and age < NEWS_STALE_TTL:
+        _news_stats["stale_hits"] += 1
+        _single_flight(query)
+        return entry["articles"][:count]
+
+    _news_stats["misses"] += 1
+    articles = await asyncio.shield(_single_flight(query))
+    if not articles and entry:
+        return entry["articles"][:count]
+    return articles[:count]
+
+
+def news_cache_stats() -> Dict[str, Any]:
+    """Hit/miss metrics for the news cache."""
+    return {
+        **_news_stats,
+        "entries": len(_load_news_cache()),
+        "inflight": len(_news_inflight),
+        "query_budget_used": _query_budget["used"],
+    }
+
+
+# Ingested news store: articles upserted by URL hash, read with keyset pagination
+def url_hash(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+async def ingest_news(collection) -> List[Dict[str, Any]]:
+    """Pull every DEFAULT_QUERIES feed once and upsert the articles; returns the newly inserted ones."""
+    results = await asyncio.gather(
+        *(fetch_gnews(query=q, max_results=NEWS_INGEST_PER_QUERY) for q in DEFAULT_QUERIES)
+    )
+    now = datetime.now(timezone.utc)
+    ops = {}
+    fetched = {}
+    for q, articles in zip(DEFAULT_QUERIES, results):
+        for a in articles:
+            if not a.get("url"):
+                continue
+            doc_id = url_hash(a["url"])
+            if doc_id in ops:
+                continue
+            fetched[doc_id] = {**a, "id": doc_id}
+            ops[doc_id] = UpdateOne(
+                {"_id": doc_id},
+                {
+                    "$set": {**a, "id": doc_id, "ingested_at": now},
+                    "$setOnInsert": {"query": q, "first_seen": now},
+                },
+                upsert=True,
+            )
+    if not ops:
+        return []
+    result = await collection.bulk_write(list(ops.values()), ordered=False)
+    return [fetched[doc_id] for doc_id in result.upserted_ids.values()]
+
+
+async def take_ingest_lease(locks, owner: str, ttl: float) -> bool:
+    """Take or renew the ingest lease in `locks` for ttl seconds; False while another owner holds it."""
+    now = datetime.now(timezone.utc)
+    try:
+        await locks.update_one(
+            {"_id": NEWS_INGEST_LEASE, "$or": [{"owner": owner}, {"expires_at": {"$lt": now}}]},
+            {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=ttl)}},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        # The lease document exists and is held by someone else
+        return False
+    return True
+
+
+async def run_news_ingester(
+    collection,
+    interval: float = NEWS_INGEST_INTERVAL,
+    on_new_articles: Optional[Callable[[List[Dict[str, Any]]], Awaitable[None]]] = None,
+    locks=None,
+) -> None:
+    """
+    Ingest forever on a fixed interval (started as a task at app startup).
+    With a `locks` collection only the worker holding the lease calls GNews; the
+    others pass the articles it stored since their last round to on_new_articles.
+    """
+    owner = uuid.uuid4().hex
+    since = datetime.now(timezone.utc)
+    while True:
+        try:
+            started = datetime.now(timezone.utc)
+            if locks is None or await take_ingest_lease(locks, owner, interval * 1.5):
+                new_articles = await ingest_news(collection)
+                logger.info("News ingester stored %d new articles", len(new_articles))
+            else:
+                new_articles = await list_recent_news(collection, since)
+            since = started
+            if new_articles and on_new_articles:
+                await on_new_articles(new_articles)
+        except Exception as e:
+            logger.warning("News ingestion failed: %s", e)
+        await asyncio.sleep(interval)
+
+
+async def list_recent_news(collection, since: datetime) -> List[Dict[str, Any]]:
+    """Articles first seen since `since` (used to rebuild in-memory indexes at startup)."""
+    return await collection.find(
+        {"first_seen": {"$gte": since}}, {"_id": 0, "ingested_at": 0, "query": 0}
+    ).to_list(None)
+
+
+async def list_ingested_news(collection, limit: int = 15, cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """One page of ingested articles, newest first, and the cursor for the next page."""
+    return await fetch_page(
+        collection, {}, {"_id": 0, "ingested_at": 0, "first_seen": 0, "query": 0}, "publishedAt", limit, cursor
+    )
@@ -0,0 +1,144 @@
+"""
+Outbound API call layer: deadlines + circuit breakers
+Every third-party call (GNews, YouTube) runs under a deadline and a per-service breaker.
+While a breaker is open, calls fail fast so callers fall back to cached/curated data.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+OUTBOUND_DEADLINE = float(os.environ.get("OUTBOUND_DEADLINE", "5"))
+BREAKER_WINDOW = int(os.environ.get("BREAKER_WINDOW", "20"))
+BREAKER_MIN_CALLS = int(os.environ.get("BREAKER_MIN_CALLS", "5"))
+BREAKER_FAILURE_RATE = float(os.environ.get("BREAKER_FAILURE_RATE", "0.5"))
+BREAKER_RESET_TIMEOUT = float(os.environ.get("BREAKER_RESET_TIMEOUT", "30"))
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a service whose breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Failure-rate breaker over the last `window` calls.
+    closed -> open once failures/calls >= failure_rate (with at least min_calls);
+    open -> half_open after reset_timeout, letting a single probe through;
+    the probe's outcome closes or re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: int = BREAKER_WINDOW,
+        min_calls: int = BREAKER_MIN_CALLS,
+        failure_rate: float = BREAKER_FAILURE_RATE,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.short_circuited = 0
+        self._outcomes = deque(maxlen=window)
+        self._probe_in_flight = False
+
+    def is_open(self) -> bool:
+        """True while calls would be rejected (no state change)."""
+        if self.state == OPEN:
+            return time.monotonic() - self.opened_at < self.reset_timeout
+        return self.state == HALF_OPEN and self._probe_in_flight
+
+    def allow(self) -> bool:
+        """Whether a call may proceed now; claims the probe slot when half-open."""
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            self._probe_in_flight = False
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self.short_circuited += 1
+        return False
+
+    def record_success(self) -> None:
+        if self.state == HALF_OPEN:
+            logger.info("Circuit %s closed", self.name)
+            self.state = CLOSED
+            self._outcomes.clear()
+        self._probe_in_flight = False
+        self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        self._probe_in_flight = False
+        if self.state == HALF_OPEN:
+            self._open()
+            return
+        self._outcomes.append(False)
+        failures = self._outcomes.count(False)
+        if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_rate:
+            self._open()
+
+    def release(self) -> None:
+        """Give back a probe slot without recording an outcome."""
+        self._probe_in_flight = False
+
+    def _open(self) -> None:
+        if self.state != OPEN:
+            logger.warning("Circuit %s opened", self.name)
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        calls = len(self._outcomes)
+        return {
+            "state": OPEN if self.is_open() else self.state,
+            "window_calls": calls,
+            "window_failure_rate": round(self._outcomes.count(False) / calls, 4) if calls else 0.0,
+            "short_circuited": self.short_circuited,
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    if name not in _breakers:
+        _breakers[name] = CircuitBreaker(name)
+    return _breakers[name]
+
+
+def breaker_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: b.stats() for name, b in _breakers.items()}
+
+
+async def guarded_call(service: str, call: Callable[[], Awaitable[Any]], deadline: float = OUTBOUND_DEADLINE) -> Any:
+    """
+    Run `call()` under the service's breaker and an overall deadline.
+    Raises CircuitOpenError without calling when the breaker is open; timeouts
+    and errors count as failures and are re-raised for the caller's fallback.
+    """
+    breaker = get_breaker(service)
+    if not breaker.allow():
+        raise CircuitOpenError(f"{service} circuit open")
+    try:
+        result = await asyncio.wait_for(call(), timeout=deadline)
+    except asyncio.CancelledError:
+        # Caller gave up (e.g. its own deadline); not the service's fault
+        breaker.release()
+        raise
+    except Exception:
+        breaker.record_failure()
+        raise
+    breaker.record_success()
+    return result
@@ -0,0 +1,74 @@
+"""
+Keyset (cursor) pagination helpers
+Pages are ordered by (sort field desc, id desc); the cursor is the last row's key, opaque to clients
+"""
+
+import base64
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(sort_value: Any, doc_id: str) -> str:
+    raw = json.dumps([sort_value, doc_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, str]:
+    """Decode a cursor; raises ValueError if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, doc_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    # Cursors come from clients: only scalars may reach the query, never an operator document
+    if isinstance(sort_value, bool) or not isinstance(sort_value, (str, int, float, type(None))) or not isinstance(doc_id, str):
+        raise ValueError("Invalid cursor")
+    return sort_value, doc_id
+
+
+def keyset_filter(base: Dict[str, Any], sort_field: str, cursor: Optional[str]) -> Dict[str, Any]:
+    """Mongo filter for the page after `cursor` in (sort_field desc, id desc) order."""
+    if not cursor:
+        return base
+    sort_value, doc_id = decode_cursor(cursor)
+    after = {
+        "$or": [
+            {sort_field: {"$lt": sort_value}},
+            {sort_field: sort_value, "id": {"$lt": doc_id}},
+        ]
+    }
+    return {"$and": [base, after]} if base else after
+
+
+def keyset_sort(sort_field: str) -> List[Tuple[str, int]]:
+    return [(sort_field, -1), ("id", -1)]
+
+
+def clamp_limit(limit: int) -> int:
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def split_page(rows: List[Dict[str, Any]], sort_field: str, limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Split rows fetched with `limit + 1` into (page, next cursor);
+    the cursor is None when there is no following page.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(last[sort_field], last["id"])
+
+
+async def fetch_page(
+    collection, base: Dict[str, Any], projection: Dict[str, Any], sort_field: str,
+    limit: int, cursor: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """One keyset page of `collection` and the cursor for the next; raises ValueError on a bad cursor."""
+    limit = clamp_limit(limit)
+    rows = await collection.find(keyset_filter(base, sort_field, cursor), projection).sort(
+        keyset_sort(sort_field)
+    ).limit(limit + 1).to_list(limit + 1)
+    return split_page(rows, sort_field, limit)
@@ -0,0 +1,116 @@
+"""
+Password hashing off the event loop
+bcrypt runs in a small dedicated thread pool (it releases the GIL), so a login burst
+queues behind the pool instead of stalling every other request in the worker.
+Auth attempts are admitted per client IP with a token bucket, and the number of
+hashes waiting for the pool is capped.
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import bcrypt
+
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+BCRYPT_WORKERS = int(os.environ.get("BCRYPT_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Hashes allowed to wait for a pool thread before new auth requests are shed
+BCRYPT_MAX_PENDING = int(os.environ.get("BCRYPT_MAX_PENDING", "64"))
+# Per-IP token bucket: sustained attempts per minute and burst size
+AUTH_RATE_PER_MINUTE = float(os.environ.get("AUTH_RATE_PER_MINUTE", "20"))
+AUTH_BURST = int(os.environ.get("AUTH_BURST", "10"))
+AUTH_TRACKED_CLIENTS = 10000
+
+
+class AuthBusyError(Exception):
+    """Raised when an auth attempt is not admitted; carries the suggested retry delay."""
+
+    def __init__(self, retry_after: float, reason: str):
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+
+class AuthAdmission:
+    """Per-client token buckets (LRU-bounded) plus a global cap on queued hashes."""
+
+    def __init__(self, rate_per_minute: float = AUTH_RATE_PER_MINUTE, burst: int = AUTH_BURST,
+                 max_pending: int = BCRYPT_MAX_PENDING, max_clients: int = AUTH_TRACKED_CLIENTS):
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.max_pending = max_pending
+        self.max_clients = max_clients
+        self.pending = 0
+        self.rejected = 0
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def admit(self, client: str) -> None:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise AuthBusyError(1.0, "Too many authentication requests in progress")
+        now = time.monotonic()
+        tokens, last = self._buckets.get(client, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - last) * self.rate)
+        if tokens < 1.0:
+            self.rejected += 1
+            self._buckets[client] = (tokens, now)
+            raise AuthBusyError((1.0 - tokens) / self.rate if self.rate else 60.0, "Too many authentication attempts")
+        self._buckets[client] = (tokens - 1.0, now)
+        self._buckets.move_to_end(client)
+        while len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {"pending": self.pending, "rejected": self.rejected, "tracked_clients": len(self._buckets)}
+
+
+admission = AuthAdmission()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+    return _executor
+
+
+async def _run(fn, *args):
+    admission.pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_executor(), fn, *args)
+    finally:
+        admission.pending -= 1
+
+
+def _hash(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=rounds)).decode("utf-8")
+
+
+def _check(password: str, hashed: str) -> bool:
+    return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+
+
+async def hash_password(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
+    return await _run(_hash, password, rounds)
+
+
+async def verify_password(password: str, hashed: str) -> bool:
+    return await _run(_check, password, hashed)
+
+
+def needs_rehash(hashed: str, rounds: int = BCRYPT_ROUNDS) -> bool:
+    """True if the stored hash was made with a different work factor ($2b$<rounds>$...)."""
+    try:
+        return int(hashed.split("$")[2]) != rounds
+    except (IndexError, ValueError):
+        return True
+
+
+def shutdown_password_pool() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
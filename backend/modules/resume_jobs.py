@@ -0,0 +1,303 @@
+"""
+Background resume processing
+Uploads can be queued instead of processed inside the request: a bounded in-process
+queue feeds RESUME_JOB_WORKERS workers, each running the pipeline (text extraction,
+skill matching, level estimation, storage) with its CPU-bound steps in a thread pool.
+Each job records its stage transitions as events that clients can follow (the server
+streams them as Server-Sent Events); queue depth, queue wait and per-stage latency are
+reported in stats(). Jobs live in this process only, and finished jobs are kept for
+RESUME_JOB_RETENTION seconds. One user may have at most RESUME_JOB_MAX_PER_USER jobs
+waiting, so a single client cannot fill the queue and turn everyone else away.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+RESUME_JOB_WORKERS = int(os.environ.get("RESUME_JOB_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Jobs allowed to wait for a worker before new uploads are turned away
+RESUME_JOB_MAX_QUEUED = int(os.environ.get("RESUME_JOB_MAX_QUEUED", "100"))
+RESUME_JOB_MAX_PER_USER = int(os.environ.get("RESUME_JOB_MAX_PER_USER", "5"))
+RESUME_JOB_RETENTION = float(os.environ.get("RESUME_JOB_RETENTION", "600"))
+LATENCY_WINDOW = 1000
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+# process(user_id, filename, payload, stage) -> result; stage(name) marks the start of a step.
+# A ValueError is the client's fault and its message is reported as-is.
+Processor = Callable[[str, str, bytes, Callable[[str], None]], Awaitable[Dict[str, Any]]]
+
+
+class QueueFullError(Exception):
+    """Raised when RESUME_JOB_MAX_QUEUED jobs are already waiting."""
+
+    def __init__(self, retry_after: float, message: str = "Resume processing queue is full"):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class UserQueueFullError(QueueFullError):
+    """Raised when the user already has RESUME_JOB_MAX_PER_USER jobs waiting."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(retry_after, "Too many of your resumes are waiting to be processed")
+
+
+class LatencyWindow:
+    """Latencies of the last `size` samples, summarised as p50 / p95 / max in ms."""
+
+    def __init__(self, size: int = LATENCY_WINDOW):
+        self.count = 0
+        self._samples = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self._samples.append(seconds)
+
+    def summary(self) -> Dict[str, float]:
+        if not self._samples:
+            return {"count": 0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        samples = sorted(self._samples)
+        return {
+            "count": self.count,
+            "p50_ms": round(samples[len(samples) // 2] * 1000, 1),
+            "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 1),
+            "max_ms": round(samples[-1] * 1000, 1),
+        }
+
+
+class ResumeJob:
+    def __init__(self, user_id: str, filename: str, payload: bytes):
+        self.id = str(uuid.uuid4())
+        self.user_id = user_id
+        self.filename = filename
+        self.payload: Optional[bytes] = payload
+        self.status = QUEUED
+        self.stage: Optional[str] = None
+        self.stage_ms: Dict[str, float] = {}
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now(timezone.utc).isoformat()
+        self.submitted = time.monotonic()
+        self.finished_at: Optional[float] = None
+        self.events: List[Dict[str, Any]] = []
+        self.changed = asyncio.Event()
+
+    def publish(self, event: str, **data) -> None:
+        self.events.append({"event": event, "data": {"job_id": self.id, "status": self.status, **data}})
+        # Wake current followers; later waits use a fresh event
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    def view(self) -> Dict[str, Any]:
+        view = {
+            "job_id": self.id,
+            "status": self.status,
+            "stage": self.stage,
+            "filename": self.filename,
+            "created_at": self.created_at,
+            "stage_ms": self.stage_ms,
+        }
+        if self.status == DONE:
+            view["result"] = self.result
+        if self.status == FAILED:
+            view["error"] = self.error
+        return view
+
+
+class _StageClock:
+    """Times consecutive stages of one run and records them per stage name."""
+
+    def __init__(self, latencies: Dict[str, LatencyWindow], job: Optional[ResumeJob] = None):
+        self.latencies = latencies
+        self.job = job
+        self.current: Optional[str] = None
+        self.started = 0.0
+
+    def __call__(self, name: str) -> None:
+        self.stop()
+        self.current, self.started = name, time.monotonic()
+        if self.job is not None:
+            self.job.stage = name
+            self.job.publish("stage", stage=name)
+
+    def stop(self) -> None:
+        if self.current is None:
+            return
+        elapsed = time.monotonic() - self.started
+        self.latencies.setdefault(self.current, LatencyWindow()).add(elapsed)
+        if self.job is not None:
+            self.job.stage_ms[self.current] = round(elapsed * 1000, 1)
+        self.current = None
+
+
+class ResumeJobQueue:
+    def __init__(self, process: Processor, workers: int = RESUME_JOB_WORKERS,
+                 max_queued: int = RESUME_JOB_MAX_QUEUED, retention: float = RESUME_JOB_RETENTION,
+                 max_per_user: int = RESUME_JOB_MAX_PER_USER):
+        self.process = process
+        self.workers = workers
+        self.max_queued = max_queued
+        self.max_per_user = min(max_per_user, max_queued)
+        # user -> jobs of theirs still waiting for a worker; dropped at zero
+        self._queued_by_user: Dict[str, int] = {}
+        self.retention = retention
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._jobs: "OrderedDict[str, ResumeJob]" = OrderedDict()
+        self._running = 0
+        self._queue_wait = LatencyWindow()
+        self._stage_latency: Dict[str, LatencyWindow] = {}
+        self._total = LatencyWindow()
+        self._counts = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0, "user_rejected": 0}
+
+    def start(self) -> None:
+        """Create the queue, thread pool and workers (call from the running loop)."""
+        self._queue = asyncio.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="resume")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def run_in_pool(self, fn, *args):
+        """Run a CPU-bound pipeline step on the resume thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    def submit(self, user_id: str, filename: str, payload: bytes) -> ResumeJob:
+        self._prune()
+        if self._queue.qsize() >= self.max_queued:
+            self._counts["rejected"] += 1
+            raise QueueFullError(retry_after=max(1.0, self._queue.qsize() / max(1, self.workers)))
+        waiting = self._queued_by_user.get(user_id, 0)
+        if waiting >= self.max_per_user:
+            self._counts["user_rejected"] += 1
+            raise UserQueueFullError(retry_after=max(1.0, waiting / max(1, self.workers)))
+        self._queued_by_user[user_id] = waiting + 1
+        job = ResumeJob(user_id, filename, payload)
+        self._jobs[job.id] = job
+        self._counts["submitted"] += 1
+        job.publish("queued", position=self._queue.qsize() + 1)
+        self._queue.put_nowait(job)
+        return job
+
+    async def run_inline(self, user_id: str, filename: str, payload: bytes) -> Dict[str, Any]:
+        """Process in the caller's request (no queue), still recording stage latencies."""
+        clock = _StageClock(self._stage_latency)
+        started = time.monotonic()
+        try:
+            return await self.process(user_id, filename, payload, clock)
+        finally:
+            clock.stop()
+            self._total.add(time.monotonic() - started)
+
+    def get(self, job_id: str, user_id: str) -> Optional[ResumeJob]:
+        self._prune()
+        job = self._jobs.get(job_id)
+        return job if job is not None and job.user_id == user_id else None
+
+    async def events(self, job: ResumeJob, heartbeat: float = 15.0) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Every event of `job` from the start until it finishes; None after `heartbeat` idle seconds."""
+        sent = 0
+        while True:
+            while sent < len(job.events):
+                sent += 1
+                yield job.events[sent - 1]
+            if job.status in (DONE, FAILED):
+                return
+            try:
+                await asyncio.wait_for(job.changed.wait(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield None
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            self._dequeued(job)
+            self._running += 1
+            try:
+                await self._run(job)
+            finally:
+                self._running -= 1
+                self._queue.task_done()
+
+    async def _run(self, job: ResumeJob) -> None:
+        started = time.monotonic()
+        self._queue_wait.add(started - job.submitted)
+        job.status = RUNNING
+        clock = _StageClock(self._stage_latency, job)
+        try:
+            job.result = await self.process(job.user_id, job.filename, job.payload, clock)
+            clock.stop()
+            job.status = DONE
+            self._counts["completed"] += 1
+            job.publish("done", result=job.result, stage_ms=job.stage_ms)
+        except asyncio.CancelledError:
+            self._fail(job, "Server shutting down")
+            raise
+        except ValueError as e:
+            clock.stop()
+            self._fail(job, str(e))
+        except Exception as e:
+            clock.stop()
+            logger.exception("Resume job %s failed", job.id)
+            self._fail(job, f"Processing failed: {e}")
+        finally:
+            job.payload = None
+            job.finished_at = time.monotonic()
+            self._total.add(job.finished_at - started)
+
+    def _dequeued(self, job: ResumeJob) -> None:
+        left = self._queued_by_user[job.user_id] - 1
+        if left:
+            self._queued_by_user[job.user_id] = left
+        else:
+            del self._queued_by_user[job.user_id]
+
+    def _fail(self, job: ResumeJob, error: str) -> None:
+        job.status = FAILED
+        job.error = error
+        self._counts["failed"] += 1
+        job.publish("failed", error=error, stage=job.stage)
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.retention
+        expired = [jid for jid, job in self._jobs.items() if job.finished_at is not None and job.finished_at < cutoff]
+        for jid in expired:
+            del self._jobs[jid]
+
+    async def close(self) -> None:
+        """Stop the workers; jobs still queued or running are reported as failed."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._queue is not None:
+            while not self._queue.empty():
+                job = self._queue.get_nowait()
+                self._dequeued(job)
+                self._fail(job, "Server shutting down")
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._counts,
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "running": self._running,
+            "max_queued": self.max_queued,
+            "max_per_user": self.max_per_user,
+            "queued_users": len(self._queued_by_user),
+            "retained_jobs": len(self._jobs),
+            "queue_wait": self._queue_wait.summary(),
+            "total": self._total.summary(),
+            "stages": {name: window.summary() for name, window in self._stage_latency.items()},
+        }
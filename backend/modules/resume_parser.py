@@ -5,6 +5,7 @@ Uses PyMuPDF (fitz) for PDF, python-docx for DOCX, spaCy + PhraseMatcher for ski
 
 import io
 import re
+import threading
 from pathlib import Path
 from typing import List, Dict, Any, Tuple
 
@@ -43,6 +44,10 @@ BEGINNER_VERBS = {
     "used", "learned", "explored", "assisted", "helped", "supported"
 }
 
+# spaCy does not promise that one Language / PhraseMatcher is safe to use from several
+# threads at once; resume workers and news indexing share one, so their spaCy calls take turns
+NLP_LOCK = threading.Lock()
+
 
 def extract_text_from_pdf(file_bytes: bytes) -> str:
     """Extract text from PDF using PyMuPDF (fitz) - fallback to pdfminer if needed."""
@@ -107,9 +112,10 @@ def extract_skills_from_text(text: str, nlp, matcher) -> List[str]:
     extracted = set()
 
     # 1. PhraseMatcher
-    doc = nlp(text_lower)
-    for _, start, end in matcher(doc):
-        span = doc[start:end].text
+    with NLP_LOCK:
+        doc = nlp(text_lower)
+        spans = [doc[start:end].text for _, start, end in matcher(doc)]
+    for span in spans:
         extracted.add(normalize_skill(span))
 
     # 2. Synonym matching
@@ -129,6 +135,20 @@ def extract_skills_from_text(text: str, nlp, matcher) -> List[str]:
     return list(extracted)
 
 
+def extract_skills_batch(texts: List[str], nlp, matcher, ignore=frozenset(), batch_size: int = 64) -> List[List[str]]:
+    """
+    Extract skills from many short texts (e.g. news headlines) in one pass.
+    Tokenizer-only nlp.pipe + PhraseMatcher; no substring/fuzzy passes, which are
+    too noisy outside resumes. Matched terms in `ignore` are skipped.
+    """
+    with NLP_LOCK:
+        matched = [
+            [doc[start:end].text for _, start, end in matcher(doc)]
+            for doc in nlp.tokenizer.pipe((t.lower() for t in texts), batch_size=batch_size)
+        ]
+    return [sorted({normalize_skill(span) for span in spans if span not in ignore}) for spans in matched]
+
+
 def estimate_skill_levels(text: str, skills: List[str]) -> Dict[str, str]:
     """
     Rule-based skill level: Advanced / Intermediate / Beginner
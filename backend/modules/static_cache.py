@@ -0,0 +1,99 @@
+"""
+Pre-serialised responses for static catalog endpoints
+JSON is encoded once per data version, with gzip (and brotli, when installed) variants
+and strong per-variant ETags; If-None-Match revalidations get a bodyless 304.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+STATIC_CACHE_MAX_AGE = int(os.environ.get("STATIC_CACHE_MAX_AGE", "3600"))
+
+
+class EncodedResponse:
+    """One payload, encoded once: identity/gzip/br bodies and their ETags."""
+
+    __slots__ = ("bodies", "etags")
+
+    def __init__(self, payload: Any):
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.bodies: Dict[str, bytes] = {
+            "identity": body,
+            "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+        }
+        if HAS_BROTLI:
+            self.bodies["br"] = brotli.compress(body, quality=11)
+        # Strong ETags must differ per representation
+        self.etags: Dict[str, str] = {
+            enc: f'"{digest}"' if enc == "identity" else f'"{digest}-{enc}"' for enc in self.bodies
+        }
+
+    def sizes(self) -> Dict[str, int]:
+        return {enc: len(body) for enc, body in self.bodies.items()}
+
+
+class StaticResponseCache:
+    """key -> (data version, EncodedResponse); rebuilt only when the version changes."""
+
+    def __init__(self):
+        self._entries: Dict[Hashable, Tuple[Any, EncodedResponse]] = {}
+
+    def get(self, key: Hashable, build: Callable[[], Any], version: Any = None) -> EncodedResponse:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != version:
+            entry = (version, EncodedResponse(build()))
+            self._entries[key] = entry
+        return entry[1]
+
+    def stats(self) -> Dict[str, Any]:
+        return {str(key): encoded.sizes() for key, (_, encoded) in self._entries.items()}
+
+
+def _pick_encoding(accept_encoding: str, available: Dict[str, bytes]) -> str:
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip().lower())
+    for enc in ("br", "gzip"):
+        if enc in available and (enc in accepted or "*" in accepted):
+            return enc
+    return "identity"
+
+
+def _matches(if_none_match: Optional[str], etags: Dict[str, str]) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return any(tag in tags for tag in etags.values())
+
+
+def static_response(request: Request, encoded: EncodedResponse, max_age: int = STATIC_CACHE_MAX_AGE) -> Response:
+    """Serve a pre-encoded payload, negotiating encoding and answering revalidations with 304."""
+    encoding = _pick_encoding(request.headers.get("accept-encoding", ""), encoded.bodies)
+    headers = {
+        "ETag": encoded.etags[encoding],
+        "Cache-Control": f"public, max-age={max_age}",
+        "Vary": "Accept-Encoding",
+    }
+    if _matches(request.headers.get("if-none-match"), encoded.etags):
+        return Response(status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=encoded.bodies[encoding], media_type="application/json", headers=headers)
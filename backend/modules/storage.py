@@ -0,0 +1,31 @@
+"""
+Storage backend selection (STORAGE_BACKEND=mongo | memory)
+Routes and modules talk to collections through the Motor collection API - find /
+find_one / count_documents, insert_one / insert_many, update_one (upsert),
+delete_one / delete_many, bulk_write and create_indexes - so a backend is anything
+that provides that API:
+
+- mongo:  Motor against MONGO_URL (the default)
+- memory: the embedded in-process store in modules/embedded_db.py, with the same
+          query, sort, projection, upsert and unique-index semantics; no server needed,
+          nothing persisted, deterministic - for tests and local load testing
+"""
+
+import os
+from typing import Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from modules.embedded_db import EmbeddedClient
+
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "mongo")
+STORAGE_BACKENDS = ("mongo", "memory")
+
+
+def open_client(backend: str = STORAGE_BACKEND, mongo_url: Optional[str] = None):
+    """A Motor-compatible client for `backend`; raises ValueError for unknown backends."""
+    if backend == "mongo":
+        return AsyncIOMotorClient(mongo_url or os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    if backend == "memory":
+        return EmbeddedClient()
+    raise ValueError(f"STORAGE_BACKEND must be one of {', '.join(STORAGE_BACKENDS)}")
@@ -0,0 +1,107 @@
+"""
+Trending skills from the news stream
+Ingested article titles/descriptions go through the skill extractor in batches;
+mentions are counted in hourly buckets kept in a ring buffer, and per-window
+rankings are precomputed so reads are O(k).
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from modules.resume_parser import extract_skills_batch
+
+logger = logging.getLogger(__name__)
+
+TRENDING_BUCKET_SECONDS = int(os.environ.get("TRENDING_BUCKET_SECONDS", "3600"))
+# window name -> number of buckets
+TRENDING_WINDOWS = {"24h": 24, "7d": 168}
+
+# Taxonomy synonyms that are ordinary words in headlines ("go", "next", "rest", ...)
+AMBIGUOUS_TERMS = frozenset({
+    "go", "r", "next", "rest", "node", "spring", "swift", "express", "rails",
+    "ui", "ux", "cv", "ts", "tf", "dl", "py", "js", "xd", "sketch", "security",
+    "architecture", "analytical", "collaboration", "communication", "leadership",
+})
+
+
+class TrendingIndex:
+    """Ring buffer of per-bucket skill Counters with precomputed per-window rankings."""
+
+    def __init__(self, bucket_seconds: int = TRENDING_BUCKET_SECONDS, windows: Optional[Dict[str, int]] = None):
+        self.bucket_seconds = bucket_seconds
+        self.windows = dict(windows or TRENDING_WINDOWS)
+        self.size = max(self.windows.values())
+        self._slots = [Counter() for _ in range(self.size)]
+        self._slot_bucket = [-1] * self.size
+        self._ranked: Dict[str, List[Tuple[str, int]]] = {w: [] for w in self.windows}
+        self._ranked_bucket = -1
+        self._dirty = False
+        self.articles_indexed = 0
+
+    def _bucket(self, ts: float) -> int:
+        return int(ts // self.bucket_seconds)
+
+    def add(self, skills: Iterable[str], ts: Optional[float] = None) -> bool:
+        """Count one article's skills at time `ts`; False if outside the retained range."""
+        now_bucket = self._bucket(time.time())
+        bucket = self._bucket(ts) if ts is not None else now_bucket
+        if bucket > now_bucket or bucket <= now_bucket - self.size:
+            return False
+        slot = bucket % self.size
+        if self._slot_bucket[slot] != bucket:
+            self._slots[slot] = Counter()
+            self._slot_bucket[slot] = bucket
+        self._slots[slot].update(skills)
+        self.articles_indexed += 1
+        self._dirty = True
+        return True
+
+    def _rerank(self, now_bucket: int) -> None:
+        for name, span in self.windows.items():
+            total = Counter()
+            for bucket in range(now_bucket - span + 1, now_bucket + 1):
+                slot = bucket % self.size
+                if self._slot_bucket[slot] == bucket:
+                    total.update(self._slots[slot])
+            self._ranked[name] = sorted(total.items(), key=lambda kv: (-kv[1], kv[0]))
+        self._ranked_bucket = now_bucket
+        self._dirty = False
+
+    def top(self, window: str, k: int) -> List[Tuple[str, int]]:
+        """Top-k (skill, mentions) for a window; rankings refresh after writes or a bucket rollover."""
+        if window not in self.windows:
+            raise ValueError(f"Unknown window: {window}. Use one of {', '.join(self.windows)}")
+        now_bucket = self._bucket(time.time())
+        if self._dirty or now_bucket != self._ranked_bucket:
+            self._rerank(now_bucket)
+        return self._ranked[window][:k]
+
+
+trending_index = TrendingIndex()
+
+
+def _published_ts(article: Dict[str, Any]) -> Optional[float]:
+    try:
+        return datetime.fromisoformat(article["publishedAt"].replace("Z", "+00:00")).timestamp()
+    except Exception:
+        return None
+
+
+async def index_articles(articles: List[Dict[str, Any]], nlp, matcher, index: TrendingIndex = trending_index) -> int:
+    """Extract skills from articles (batched, off the event loop) and count them; returns articles counted."""
+    texts = [f"{a.get('title') or ''}. {a.get('description') or ''}" for a in articles]
+    skill_lists = await asyncio.to_thread(extract_skills_batch, texts, nlp, matcher, AMBIGUOUS_TERMS)
+    counted = 0
+    for article, skills in zip(articles, skill_lists):
+        if skills and index.add(skills, _published_ts(article)):
+            counted += 1
+    return counted
+
+
+def get_trending_skills(window: str = "24h", limit: int = 10, index: TrendingIndex = trending_index) -> List[Dict[str, Any]]:
+    return [{"skill": skill, "mentions": mentions} for skill, mentions in index.top(window, limit)]
@@ -0,0 +1,162 @@
+"""
+Write-behind buffer for history inserts (opt-in: WRITE_BEHIND_ENABLED=1)
+Documents are queued in memory and written with insert_many(ordered=False) when a batch
+fills or the flush interval passes. Queued + in-flight documents are capped, so callers
+wait (backpressure) instead of memory growing. Reads that must see a user's own writes
+flush first; shutdown flushes everything that is still queued.
+A document rejected by the server is retried WRITE_BEHIND_MAX_ATTEMPTS times, then logged
+and counted in stats(); the last WRITE_BEHIND_FAILED_KEEP of them stay in `failed` for
+inspection, so a long outage cannot grow memory without bound. Documents that must be
+checked against a unique index by the caller (e.g. analyses with a memo_key) should be
+inserted directly: a buffered insert cannot report the conflict.
+"""
+
+import asyncio
+import logging
+import os
+from collections import Counter, deque
+from typing import Any, Dict, List, Optional
+
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+WRITE_BEHIND_ENABLED = os.environ.get("WRITE_BEHIND_ENABLED", "0") == "1"
+WRITE_BEHIND_MAX_BATCH = int(os.environ.get("WRITE_BEHIND_MAX_BATCH", "500"))
+WRITE_BEHIND_FLUSH_INTERVAL = float(os.environ.get("WRITE_BEHIND_FLUSH_INTERVAL", "0.05"))
+WRITE_BEHIND_MAX_PENDING = int(os.environ.get("WRITE_BEHIND_MAX_PENDING", "10000"))
+WRITE_BEHIND_MAX_ATTEMPTS = int(os.environ.get("WRITE_BEHIND_MAX_ATTEMPTS", "3"))
+WRITE_BEHIND_FAILED_KEEP = int(os.environ.get("WRITE_BEHIND_FAILED_KEEP", "100"))
+DUPLICATE_KEY = 11000
+
+
+class WriteBehindBuffer:
+    """Batches inserts into one collection."""
+
+    def __init__(self, collection, max_batch: int = WRITE_BEHIND_MAX_BATCH,
+                 flush_interval: float = WRITE_BEHIND_FLUSH_INTERVAL, max_pending: int = WRITE_BEHIND_MAX_PENDING,
+                 max_attempts: int = WRITE_BEHIND_MAX_ATTEMPTS, keep_failed: int = WRITE_BEHIND_FAILED_KEEP):
+        self.collection = collection
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self._queue: List[Dict[str, Any]] = []
+        # The most recent documents the server kept rejecting, held for inspection
+        self.failed: "deque[Dict[str, Any]]" = deque(maxlen=keep_failed)
+        self._attempts: Dict[int, int] = {}
+        self._pending_users: Counter = Counter()
+        self._space: Optional[asyncio.Semaphore] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._stats = {"queued": 0, "written": 0, "batches": 0, "duplicates": 0, "errors": 0,
+                       "failed": 0, "backpressure_waits": 0}
+
+    def start(self) -> None:
+        """Create the loop-bound primitives and the background flusher (call from the running loop)."""
+        self._space = asyncio.Semaphore(self.max_pending)
+        self._wake = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run())
+
+    async def insert(self, doc: Dict[str, Any]) -> None:
+        """Queue one document; waits while max_pending documents are unwritten."""
+        if self._space.locked():
+            self._stats["backpressure_waits"] += 1
+        await self._space.acquire()
+        self._queue.append(doc)
+        self._pending_users[doc.get("user_id")] += 1
+        self._stats["queued"] += 1
+        if len(self._queue) >= self.max_batch:
+            self._wake.set()
+
+    def has_pending(self, user_id: str) -> bool:
+        return self._pending_users.get(user_id, 0) > 0
+
+    async def flush(self) -> None:
+        """Write everything queued so far (in batches of max_batch)."""
+        async with self._lock:
+            while self._queue:
+                batch = self._queue[:self.max_batch]
+                del self._queue[:len(batch)]
+                retry: List[Dict[str, Any]] = []
+                try:
+                    await self.collection.insert_many(batch, ordered=False)
+                    self._stats["written"] += len(batch)
+                except asyncio.CancelledError:
+                    # Requeue; documents that did land are skipped as duplicate _ids on retry
+                    self._queue[:0] = batch
+                    raise
+                except BulkWriteError as e:
+                    self._stats["written"] += e.details.get("nInserted", 0)
+                    for err in e.details.get("writeErrors", []):
+                        if err.get("code") == DUPLICATE_KEY:
+                            # Written by an earlier attempt that was interrupted
+                            self._stats["duplicates"] += 1
+                            continue
+                        self._stats["errors"] += 1
+                        doc = batch[err["index"]]
+                        attempts = self._attempts.get(id(doc), 0) + 1
+                        if attempts < self.max_attempts:
+                            self._attempts[id(doc)] = attempts
+                            retry.append(doc)
+                        else:
+                            self._give_up(doc, err.get("errmsg", "write error"))
+                except Exception as e:
+                    # Transient failure: put the batch back at the front and retry on the next flush
+                    self._queue[:0] = batch
+                    self._stats["errors"] += 1
+                    logger.warning("Write-behind flush to %s failed: %s", self.collection.name, e)
+                    return
+                self._stats["batches"] += 1
+                retrying = {id(doc) for doc in retry}
+                for doc in batch:
+                    if id(doc) not in retrying:
+                        self._settle(doc)
+                if retry:
+                    # Rejected documents go back to the front and wait for the next flush
+                    self._queue[:0] = retry
+                    return
+
+    def _settle(self, doc: Dict[str, Any]) -> None:
+        """Release a document's slot once it is written, a duplicate, or given up on."""
+        self._attempts.pop(id(doc), None)
+        self._pending_users[doc.get("user_id")] -= 1
+        if self._pending_users[doc.get("user_id")] <= 0:
+            del self._pending_users[doc.get("user_id")]
+        self._space.release()
+
+    def _give_up(self, doc: Dict[str, Any], reason: str) -> None:
+        self.failed.append(doc)
+        self._stats["failed"] += 1
+        logger.error("Write-behind: document %s for %s was not written: %s", doc.get("id"), self.collection.name, reason)
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            if self._queue:
+                await self.flush()
+
+    async def close(self, attempts: int = 3) -> None:
+        """Stop the flusher and write what is left; anything that could not be written is given up on."""
+        if self._task is not None:
+            self._stopping = True
+            self._wake.set()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for _ in range(attempts):
+            if not self._queue:
+                return
+            await self.flush()
+        for doc in self._queue:
+            self._give_up(doc, "still queued at shutdown")
+        self._queue = []
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "pending": len(self._queue)}
@@ -4,11 +4,14 @@ Modular architecture: resume parsing, skill matching, job data, learning resourc
 Uses FREE APIs only - no paid LLM (rule-based roadmaps)
 """
 
-from fastapi import FastAPI, APIRouter, HTTPException, UploadFile, File, Depends
+from fastapi import FastAPI, APIRouter, HTTPException, UploadFile, File, Depends, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+import asyncio
+import ipaddress
+import json
 import os
 import logging
 from pathlib import Path
@@ -16,41 +19,107 @@ from pydantic import BaseModel, Field, ConfigDict, EmailStr
 from typing import List, Optional, Dict, Any
 import uuid
 from datetime import datetime, timezone, timedelta
-import bcrypt
 import jwt
+from pymongo.errors import DuplicateKeyError
 import spacy
 
+# Load .env before the modules below: they read their settings from the environment at import
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / ".env")
+
 from skills_taxonomy import normalize_skill
 from modules.resume_parser import (
-    extract_text,
     extract_skills_from_text,
     estimate_skill_levels,
     _init_matcher,
 )
 from modules.job_data import get_job_description, list_companies, list_roles
 from modules.learning_resources import (
-    build_rule_based_roadmap,
-    get_learning_resources,
+    bundle_cache_stats,
+    fetch_youtube_for_skills_checked,
+    get_learning_bundle,
+    youtube_stats,
 )
-from modules.news_feed import get_job_news
+from modules.http_client import close_http_client
+from modules.outbound import breaker_stats
+from modules.news_feed import (
+    get_cached_job_news,
+    list_ingested_news,
+    list_recent_news,
+    news_cache_stats,
+    run_news_ingester,
+)
+from modules.trending import get_trending_skills, index_articles, trending_index
 from modules.dsa_data import (
     get_companies as get_dsa_companies,
     get_topics_by_company,
     get_problems,
-    load_dsa_problems,
+    get_store as get_dsa_store,
+    get_cross_company_problems,
+    get_problem_companies,
+)
+from modules.dsa_search import search_problems
+from modules.dsa_recommend import recommend_dsa_problems
+from modules.dsa_progress import (
+    ProgressConflictError,
+    load_progress,
+    summarize_progress,
+    update_progress,
+)
+from modules.static_cache import StaticResponseCache, static_response
+from modules.identity_cache import IdentityCache
+from modules.db_indexes import ensure_indexes
+from modules.compact_storage import (
+    bundle_store_stats,
+    expand_bundles,
+    load_resume_text,
+    split_analysis,
+    store_bundle,
+    store_resume_text,
+)
+from modules.passwords import (
+    AuthBusyError,
+    admission as auth_admission,
+    hash_password,
+    needs_rehash,
+    shutdown_password_pool,
+    verify_password,
+)
+from modules.pagination import fetch_page, keyset_sort
+from modules.analysis_memo import AnalysisMemo, memo_key
+from modules.write_behind import WRITE_BEHIND_ENABLED, WriteBehindBuffer
+from modules.storage import STORAGE_BACKEND, open_client
+from modules.resume_jobs import QueueFullError, ResumeJobQueue, UserQueueFullError
+from modules.document_sandbox import MAX_DOCUMENT_BYTES, PARSE_SANDBOX_ENABLED, DocumentSandbox, parse_document
+from modules.export import (
+    ANALYSIS_EXPORT_FIELDS,
+    CAREER_RESULT_EXPORT_FIELDS,
+    export_cursor,
+    export_media_type,
+    stream_export,
 )
 from modules.skill_matcher import get_missing_skills, calculate_match_percentage
 
-ROOT_DIR = Path(__file__).parent
-load_dotenv(ROOT_DIR / ".env")
-
-# MongoDB (optional - use MONGO_URL env)
+# MongoDB (MONGO_URL), or the embedded in-process store with STORAGE_BACKEND=memory
 mongo_url = os.environ.get("MONGO_URL", "mongodb://localhost:27017")
 db_name = os.environ.get("DB_NAME", "skillgap")
-client = AsyncIOMotorClient(mongo_url)
+client = open_client(STORAGE_BACKEND, mongo_url)
 db = client[db_name]
 
 JWT_SECRET = os.environ.get("JWT_SECRET", "default-secret-key")
+# Take the user id from token claims and only check the token version (cached per user id
+# for IDENTITY_CACHE_TTL) instead of loading the user document. Like the default path, a
+# password change or deletion revokes tokens at once on this process and within the TTL elsewhere.
+AUTH_TRUST_TOKEN_CLAIMS = os.environ.get("AUTH_TRUST_TOKEN_CLAIMS", "0") == "1"
+NEWS_INGEST_ENABLED = os.environ.get("NEWS_INGEST_ENABLED", "1") == "1"
+# Comma-separated emails allowed to use /api/admin endpoints
+ADMIN_EMAILS = {e.strip().lower() for e in os.environ.get("ADMIN_EMAILS", "").split(",") if e.strip()}
+# Comma-separated proxy addresses/CIDRs whose X-Forwarded-For is believed when rate limiting auth
+TRUSTED_PROXIES = [ipaddress.ip_network(p.strip(), strict=False) for p in os.environ.get("TRUSTED_PROXIES", "").split(",") if p.strip()]
+
+# History list projections: just what the dashboard cards show
+ANALYSIS_SUMMARY_FIELDS = {"_id": 0, "id": 1, "company": 1, "role": 1, "match_percentage": 1, "missing_skills": 1, "created_at": 1}
+CAREER_RESULT_SUMMARY_FIELDS = {"_id": 0, "id": 1, "career_path": 1, "explanation": 1, "created_at": 1}
 
 # Load spaCy and matcher
 nlp = spacy.load("en_core_web_sm")
@@ -59,6 +128,14 @@ matcher = _init_matcher(nlp)
 app = FastAPI(title="SkillGap AI API", version="2.0")
 api_router = APIRouter(prefix="/api")
 security = HTTPBearer()
+static_cache = StaticResponseCache()
+identity_cache = IdentityCache()
+analysis_memo = AnalysisMemo()
+# History collections whose inserts are batched when WRITE_BEHIND_ENABLED=1
+write_buffers: Dict[str, WriteBehindBuffer] = (
+    {name: WriteBehindBuffer(db[name]) for name in ("skill_analyses", "career_test_results")}
+    if WRITE_BEHIND_ENABLED else {}
+)
 
 
 # Pydantic models
@@ -80,6 +157,11 @@ class User(BaseModel):
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
+class PasswordChange(BaseModel):
+    current_password: str
+    new_password: str
+
+
 class TokenResponse(BaseModel):
     token: str
     email: str
@@ -95,6 +177,7 @@ class ResumeUploadResponse(BaseModel):
 class JobSelectionRequest(BaseModel):
     company: str
     role: str
+    include_dsa: bool = False
 
 
 class SkillGapAnalysis(BaseModel):
@@ -110,9 +193,16 @@ class SkillGapAnalysis(BaseModel):
     match_percentage: float
     learning_roadmap: str
     learning_resources: Optional[Dict[str, List[Dict[str, Any]]]] = None
+    dsa_recommendations: Optional[List[Dict[str, Any]]] = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
+class DSAProgressUpdate(BaseModel):
+    solved: List[str] = []
+    attempted: List[str] = []
+    reset: List[str] = []
+
+
 class CareerTestAnswer(BaseModel):
     question_id: int
     answer: str
@@ -133,35 +223,99 @@ class CareerTestResult(BaseModel):
 
 
 # Auth helpers
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
-
-
-def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+def _is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in TRUSTED_PROXIES)
+
+
+def client_ip(request: Request) -> str:
+    """The peer address, or the nearest X-Forwarded-For hop not in TRUSTED_PROXIES when the peer is one."""
+    host = request.client.host if request.client else "unknown"
+    if not _is_trusted_proxy(host):
+        return host
+    hops = [h.strip() for h in ",".join(request.headers.getlist("x-forwarded-for")).split(",") if h.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted_proxy(hop):
+            return hop
+    return hops[0] if hops else host
+
+
+def admit_auth_attempt(request: Request) -> None:
+    """Per-IP rate limit and global backlog cap for endpoints that run bcrypt."""
+    try:
+        auth_admission.admit(client_ip(request))
+    except AuthBusyError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(max(1, round(e.retry_after)))})
 
 
-def create_token(email: str) -> str:
+def create_token(email: str, user_id: Optional[str] = None, token_version: int = 0) -> str:
     payload = {"email": email, "exp": datetime.now(timezone.utc) + timedelta(days=30)}
+    if user_id:
+        payload["uid"] = user_id
+    if token_version:
+        payload["ver"] = token_version
     return jwt.encode(payload, JWT_SECRET, algorithm="HS256")
 
 
-def verify_token(token: str) -> str:
+def decode_token(token: str) -> Dict[str, Any]:
     try:
         payload = jwt.decode(token, JWT_SECRET, algorithms=["HS256"])
-        return payload["email"]
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid token")
+    if "email" not in payload:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return payload
+
+
+def verify_token(token: str) -> str:
+    return decode_token(token)["email"]
 
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    email = verify_token(credentials.credentials)
-    user = await db.users.find_one({"email": email}, {"_id": 0})
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
+    payload = decode_token(credentials.credentials)
+    email = payload["email"]
+    trusted = AUTH_TRUST_TOKEN_CLAIMS and payload.get("uid")
+    subject = f"uid:{payload['uid']}" if trusted else email
+    user = identity_cache.get(subject)
+    if user is None:
+        if trusted:
+            user = await db.users.find_one({"id": payload["uid"]}, {"_id": 0, "id": 1, "email": 1, "token_version": 1})
+        else:
+            user = await db.users.find_one({"email": email}, {"_id": 0, "password_hash": 0})
+        if not user:
+            raise HTTPException(status_code=401, detail="User not found")
+        identity_cache.put(subject, user)
+    # Tokens issued before the last password change are revoked
+    if payload.get("ver", 0) != user.get("token_version", 0):
+        raise HTTPException(status_code=401, detail="Invalid token")
     return user
 
 
+async def get_admin_user(current_user: dict = Depends(get_current_user)):
+    if current_user["email"].lower() not in ADMIN_EMAILS:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
+
+
+async def insert_history(name: str, doc: Dict[str, Any]) -> None:
+    buffer = write_buffers.get(name)
+    # A memo_key is arbitrated by its unique index, so the caller must see DuplicateKeyError
+    if buffer and "memo_key" not in doc:
+        await buffer.insert(doc)
+    else:
+        await db[name].insert_one(doc)
+
+
+async def read_your_writes(name: str, user_id: str) -> None:
+    """Flush buffered inserts before reading a user's own history."""
+    buffer = write_buffers.get(name)
+    if buffer and buffer.has_pending(user_id):
+        await buffer.flush()
+
+
 # Rule-based career path analysis (no LLM)
 def analyze_career_path_rule_based(answers: List[Dict[str, Any]]) -> Dict[str, str]:
     """Map answers to career path using rule-based scoring (no paid API)."""
@@ -199,95 +353,273 @@ def analyze_career_path_rule_based(answers: List[Dict[str, Any]]) -> Dict[str, s
     return {"career_path": path, "explanation": explanation}
 
 
+# Career test questions (static; served pre-encoded)
+CAREER_TEST_QUESTIONS = [
+    {"id": 1, "question": "When faced with a complex problem, I prefer to:", "options": ["Break it down into smaller logical steps", "Brainstorm creative solutions", "Research how others solved similar problems", "Discuss with team members"]},
+    {"id": 2, "question": "I feel most energized when:", "options": ["Building something from scratch", "Analyzing data and patterns", "Designing user experiences", "Managing projects and people"]},
+    {"id": 3, "question": "My ideal work environment is:", "options": ["Quiet space for deep focus", "Collaborative team setting", "Fast-paced and dynamic", "Structured with clear goals"]},
+    {"id": 4, "question": "I learn best by:", "options": ["Hands-on practice and experimentation", "Reading documentation and theory", "Visual demonstrations and videos", "Teaching others"]},
+    {"id": 5, "question": "When starting a new project, I:", "options": ["Jump right into coding", "Plan everything meticulously", "Sketch out designs first", "Define success metrics"]},
+    {"id": 6, "question": "I'm most interested in:", "options": ["How things work technically", "Understanding user behavior", "Making things look beautiful", "Business impact and metrics"]},
+    {"id": 7, "question": "My communication style is:", "options": ["Detailed and technical", "Visual and illustrative", "Concise and data-driven", "Story-telling and persuasive"]},
+    {"id": 8, "question": "I prefer working with:", "options": ["Code and algorithms", "Data and statistics", "Design tools and prototypes", "People and processes"]},
+    {"id": 9, "question": "Success to me means:", "options": ["Building elegant technical solutions", "Solving complex analytical problems", "Creating delightful user experiences", "Shipping products that users love"]},
+    {"id": 10, "question": "I'm naturally good at:", "options": ["Logical thinking and problem-solving", "Finding patterns in data", "Visual design and aesthetics", "Organization and planning"]},
+    {"id": 11, "question": "My ideal project involves:", "options": ["Building scalable systems", "Extracting insights from data", "Crafting intuitive interfaces", "Coordinating team efforts"]},
+    {"id": 12, "question": "I get frustrated when:", "options": ["Code is poorly structured", "Decisions aren't data-driven", "Designs lack polish", "Projects lack clear direction"]},
+    {"id": 13, "question": "My favorite part of tech is:", "options": ["Writing clean, efficient code", "Discovering insights through analysis", "Creating beautiful user experiences", "Bringing ideas to life"]},
+    {"id": 14, "question": "I'm drawn to problems that are:", "options": ["Technically challenging", "Analytically complex", "Creatively open-ended", "Strategically important"]},
+    {"id": 15, "question": "My workflow style is:", "options": ["Systematic and methodical", "Exploratory and iterative", "Intuitive and experimental", "Structured with milestones"]},
+    {"id": 16, "question": "I feel accomplished when:", "options": ["My code runs perfectly", "I find meaningful patterns", "Users love the interface", "The project ships on time"]},
+    {"id": 17, "question": "I prefer to focus on:", "options": ["Backend architecture", "Data pipelines and models", "Frontend design", "Product strategy"]},
+    {"id": 18, "question": "My ideal tools are:", "options": ["IDEs and terminals", "Jupyter notebooks and SQL", "Figma and Sketch", "Jira and roadmaps"]},
+    {"id": 19, "question": "I'm most curious about:", "options": ["New programming languages", "Machine learning algorithms", "Design trends", "Market opportunities"]},
+    {"id": 20, "question": "At the end of the day, I want to have:", "options": ["Written solid code", "Uncovered insights", "Created something beautiful", "Made progress on goals"]},
+]
+
+
 # Routes
 @api_router.get("/")
 async def root():
     return {"message": "SkillGap AI API", "status": "running", "version": "2.0"}
 
 
-@api_router.post("/auth/register", response_model=TokenResponse)
+@api_router.get("/metrics")
+async def metrics(admin: dict = Depends(get_admin_user)):
+    """In-process cache metrics (admins only: they reveal load, budgets and circuit state)."""
+    return {
+        "learning_bundles": bundle_cache_stats(),
+        "youtube": youtube_stats(),
+        "news": news_cache_stats(),
+        "circuit_breakers": breaker_stats(),
+        "static_responses": static_cache.stats(),
+        "identity": identity_cache.stats(),
+        "auth": auth_admission.stats(),
+        "learning_bundle_store": bundle_store_stats(),
+        "analysis_memo": analysis_memo.stats(),
+        "write_behind": {name: buffer.stats() for name, buffer in write_buffers.items()},
+        "resume_jobs": resume_jobs.stats(),
+        "document_sandbox": document_sandbox.stats(),
+    }
+
+
+@api_router.post("/auth/register", response_model=TokenResponse, dependencies=[Depends(admit_auth_attempt)])
 async def register(user_input: UserRegister):
     existing = await db.users.find_one({"email": user_input.email})
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    user = User(email=user_input.email, password_hash=hash_password(user_input.password))
+    user = User(email=user_input.email, password_hash=await hash_password(user_input.password))
     doc = user.model_dump()
     doc["created_at"] = doc["created_at"].isoformat()
-    await db.users.insert_one(doc)
+    try:
+        await db.users.insert_one(doc)
+    except DuplicateKeyError:
+        # Lost a race with a concurrent registration (unique email index)
+        raise HTTPException(status_code=400, detail="Email already registered")
 
-    token = create_token(user.email)
+    token = create_token(user.email, user.id)
     return TokenResponse(token=token, email=user.email)
 
 
-@api_router.post("/auth/login", response_model=TokenResponse)
+@api_router.post("/auth/login", response_model=TokenResponse, dependencies=[Depends(admit_auth_attempt)])
 async def login(user_input: UserLogin):
     user = await db.users.find_one({"email": user_input.email}, {"_id": 0})
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    if not verify_password(user_input.password, user["password_hash"]):
+    if not await verify_password(user_input.password, user["password_hash"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    if needs_rehash(user["password_hash"]):
+        # Work factor changed since this hash was made; upgrade it while we have the password
+        await db.users.update_one(
+            {"email": user["email"]}, {"$set": {"password_hash": await hash_password(user_input.password)}}
+        )
 
-    token = create_token(user["email"])
+    token = create_token(user["email"], user["id"], user.get("token_version", 0))
     return TokenResponse(token=token, email=user["email"])
 
 
+@api_router.post("/auth/password", response_model=TokenResponse, dependencies=[Depends(admit_auth_attempt)])
+async def change_password(change: PasswordChange, current_user: dict = Depends(get_current_user)):
+    user = await db.users.find_one({"email": current_user["email"]}, {"_id": 0})
+    if not user or not await verify_password(change.current_password, user["password_hash"]):
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    token_version = user.get("token_version", 0) + 1
+    await db.users.update_one(
+        {"email": user["email"]},
+        {"$set": {"password_hash": await hash_password(change.new_password), "token_version": token_version}},
+    )
+    identity_cache.invalidate(user["email"])
+    identity_cache.invalidate(f"uid:{user['id']}")
+    return TokenResponse(token=create_token(user["email"], user["id"], token_version), email=user["email"])
+
+
 @api_router.get("/profile")
 async def get_profile(current_user: dict = Depends(get_current_user)):
     return {"email": current_user["email"]}
 
 
-@api_router.post("/resume/upload", response_model=ResumeUploadResponse)
-async def upload_resume(file: UploadFile = File(...), current_user: dict = Depends(get_current_user)):
-    if not file.filename or not file.filename.lower().endswith((".pdf", ".docx")):
-        raise HTTPException(status_code=400, detail="Invalid format. Use PDF or DOCX.")
-
-    file_bytes = await file.read()
-
-    try:
-        text = extract_text(file_bytes, file.filename)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Failed to parse file: {str(e)}")
+@api_router.delete("/profile")
+async def delete_account(current_user: dict = Depends(get_current_user)):
+    """Delete the account and everything stored for it."""
+    user_id = current_user["id"]
+    for buffer in write_buffers.values():
+        await buffer.flush()
+    for collection in (db.resumes, db.resume_texts, db.skill_analyses, db.career_test_results, db.dsa_progress):
+        await collection.delete_many({"user_id": user_id})
+    await db.users.delete_one({"id": user_id})
+    identity_cache.invalidate(current_user["email"])
+    identity_cache.invalidate(f"uid:{user_id}")
+    analysis_memo.forget_user(user_id)
+    return {"deleted": True}
+
+
+async def process_resume(user_id: str, filename: str, file_bytes: bytes, stage) -> Dict[str, Any]:
+    """Upload pipeline shared by synchronous uploads and queued jobs; ValueError means a 400."""
+    stage("extract")
+    if PARSE_SANDBOX_ENABLED:
+        text = await document_sandbox.extract_text(file_bytes, filename, user_id)
+    else:
+        text = await resume_jobs.run_in_pool(parse_document, file_bytes, filename)
 
     if not text or len(text.strip()) < 10:
-        raise HTTPException(status_code=400, detail="Could not extract text. Ensure file has readable content.")
+        raise ValueError("Could not extract text. Ensure file has readable content.")
 
-    skills = extract_skills_from_text(text, nlp, matcher)
+    stage("skills")
+    skills = await resume_jobs.run_in_pool(extract_skills_from_text, text, nlp, matcher)
     if not skills:
-        raise HTTPException(status_code=400, detail="No skills detected. Add technical skills to your resume.")
+        raise ValueError("No skills detected. Add technical skills to your resume.")
 
+    stage("levels")
     skill_levels = estimate_skill_levels(text, skills)
 
+    stage("store")
     resume_id = str(uuid.uuid4())
     resume_doc = {
         "id": resume_id,
-        "user_id": current_user["id"],
-        "filename": file.filename,
-        "text": text,
+        "user_id": user_id,
+        "filename": filename,
         "skills": skills,
         "skill_levels": skill_levels,
         "created_at": datetime.now(timezone.utc).isoformat(),
     }
+    await store_resume_text(db.resume_texts, resume_id, user_id, text)
     await db.resumes.insert_one(resume_doc)
+    analysis_memo.set_latest_resume(user_id, {"id": resume_id, "skills": skills})
 
     return ResumeUploadResponse(
         resume_id=resume_id,
         extracted_text=text[:500],
         extracted_skills=skills,
         skill_levels=skill_levels,
+    ).model_dump()
+
+
+resume_jobs = ResumeJobQueue(process_resume)
+document_sandbox = DocumentSandbox()
+
+
+@api_router.post("/resume/upload", response_model=ResumeUploadResponse)
+async def upload_resume(
+    file: UploadFile = File(...),
+    background: bool = Query(False, alias="async"),
+    current_user: dict = Depends(get_current_user),
+):
+    """Parse and store a resume; with ?async=true, queue it and return a job to follow instead."""
+    if not file.filename or not file.filename.lower().endswith((".pdf", ".docx")):
+        raise HTTPException(status_code=400, detail="Invalid format. Use PDF or DOCX.")
+
+    file_bytes = await file.read(MAX_DOCUMENT_BYTES + 1)
+    if len(file_bytes) > MAX_DOCUMENT_BYTES:
+        raise HTTPException(status_code=400, detail=f"File is too large (max {MAX_DOCUMENT_BYTES // (1024 * 1024)} MB).")
+
+    if background:
+        try:
+            job = resume_jobs.submit(current_user["id"], file.filename, file_bytes)
+        except UserQueueFullError as e:
+            raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(round(e.retry_after))})
+        except QueueFullError as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(round(e.retry_after))})
+        return JSONResponse(status_code=202, content={
+            **job.view(),
+            "status_url": f"/api/resume/jobs/{job.id}",
+            "events_url": f"/api/resume/jobs/{job.id}/events",
+        })
+
+    try:
+        return await resume_jobs.run_inline(current_user["id"], file.filename, file_bytes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _get_resume_job(job_id: str, user_id: str):
+    job = resume_jobs.get(job_id, user_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@api_router.get("/resume/jobs/{job_id}")
+async def get_resume_job(job_id: str, current_user: dict = Depends(get_current_user)):
+    return _get_resume_job(job_id, current_user["id"]).view()
+
+
+@api_router.get("/resume/jobs/{job_id}/events")
+async def stream_resume_job(job_id: str, current_user: dict = Depends(get_current_user)):
+    """Server-Sent Events: queued, one `stage` per pipeline step, then `done` (with the result) or `failed`."""
+    job = _get_resume_job(job_id, current_user["id"])
+
+    async def event_stream():
+        async for event in resume_jobs.events(job):
+            if event is None:
+                yield ": keepalive\n\n"
+            else:
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
+@api_router.get("/resume/{resume_id}/text")
+async def get_resume_text(resume_id: str, current_user: dict = Depends(get_current_user)):
+    resume = await db.resumes.find_one({"id": resume_id, "user_id": current_user["id"]}, {"_id": 0})
+    text = await load_resume_text(db.resume_texts, resume) if resume else None
+    if text is None:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    return {"resume_id": resume_id, "text": text}
+
+
 @api_router.post("/skill-analysis", response_model=SkillGapAnalysis)
 async def analyze_skill_gap(job_request: JobSelectionRequest, current_user: dict = Depends(get_current_user)):
-    resume = await db.resumes.find_one(
-        {"user_id": current_user["id"]}, {"_id": 0}, sort=[("created_at", -1)]
-    )
-    if not resume:
+    # The pointer comes from the index alone; the cache only saves loading the skills,
+    # so an upload handled by another worker is never shadowed by this one's cache
+    latest = await db.resumes.find_one({"user_id": current_user["id"]}, {"_id": 0, "id": 1}, sort=[("created_at", -1)])
+    if not latest:
         raise HTTPException(status_code=404, detail="No resume found. Upload a resume first.")
+    resume = analysis_memo.latest_resume(current_user["id"], latest["id"])
+    if resume is None:
+        resume = await db.resumes.find_one({"id": latest["id"], "user_id": current_user["id"]}, {"_id": 0, "id": 1, "skills": 1})
+        if not resume:
+            raise HTTPException(status_code=404, detail="No resume found. Upload a resume first.")
+        analysis_memo.set_latest_resume(current_user["id"], resume)
+
+    # Same resume, company, role and data version: return the analysis already made
+    key = memo_key(resume["id"], job_request.company, job_request.role, job_request.include_dsa)
+    cached = analysis_memo.get(key)
+    if cached is not None:
+        return cached
+    existing = await db.skill_analyses.find_one(
+        {"user_id": current_user["id"], "memo_key": key}, {"_id": 0, "memo_key": 0}
+    )
+    if existing:
+        existing = (await expand_bundles(db.learning_bundles, [existing]))[0]
+        analysis_memo.put(key, existing, computed=False)
+        return existing
 
     job_data = get_job_description(job_request.company, job_request.role)
     job_skills = job_data["skills"]
@@ -295,8 +627,12 @@ async def analyze_skill_gap(job_request: JobSelectionRequest, current_user: dict
 
     missing_skills = get_missing_skills(resume_skills, job_skills)
     match_percentage = calculate_match_percentage(resume_skills, job_skills)
-    roadmap = build_rule_based_roadmap(missing_skills, job_request.role)
-    learning_resources = get_learning_resources(missing_skills)
+    roadmap, learning_resources = get_learning_bundle(missing_skills, job_request.role)
+    videos, videos_complete = await fetch_youtube_for_skills_checked(missing_skills[:10])
+    if videos:
+        learning_resources = {
+            skill: videos.get(skill, []) + resources for skill, resources in learning_resources.items()
+        }
 
     analysis = SkillGapAnalysis(
         user_id=current_user["id"],
@@ -309,60 +645,78 @@ async def analyze_skill_gap(job_request: JobSelectionRequest, current_user: dict
         match_percentage=match_percentage,
         learning_roadmap=roadmap,
         learning_resources=learning_resources,
+        dsa_recommendations=(
+            recommend_dsa_problems(missing_skills, job_request.company) if job_request.include_dsa else None
+        ),
     )
 
-    doc = analysis.model_dump()
+    doc, roadmap, resources = split_analysis(analysis.model_dump())
     doc["created_at"] = doc["created_at"].isoformat()
-    await db.skill_analyses.insert_one(doc)
+    doc["bundle_id"] = await store_bundle(db.learning_bundles, roadmap, resources)
+    if not videos_complete:
+        # Videos timed out or were cut by quota/breaker: store it, but let the next request retry
+        await insert_history("skill_analyses", doc)
+        return analysis.model_dump()
+    doc["memo_key"] = key
+    try:
+        await insert_history("skill_analyses", doc)
+    except DuplicateKeyError:
+        # A concurrent identical request stored it first; return that one
+        existing = await db.skill_analyses.find_one(
+            {"user_id": current_user["id"], "memo_key": key}, {"_id": 0, "memo_key": 0}
+        )
+        return (await expand_bundles(db.learning_bundles, [existing]))[0]
 
-    return analysis
+    result = analysis.model_dump()
+    analysis_memo.put(key, result)
+    return result
 
 
 @api_router.get("/skill-analyses")
-async def get_skill_analyses(current_user: dict = Depends(get_current_user)):
-    analyses = await db.skill_analyses.find({"user_id": current_user["id"]}, {"_id": 0}).sort(
-        "created_at", -1
-    ).to_list(100)
-    return analyses
+async def get_skill_analyses(limit: int = 20, cursor: Optional[str] = None, current_user: dict = Depends(get_current_user)):
+    """Analysis summaries, newest first; pass `next_cursor` back as `cursor` for the next page."""
+    await read_your_writes("skill_analyses", current_user["id"])
+    try:
+        analyses, next_cursor = await fetch_page(
+            db.skill_analyses, {"user_id": current_user["id"]}, ANALYSIS_SUMMARY_FIELDS, "created_at", limit, cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"analyses": analyses, "next_cursor": next_cursor}
+
+
+@api_router.get("/skill-analyses/{analysis_id}")
+async def get_skill_analysis(analysis_id: str, current_user: dict = Depends(get_current_user)):
+    await read_your_writes("skill_analyses", current_user["id"])
+    analysis = await db.skill_analyses.find_one(
+        {"id": analysis_id, "user_id": current_user["id"]}, {"_id": 0, "memo_key": 0}
+    )
+    if not analysis:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    return (await expand_bundles(db.learning_bundles, [analysis]))[0]
 
 
 @api_router.get("/jobs/companies")
-async def jobs_companies():
+async def jobs_companies(request: Request):
     """List companies for job selection."""
-    return list_companies()
+    return static_response(request, static_cache.get("jobs/companies", list_companies))
 
 
 @api_router.get("/jobs/roles")
-async def jobs_roles(company: Optional[str] = None):
+async def jobs_roles(request: Request, company: Optional[str] = None):
     """List roles, optionally filtered by company."""
-    return list_roles(company)
+    # Cache per known company only; unknown names share one (empty) entry
+    key = company.lower() if company else ""
+    if key and key not in {c.lower() for c in list_companies()}:
+        key = "?"
+    return static_response(request, static_cache.get(("jobs/roles", key), lambda: list_roles(company)))
 
 
 # Career test (rule-based, no LLM)
 @api_router.get("/career-test/questions")
-async def get_career_test_questions():
-    return [
-        {"id": 1, "question": "When faced with a complex problem, I prefer to:", "options": ["Break it down into smaller logical steps", "Brainstorm creative solutions", "Research how others solved similar problems", "Discuss with team members"]},
-        {"id": 2, "question": "I feel most energized when:", "options": ["Building something from scratch", "Analyzing data and patterns", "Designing user experiences", "Managing projects and people"]},
-        {"id": 3, "question": "My ideal work environment is:", "options": ["Quiet space for deep focus", "Collaborative team setting", "Fast-paced and dynamic", "Structured with clear goals"]},
-        {"id": 4, "question": "I learn best by:", "options": ["Hands-on practice and experimentation", "Reading documentation and theory", "Visual demonstrations and videos", "Teaching others"]},
-        {"id": 5, "question": "When starting a new project, I:", "options": ["Jump right into coding", "Plan everything meticulously", "Sketch out designs first", "Define success metrics"]},
-        {"id": 6, "question": "I'm most interested in:", "options": ["How things work technically", "Understanding user behavior", "Making things look beautiful", "Business impact and metrics"]},
-        {"id": 7, "question": "My communication style is:", "options": ["Detailed and technical", "Visual and illustrative", "Concise and data-driven", "Story-telling and persuasive"]},
-        {"id": 8, "question": "I prefer working with:", "options": ["Code and algorithms", "Data and statistics", "Design tools and prototypes", "People and processes"]},
-        {"id": 9, "question": "Success to me means:", "options": ["Building elegant technical solutions", "Solving complex analytical problems", "Creating delightful user experiences", "Shipping products that users love"]},
-        {"id": 10, "question": "I'm naturally good at:", "options": ["Logical thinking and problem-solving", "Finding patterns in data", "Visual design and aesthetics", "Organization and planning"]},
-        {"id": 11, "question": "My ideal project involves:", "options": ["Building scalable systems", "Extracting insights from data", "Crafting intuitive interfaces", "Coordinating team efforts"]},
-        {"id": 12, "question": "I get frustrated when:", "options": ["Code is poorly structured", "Decisions aren't data-driven", "Designs lack polish", "Projects lack clear direction"]},
-        {"id": 13, "question": "My favorite part of tech is:", "options": ["Writing clean, efficient code", "Discovering insights through analysis", "Creating beautiful user experiences", "Bringing ideas to life"]},
-        {"id": 14, "question": "I'm drawn to problems that are:", "options": ["Technically challenging", "Analytically complex", "Creatively open-ended", "Strategically important"]},
-        {"id": 15, "question": "My workflow style is:", "options": ["Systematic and methodical", "Exploratory and iterative", "Intuitive and experimental", "Structured with milestones"]},
-        {"id": 16, "question": "I feel accomplished when:", "options": ["My code runs perfectly", "I find meaningful patterns", "Users love the interface", "The project ships on time"]},
-        {"id": 17, "question": "I prefer to focus on:", "options": ["Backend architecture", "Data pipelines and models", "Frontend design", "Product strategy"]},
-        {"id": 18, "question": "My ideal tools are:", "options": ["IDEs and terminals", "Jupyter notebooks and SQL", "Figma and Sketch", "Jira and roadmaps"]},
-        {"id": 19, "question": "I'm most curious about:", "options": ["New programming languages", "Machine learning algorithms", "Design trends", "Market opportunities"]},
-        {"id": 20, "question": "At the end of the day, I want to have:", "options": ["Written solid code", "Uncovered insights", "Created something beautiful", "Made progress on goals"]},
-    ]
+async def get_career_test_questions(request: Request):
+    encoded = static_cache.get("career-test/questions", lambda: CAREER_TEST_QUESTIONS)
+    return static_response(request, encoded)
 
 
 @api_router.post("/career-test/submit", response_model=CareerTestResult)
@@ -378,24 +732,91 @@ async def submit_career_test(submission: CareerTestSubmission, current_user: dic
     )
     doc = test_result.model_dump()
     doc["created_at"] = doc["created_at"].isoformat()
-    await db.career_test_results.insert_one(doc)
+    await insert_history("career_test_results", doc)
     return test_result
 
 
 @api_router.get("/career-test/results")
-async def get_career_test_results(current_user: dict = Depends(get_current_user)):
-    results = await db.career_test_results.find({"user_id": current_user["id"]}, {"_id": 0}).sort(
-        "created_at", -1
-    ).to_list(100)
-    return results
+async def get_career_test_results(limit: int = 20, cursor: Optional[str] = None, current_user: dict = Depends(get_current_user)):
+    """Career test results without answers, newest first, cursor-paginated."""
+    await read_your_writes("career_test_results", current_user["id"])
+    try:
+        results, next_cursor = await fetch_page(
+            db.career_test_results, {"user_id": current_user["id"]}, CAREER_RESULT_SUMMARY_FIELDS, "created_at", limit, cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"results": results, "next_cursor": next_cursor}
+
+
+# History export: kind -> (collection, exported fields)
+EXPORT_KINDS = {
+    "skill-analyses": ("skill_analyses", ANALYSIS_EXPORT_FIELDS),
+    "career-test-results": ("career_test_results", CAREER_RESULT_EXPORT_FIELDS),
+}
+
+
+def export_response(kind: str, fmt: str, query: Dict[str, Any], sort: List) -> StreamingResponse:
+    if kind not in EXPORT_KINDS:
+        raise HTTPException(status_code=404, detail=f"Unknown export: {kind}")
+    try:
+        media_type = export_media_type(fmt)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    collection, fields = EXPORT_KINDS[kind]
+    cursor = export_cursor(db[collection], query, fields, sort)
+    return StreamingResponse(
+        stream_export(cursor, fmt, fields),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{kind}.{fmt}"'},
+    )
+
+
+@api_router.get("/export/{kind}")
+async def export_history(kind: str, format: str = "ndjson", current_user: dict = Depends(get_current_user)):
+    """Stream your skill-analyses or career-test-results as NDJSON or CSV, newest first."""
+    if kind in EXPORT_KINDS:
+        await read_your_writes(EXPORT_KINDS[kind][0], current_user["id"])
+    return export_response(kind, format, {"user_id": current_user["id"]}, keyset_sort("created_at"))
+
+
+@api_router.get("/admin/export/{kind}")
+async def admin_export_history(
+    kind: str, format: str = "ndjson", user_id: Optional[str] = None, admin: dict = Depends(get_admin_user)
+):
+    """Stream history across all users (or one `user_id`); ADMIN_EMAILS only."""
+    if user_id:
+        return export_response(kind, format, {"user_id": user_id}, keyset_sort("created_at"))
+    # Insertion (_id) order is index-backed; sorting everything by created_at would not be
+    return export_response(kind, format, {}, [("_id", 1)])
 
 
 # Module 2: Job News Feed (public)
 @api_router.get("/news/jobs")
-async def get_news(count: int = 15):
-    """Get real-time hiring/job news (GNews API - requires GNEWS_API_KEY)."""
-    articles = await get_job_news(count=count)
-    return {"articles": articles}
+async def get_news(count: int = 15, cursor: Optional[str] = None, q: Optional[str] = None):
+    """
+    Get hiring/job news. The default feed is read from the ingested collection
+    (newest first, keyset-paginated via `cursor`); a custom `q` goes to GNews
+    through the stale-while-revalidate cache.
+    """
+    try:
+        if q:
+            articles = await get_cached_job_news(count=count, query=q)
+            return {"articles": articles, "next_cursor": None}
+        articles, next_cursor = await list_ingested_news(db.news_articles, limit=count, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"articles": articles, "next_cursor": next_cursor}
+
+
+@api_router.get("/skills/trending")
+async def skills_trending(window: str = "24h", limit: int = 10):
+    """Most-mentioned skills in hiring news over a rolling window (24h or 7d)."""
+    try:
+        skills = get_trending_skills(window, max(1, min(limit, 100)))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"window": window, "skills": skills, "articles_indexed": trending_index.articles_indexed}
 
 
 # Module 3: DSA Tracker by Company (public)
@@ -417,10 +838,73 @@ async def dsa_problems(company: str, topic: Optional[str] = None):
     return get_problems(company, topic)
 
 
+@api_router.get("/dsa/search")
+async def dsa_search(
+    q: str = "",
+    difficulty: Optional[str] = None,
+    company: Optional[str] = None,
+    topic: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+):
+    """Search problems by title (prefix-aware) with difficulty/company/topic facets."""
+    return search_problems(
+        q, difficulty=difficulty, company=company, topic=topic,
+        limit=max(1, min(limit, 100)), offset=max(0, offset),
+    )
+
+
+@api_router.get("/dsa/progress")
+async def dsa_progress(current_user: dict = Depends(get_current_user)):
+    """Solved/attempted problems and per-company/topic completion for the current user."""
+    solved, attempted, _ = await load_progress(db.dsa_progress, current_user["id"])
+    return summarize_progress(get_dsa_store(), solved, attempted)
+
+
+@api_router.post("/dsa/progress")
+async def update_dsa_progress(update: DSAProgressUpdate, current_user: dict = Depends(get_current_user)):
+    """Bulk-mark problems (by id) as solved, attempted, or reset."""
+    store = get_dsa_store()
+    try:
+        solved, attempted = await update_progress(
+            db.dsa_progress, current_user["id"], store, update.solved, update.attempted, update.reset
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ProgressConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return summarize_progress(store, solved, attempted)
+
+
 @api_router.get("/dsa/all")
-async def dsa_all():
-    """Get all DSA data (for frontend)."""
-    return load_dsa_problems()
+async def dsa_all(request: Request, format: str = "nested"):
+    """Get all DSA data (for frontend); format=normalized sends each problem once, referenced by ID."""
+    store = get_dsa_store()
+    if format == "normalized":
+        encoded = static_cache.get("dsa/all?normalized", store.normalized, version=store.mtime)
+    else:
+        encoded = static_cache.get("dsa/all", lambda: store.data, version=store.mtime)
+    return static_response(request, encoded)
+
+
+@api_router.get("/dsa/problem/{problem_id}/companies")
+async def dsa_problem_companies(problem_id: str):
+    """Companies (and topics) that ask a given problem."""
+    result = get_problem_companies(problem_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Problem not found")
+    return result
+
+
+@api_router.get("/dsa/cross-company")
+async def dsa_cross_company(companies: str, mode: str = "intersection", topic: Optional[str] = None):
+    """Problems common to (intersection) or covering (union) a comma-separated list of companies."""
+    names = [c.strip() for c in companies.split(",") if c.strip()]
+    try:
+        problems = get_cross_company_problems(names, mode, topic)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"mode": mode, "companies": names, "topic": topic, "problems": problems}
 
 
 # Mount router and middleware
@@ -437,6 +921,49 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(level
 logger = logging.getLogger(__name__)
 
 
+background_tasks: List[asyncio.Task] = []
+
+
+async def index_news_skills(articles: List[Dict[str, Any]]) -> None:
+    await index_articles(articles, nlp, matcher)
+
+
+@app.on_event("startup")
+async def start_background_jobs():
+    for buffer in write_buffers.values():
+        buffer.start()
+    resume_jobs.start()
+    if PARSE_SANDBOX_ENABLED:
+        try:
+            await document_sandbox.start()
+        except OSError as e:
+            logger.warning("Could not pre-start document parsers: %s", e)
+    try:
+        await ensure_indexes(db)
+    except Exception as e:
+        logger.warning("Could not create indexes: %s", e)
+    try:
+        since = datetime.now(timezone.utc) - timedelta(
+            seconds=trending_index.size * trending_index.bucket_seconds
+        )
+        await index_news_skills(await list_recent_news(db.news_articles, since))
+    except Exception as e:
+        logger.warning("Could not rebuild trending skills: %s", e)
+    if NEWS_INGEST_ENABLED:
+        background_tasks.append(
+            asyncio.create_task(run_news_ingester(db.news_articles, on_new_articles=index_news_skills, locks=db.locks))
+        )
+
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await resume_jobs.close()
+    await document_sandbox.close()
+    for buffer in write_buffers.values():
+        await buffer.close()
     client.close()
+    await close_http_client()
+    shutdown_password_pool()
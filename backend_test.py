@@ -6,7 +6,7 @@ from datetime import datetime
 import os
 
 class SkillGapAPITester:
-    def __init__(self, base_url="https://resumeanalyst.preview.emergentagent.com"):
+    def __init__(self, base_url=os.environ.get("API_BASE_URL", "https://resumeanalyst.preview.emergentagent.com")):
         self.base_url = base_url
         self.api_url = f"{base_url}/api"
         self.token = None
@@ -214,7 +214,8 @@ class SkillGapAPITester:
         
         success, response = self.make_request('GET', '/skill-analyses')
         
-        if success and isinstance(response, list):
+        if success and isinstance(response, dict) and isinstance(response.get('analyses'), list):
+            response = response['analyses']
             return self.log_test("Get Skill Analyses", True, f"- {len(response)} analyses found")
         else:
             return self.log_test("Get Skill Analyses", False, "- Failed to get analyses")
@@ -226,7 +227,8 @@ class SkillGapAPITester:
         
         success, response = self.make_request('GET', '/career-test/results')
         
-        if success and isinstance(response, list):
+        if success and isinstance(response, dict) and isinstance(response.get('results'), list):
+            response = response['results']
             return self.log_test("Get Career Results", True, f"- {len(response)} results found")
         else:
             return self.log_test("Get Career Results", False, "- Failed to get results")
@@ -0,0 +1,315 @@
+"""
+Storage backend tests. Runs the query/update/index semantics the routes depend on
+against the embedded in-process store, then drives the whole API in-process on it
+(STORAGE_BACKEND=memory, FastAPI TestClient - no MongoDB or network needed).
+With --mongo the semantic checks also run against MONGO_URL, so both backends are
+held to the same assertions.
+
+    python embedded_storage_test.py [--mongo]
+"""
+
+import asyncio
+import io
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+os.environ.setdefault("NEWS_INGEST_ENABLED", "0")
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend")
+sys.path.insert(0, BACKEND_DIR)
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from modules.db_indexes import ensure_indexes
+from modules.pagination import encode_cursor, fetch_page
+from modules.storage import open_client
+
+
+class EmbeddedStorageTester:
+    def __init__(self):
+        self.tests_run = 0
+        self.tests_passed = 0
+
+    def log_test(self, name, success, details=""):
+        """Log test results"""
+        self.tests_run += 1
+        if success:
+            self.tests_passed += 1
+            print(f"✅ {name} - PASSED {details}")
+        else:
+            print(f"❌ {name} - FAILED {details}")
+        return success
+
+    # ---------- storage semantics (per backend) ----------
+
+    async def test_unique_indexes(self, db, label):
+        await ensure_indexes(db)
+        await db.users.insert_one({"id": "u1", "email": "a@example.com"})
+        try:
+            await db.users.insert_one({"id": "u2", "email": "a@example.com"})
+            dup_email = False
+        except DuplicateKeyError:
+            dup_email = True
+        # Partial unique: analyses without a memo_key never conflict
+        await db.skill_analyses.insert_many([{"id": "x1", "user_id": "u1"}, {"id": "x2", "user_id": "u1"}])
+        await db.skill_analyses.insert_one({"id": "x3", "user_id": "u1", "memo_key": "k"})
+        try:
+            await db.skill_analyses.insert_one({"id": "x4", "user_id": "u1", "memo_key": "k"})
+            dup_memo = False
+        except DuplicateKeyError:
+            dup_memo = True
+        again = await ensure_indexes(db)
+        self.log_test(f"[{label}] Unique and partial unique indexes", dup_email and dup_memo and "users" in again)
+
+    async def test_find_projection_sort(self, db, label):
+        now = datetime.now(timezone.utc)
+        await db.resumes.insert_many([
+            {"id": f"r{i}", "user_id": "u1", "skills": ["python", f"s{i}"], "created_at": (now + timedelta(seconds=i)).isoformat()}
+            for i in range(5)
+        ])
+        latest = await db.resumes.find_one({"user_id": "u1"}, {"_id": 0}, sort=[("created_at", -1)])
+        included = await db.resumes.find_one({"id": "r1"}, {"_id": 0, "id": 1})
+        excluded = await db.resumes.find_one({"id": "r1"}, {"_id": 0, "skills": 0})
+        by_element = await db.resumes.count_documents({"skills": "python"})
+        in_query = await db.resumes.find({"id": {"$in": ["r0", "r3", "nope"]}}, {"_id": 0, "id": 1}).sort("id", 1).to_list(10)
+        ok = (
+            latest["id"] == "r4" and "_id" not in latest
+            and included == {"id": "r1"}
+            and set(excluded) == {"id", "user_id", "created_at"}
+            and by_element == 5
+            and [d["id"] for d in in_query] == ["r0", "r3"]
+        )
+        self.log_test(f"[{label}] find / find_one projection, sort, $in, array match", ok)
+
+    async def test_keyset_pagination(self, db, label):
+        # Ties on created_at are broken by id, so pages neither skip nor repeat rows
+        stamp = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        await db.career_test_results.insert_many([
+            {"id": f"c{i:02d}", "user_id": "u1", "created_at": (stamp + timedelta(minutes=i // 3)).isoformat()}
+            for i in range(25)
+        ])
+        seen, cursor = [], None
+        while True:
+            rows, cursor = await fetch_page(db.career_test_results, {"user_id": "u1"}, {"_id": 0, "id": 1, "created_at": 1}, "created_at", 4, cursor)
+            seen += rows
+            if not cursor:
+                break
+        expected = sorted(seen, key=lambda r: (r["created_at"], r["id"]), reverse=True)
+        ok = len(seen) == 25 and len({r["id"] for r in seen}) == 25 and seen == expected
+        self.log_test(f"[{label}] Keyset pagination with ties", ok, f"- {len(seen)} rows")
+
+        forged = [encode_cursor({"$regex": ".*"}, "x"), encode_cursor("2025", {"$gt": ""}), encode_cursor(True, "x")]
+        rejected = 0
+        for bad in forged:
+            try:
+                await fetch_page(db.career_test_results, {"user_id": "u1"}, {"_id": 0}, "created_at", 4, bad)
+            except ValueError:
+                rejected += 1
+        self.log_test(f"[{label}] Forged cursors carrying operators are rejected", rejected == len(forged))
+
+    async def test_upserts_and_versions(self, db, label):
+        from modules.dsa_data import get_store
+        from modules.dsa_progress import load_progress, update_progress
+
+        store = get_store()
+        ids = list(store.problems)[:5]
+        await asyncio.gather(*(update_progress(db.dsa_progress, "u1", store, [pid], [], []) for pid in ids))
+        solved, _, version = await load_progress(db.dsa_progress, "u1")
+        docs = await db.dsa_progress.count_documents({"user_id": "u1"})
+
+        ops = [
+            UpdateOne({"_id": f"n{i}"}, {"$set": {"title": f"t{i}"}, "$setOnInsert": {"first_seen": i}}, upsert=True)
+            for i in range(3)
+        ]
+        first = await db.news_articles.bulk_write(ops, ordered=False)
+        second = await db.news_articles.bulk_write(ops, ordered=False)
+        kept = await db.news_articles.find_one({"_id": "n1"})
+        ok = (
+            docs == 1 and version == len(ids) and solved.bit_count() == len(ids)
+            and sorted(first.upserted_ids.values()) == ["n0", "n1", "n2"]
+            and not second.upserted_ids and kept["first_seen"] == 1
+        )
+        self.log_test(f"[{label}] Versioned upserts and bulk_write upserts", ok, f"- version {version}")
+
+    async def test_insert_many_unordered(self, db, label):
+        await db.scratch.insert_one({"_id": "a"})
+        try:
+            await db.scratch.insert_many([{"_id": "b"}, {"_id": "a"}, {"_id": "c"}], ordered=False)
+            details = {}
+        except BulkWriteError as e:
+            details = e.details
+        count = await db.scratch.count_documents({})
+        codes = [err["code"] for err in details.get("writeErrors", [])]
+        self.log_test(f"[{label}] insert_many(ordered=False) reports duplicates", details.get("nInserted") == 2 and codes == [11000] and count == 3)
+
+    async def test_ingest_lease(self, db, label):
+        from modules.news_feed import take_ingest_lease
+
+        first = await take_ingest_lease(db.locks, "worker-a", 60)
+        other = await take_ingest_lease(db.locks, "worker-b", 60)
+        renewed = await take_ingest_lease(db.locks, "worker-a", 60)
+        await db.locks.update_one({"_id": "news_ingester"}, {"$set": {"expires_at": datetime.now(timezone.utc) - timedelta(seconds=1)}})
+        taken_over = await take_ingest_lease(db.locks, "worker-b", 60)
+        holder = await db.locks.find_one({"_id": "news_ingester"})
+        self.log_test(
+            f"[{label}] News ingest lease: one holder, renewable, taken over on expiry",
+            first and not other and renewed and taken_over and holder["owner"] == "worker-b",
+        )
+
+    async def test_equality_lookups(self, db, label):
+        await db.tagged.create_index([("owner", 1), ("n", -1)])
+        await db.tagged.insert_many([{"_id": f"t{i}", "owner": f"o{i % 3}", "tags": ["a", f"t{i}"], "n": i} for i in range(9)])
+        await db.tagged.create_index("tags")
+        await db.tagged.update_one({"_id": "t0"}, {"$set": {"owner": "o9"}})
+        moved = [d["_id"] for d in await db.tagged.find({"owner": "o0"}).sort("n", 1).to_list(None)]
+        combined = await db.tagged.count_documents({"$and": [{"owner": {"$eq": "o1"}}, {"n": {"$gt": 1}}]})
+        by_tag = await db.tagged.count_documents({"tags": "a", "owner": {"$ne": "o2"}})
+        self.log_test(
+            f"[{label}] Equality lookups on indexed fields follow updates and arrays",
+            moved == ["t3", "t6"] and combined == 2 and by_tag == 6 and await db.tagged.find_one({"owner": "o9"}) is not None,
+        )
+
+    async def test_delete(self, db, label):
+        removed = await db.resumes.delete_many({"user_id": "u1"})
+        left = await db.resumes.count_documents({"user_id": "u1"})
+        one = await db.users.delete_one({"id": "u1"})
+        self.log_test(f"[{label}] delete_many / delete_one", removed.deleted_count == 5 and left == 0 and one.deleted_count == 1)
+
+    async def run_semantics(self, backend):
+        client = open_client(backend)
+        db = client[f"skillgap_storage_test_{uuid.uuid4().hex[:8]}"]
+        try:
+            await self.test_unique_indexes(db, backend)
+            await self.test_find_projection_sort(db, backend)
+            await self.test_keyset_pagination(db, backend)
+            await self.test_upserts_and_versions(db, backend)
+            await self.test_insert_many_unordered(db, backend)
+            await self.test_ingest_lease(db, backend)
+            await self.test_equality_lookups(db, backend)
+            await self.test_delete(db, backend)
+        finally:
+            await client.drop_database(db.name)
+            client.close()
+
+    # ---------- whole API on the embedded backend ----------
+
+    def test_api_flow(self):
+        import docx
+        from fastapi.testclient import TestClient
+
+        os.chdir(BACKEND_DIR)
+        import server
+
+        document = docx.Document()
+        document.add_paragraph("Built Python and React services with Docker and SQL; 3 years of Java.")
+        upload = io.BytesIO()
+        document.save(upload)
+
+        with TestClient(server.app) as c:
+            self.log_test("Server uses the embedded backend", type(server.client).__name__ == "EmbeddedClient")
+            r = c.post("/api/auth/register", json={"email": "flow@example.com", "password": "pw12345"})
+            dup = c.post("/api/auth/register", json={"email": "flow@example.com", "password": "pw12345"})
+            self.log_test("Register (and duplicate rejected)", r.status_code == 200 and dup.status_code == 400)
+            h = {"Authorization": f"Bearer {r.json()['token']}"}
+
+            r = c.post("/api/resume/upload", headers=h, files={
+                "file": ("cv.docx", upload.getvalue(), "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+            })
+            self.log_test("Resume upload", r.status_code == 200, f"- {r.status_code}")
+
+            ids = []
+            for company in ("Google", "Google", "Amazon"):
+                r = c.post("/api/skill-analysis", headers=h, json={"company": company, "role": "Software Engineer"})
+                ids.append(r.json().get("id") if r.status_code == 200 else None)
+            self.log_test("Skill analysis (repeat reused)", None not in ids and ids[0] == ids[1] and ids[1] != ids[2])
+
+            page = c.get("/api/skill-analyses?limit=1", headers=h).json()
+            rest = c.get(f"/api/skill-analyses?limit=1&cursor={page['next_cursor']}", headers=h).json()
+            listed = [a["id"] for a in page["analyses"] + rest["analyses"]]
+            self.log_test("Paginated history", listed == [ids[2], ids[0]] and rest["next_cursor"] is None)
+
+            export = c.get("/api/export/skill-analyses?format=ndjson", headers=h)
+            self.log_test("NDJSON export", export.status_code == 200 and len(export.text.splitlines()) == 2)
+            self.test_csv_escaping()
+
+            # Another worker stores a newer resume; this worker's cached pointer must not win
+            user = asyncio.run(server.db.users.find_one({"email": "flow@example.com"}))
+            newer = {"id": "resume-from-other-worker", "user_id": user["id"], "filename": "cv2.docx", "skills": ["Go"],
+                     "created_at": "9999-01-01T00:00:00+00:00"}
+            asyncio.run(server.db.resumes.insert_one(newer))
+            r = c.post("/api/skill-analysis", headers=h, json={"company": "Google", "role": "Software Engineer"})
+            self.log_test("Analysis uses a resume uploaded on another worker", r.status_code == 200 and r.json()["resume_id"] == newer["id"])
+
+            deleted = c.delete("/api/profile", headers=h)
+            left = asyncio.run(server.db.skill_analyses.count_documents({}))
+            self.log_test("Account deletion", deleted.status_code == 200 and left == 0)
+
+        self.test_client_ip(server)
+
+    def test_csv_escaping(self):
+        import csv
+        from modules.export import stream_export
+
+        async def rows():
+            yield {"company": "=HYPERLINK(\"http://evil.example\")", "role": "-2+3", "missing_skills": ["@SUM(A1)", "Go"], "match_percentage": -5}
+
+        async def collect():
+            return b"".join([chunk async for chunk in stream_export(rows(), "csv", ["company", "role", "missing_skills", "match_percentage"])])
+
+        row = list(csv.reader(io.StringIO(asyncio.run(collect()).decode())))[1]
+        self.log_test(
+            "CSV export defuses formula cells",
+            row == ["'=HYPERLINK(\"http://evil.example\")", "'-2+3", "'@SUM(A1); Go", "-5"],
+            f"- {row}",
+        )
+
+    def test_client_ip(self, server):
+        import ipaddress
+        from starlette.requests import Request
+
+        def request(peer, forwarded=None):
+            headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+            return Request({"type": "http", "client": (peer, 50000), "headers": headers})
+
+        saved = server.TRUSTED_PROXIES
+        server.TRUSTED_PROXIES = [ipaddress.ip_network("10.0.0.0/8")]
+        try:
+            seen = [
+                server.client_ip(request("10.0.0.5", "198.51.100.7, 203.0.113.9, 10.0.0.2")),
+                server.client_ip(request("203.0.113.50", "198.51.100.7")),
+                server.client_ip(request("10.0.0.5")),
+            ]
+        finally:
+            server.TRUSTED_PROXIES = saved
+        self.log_test(
+            "Auth limits key on the forwarded client only behind TRUSTED_PROXIES",
+            seen == ["203.0.113.9", "203.0.113.50", "10.0.0.5"],
+            f"- {seen}",
+        )
+
+
+def main():
+    print("🚀 Starting Embedded Storage Tests")
+    print("=" * 50)
+
+    tester = EmbeddedStorageTester()
+    for backend in ["memory"] + (["mongo"] if "--mongo" in sys.argv else []):
+        asyncio.run(tester.run_semantics(backend))
+    tester.test_api_flow()
+
+    print("\n" + "=" * 50)
+    print(f"📊 Test Results: {tester.tests_passed}/{tester.tests_run} passed")
+
+    if tester.tests_passed == tester.tests_run:
+        print("🎉 All tests passed!")
+        return 0
+    else:
+        print("⚠️  Some tests failed. Check the details above.")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -23,7 +23,7 @@ export default function CareerResults() {
       const response = await axios.get(`${API}/career-test/results`, {
         headers: { Authorization: `Bearer ${token}` }
       });
-      setResults(response.data);
+      setResults(response.data.results || []);
     } catch (error) {
       console.error('Failed to fetch results:', error);
     } finally {
@@ -23,14 +23,16 @@ export default function Dashboard() {
     try {
       const [analysesRes, careerRes] = await Promise.all([
         axios.get(`${API}/skill-analyses`, {
+          params: { limit: 3 },
           headers: { Authorization: `Bearer ${token}` }
         }),
         axios.get(`${API}/career-test/results`, {
+          params: { limit: 2 },
           headers: { Authorization: `Bearer ${token}` }
         })
       ]);
-      setAnalyses(analysesRes.data);
-      setCareerResults(careerRes.data);
+      setAnalyses(analysesRes.data.analyses || []);
+      setCareerResults(careerRes.data.results || []);
     } catch (error) {
       console.error('Failed to fetch data:', error);
     }
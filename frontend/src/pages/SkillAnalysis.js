@@ -38,12 +38,24 @@ export default function SkillAnalysis() {
       const response = await axios.get(`${API}/skill-analyses`, {
         headers: { Authorization: `Bearer ${token}` }
       });
-      setAnalyses(response.data);
+      setAnalyses(response.data.analyses || []);
     } catch (error) {
       console.error('Failed to fetch analyses:', error);
     }
   };
 
+  const openAnalysis = async (id) => {
+    try {
+      const token = localStorage.getItem('token');
+      const response = await axios.get(`${API}/skill-analyses/${id}`, {
+        headers: { Authorization: `Bearer ${token}` }
+      });
+      setAnalysis(response.data);
+    } catch (error) {
+      console.error('Failed to fetch analysis:', error);
+    }
+  };
+
   const handleAnalyze = async (e) => {
     e.preventDefault();
     if (!company || !role) {
@@ -245,7 +257,7 @@ export default function SkillAnalysis() {
                               className="inline-flex items-center gap-2 px-4 py-2 rounded-lg bg-primary/10 text-primary hover:bg-primary/20 transition-colors text-sm"
                             >
                               <ExternalLink className="h-4 w-4" />
-                              {r.platform}: {r.title}
+                              {r.platform}: {r.title}{r.fallback ? " (search)" : ""}
                             </a>
                           ))}
                         </div>
@@ -280,7 +292,7 @@ export default function SkillAnalysis() {
                     animate={{ opacity: 1, x: 0 }}
                     transition={{ delay: idx * 0.1 }}
                     className="glass-card rounded-xl p-6 cursor-pointer hover:border-primary/50 transition-colors"
-                    onClick={() => setAnalysis(item)}
+                    onClick={() => openAnalysis(item.id)}
                     data-testid={`previous-analysis-${idx}`}
                   >
                     <div className="flex justify-between items-start">
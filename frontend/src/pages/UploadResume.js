@@ -9,10 +9,47 @@ import { Upload, Loader2, CheckCircle2 } from 'lucide-react';
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
 
+const STAGE_LABELS = {
+  queued: 'Waiting in queue...',
+  extract: 'Extracting text...',
+  skills: 'Matching skills...',
+  levels: 'Estimating skill levels...',
+  store: 'Saving...'
+};
+
+// Follow a resume job's Server-Sent Events (fetch, so the auth header can be sent)
+async function followJob(eventsUrl, token, onStage) {
+  const response = await fetch(`${BACKEND_URL}${eventsUrl}`, {
+    headers: { Authorization: `Bearer ${token}` }
+  });
+  if (!response.ok) throw new Error('Lost track of the upload');
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) throw new Error('Upload processing was interrupted');
+    buffer += decoder.decode(value, { stream: true });
+    let split;
+    while ((split = buffer.indexOf('\n\n')) !== -1) {
+      const block = buffer.slice(0, split);
+      buffer = buffer.slice(split + 2);
+      const event = block.match(/^event: (.*)$/m)?.[1];
+      const data = block.match(/^data: (.*)$/m)?.[1];
+      if (!event || !data) continue;
+      const payload = JSON.parse(data);
+      if (event === 'done') return payload.result;
+      if (event === 'failed') throw new Error(payload.error);
+      onStage(event === 'stage' ? payload.stage : event);
+    }
+  }
+}
+
 export default function UploadResume() {
   const [file, setFile] = useState(null);
   const [uploading, setUploading] = useState(false);
   const [uploaded, setUploaded] = useState(false);
+  const [stage, setStage] = useState(null);
   const [skills, setSkills] = useState([]);
   const navigate = useNavigate();
 
@@ -34,25 +71,28 @@ export default function UploadResume() {
     if (!file) return;
 
     setUploading(true);
+    setStage(null);
     const formData = new FormData();
     formData.append('file', file);
 
     try {
       const token = localStorage.getItem('token');
-      const response = await axios.post(`${API}/resume/upload`, formData, {
+      const response = await axios.post(`${API}/resume/upload?async=true`, formData, {
         headers: {
           Authorization: `Bearer ${token}`,
           'Content-Type': 'multipart/form-data'
         }
       });
+      const result = await followJob(response.data.events_url, token, setStage);
 
-      setSkills(response.data.extracted_skills);
+      setSkills(result.extracted_skills);
       setUploaded(true);
       toast.success('Resume uploaded successfully!');
     } catch (error) {
-      toast.error(error.response?.data?.detail || 'Upload failed');
+      toast.error(error.response?.data?.detail || error.message || 'Upload failed');
     } finally {
       setUploading(false);
+      setStage(null);
     }
   };
 
@@ -120,7 +160,7 @@ export default function UploadResume() {
                     {uploading ? (
                       <>
                         <Loader2 className="mr-2 h-4 w-4 animate-spin" />
-                        Uploading...
+                        {STAGE_LABELS[stage] || 'Uploading...'}
                       </>
                     ) : (
                       'Upload Resume'
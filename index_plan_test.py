@@ -0,0 +1,153 @@
+"""
+Query-plan check for the index registry (needs a reachable MongoDB; uses MONGO_URL).
+Applies backend/modules/db_indexes.py to a scratch database, seeds a few documents,
+and asserts that no hot query's winning plan contains a COLLSCAN.
+
+    MONGO_URL=mongodb://localhost:27017 python index_plan_test.py
+"""
+
+import asyncio
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from modules.pagination import encode_cursor, keyset_filter, keyset_sort
+
+# (name, collection, filter, sort) for every query on a request path
+HOT_QUERIES = [
+    ("login / identity by email", "users", {"email": "user0@example.com"}, None),
+    ("account deletion by id", "users", {"id": "user-0"}, None),
+    ("latest resume", "resumes", {"user_id": "user-0"}, [("created_at", -1)]),
+    ("analysis history", "skill_analyses", {"user_id": "user-0"}, keyset_sort("created_at")),
+    (
+        "analysis history next page",
+        "skill_analyses",
+        keyset_filter({"user_id": "user-0"}, "created_at", encode_cursor("2025-01-01T00:00:00+00:00", "a-5")),
+        keyset_sort("created_at"),
+    ),
+    ("analysis detail", "skill_analyses", {"id": "a-5", "user_id": "user-0"}, None),
+    ("analysis reuse", "skill_analyses", {"user_id": "user-0", "memo_key": "0" * 32}, None),
+    ("career test history", "career_test_results", {"user_id": "user-0"}, keyset_sort("created_at")),
+    ("DSA progress", "dsa_progress", {"user_id": "user-0"}, None),
+    ("news first page", "news_articles", {}, keyset_sort("publishedAt")),
+    (
+        "news next page",
+        "news_articles",
+        keyset_filter({}, "publishedAt", encode_cursor("2025-01-01T00:00:00Z", "n-5")),
+        keyset_sort("publishedAt"),
+    ),
+    ("news since (startup)", "news_articles", {"first_seen": {"$gte": datetime(2025, 1, 1, tzinfo=timezone.utc)}}, None),
+]
+
+
+def plan_stages(plan):
+    """Every stage name in an explain winningPlan tree."""
+    stages = [plan.get("stage")]
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            stages += plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        stages += plan_stages(child)
+    return [s for s in stages if s]
+
+
+class IndexPlanTester:
+    def __init__(self):
+        self.client = AsyncIOMotorClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017"), serverSelectionTimeoutMS=3000)
+        self.db = self.client[f"skillgap_index_test_{uuid.uuid4().hex[:8]}"]
+        self.tests_run = 0
+        self.tests_passed = 0
+
+    def log_test(self, name, success, details=""):
+        """Log test results"""
+        self.tests_run += 1
+        if success:
+            self.tests_passed += 1
+            print(f"✅ {name} - PASSED {details}")
+        else:
+            print(f"❌ {name} - FAILED {details}")
+        return success
+
+    async def seed(self):
+        now = datetime.now(timezone.utc)
+        await self.db.users.insert_many(
+            [{"id": f"user-{i}", "email": f"user{i}@example.com", "password_hash": "x"} for i in range(50)]
+        )
+        for name in ("resumes", "skill_analyses", "career_test_results"):
+            await self.db[name].insert_many([
+                {"id": str(uuid.uuid4()), "user_id": f"user-{i % 50}", "created_at": (now - timedelta(minutes=i)).isoformat()}
+                for i in range(200)
+            ])
+        await self.db.dsa_progress.insert_many([{"user_id": f"user-{i}", "version": 1} for i in range(50)])
+        await self.db.news_articles.insert_many([
+            {
+                "id": f"n-{i}",
+                "publishedAt": f"2025-01-{1 + i % 28:02d}T00:00:00Z",
+                "first_seen": now - timedelta(hours=i),
+                "ingested_at": now,
+            }
+            for i in range(200)
+        ])
+
+    async def test_registry_idempotent(self):
+        from modules.db_indexes import INDEXES, ensure_indexes
+
+        first = await ensure_indexes(self.db)
+        second = await ensure_indexes(self.db)
+        ok = set(first) == set(INDEXES) and first == second
+        return self.log_test("Index registry applies idempotently", ok, f"- {sum(len(v) for v in first.values())} indexes")
+
+    async def test_unique_email(self):
+        from pymongo.errors import DuplicateKeyError
+
+        try:
+            await self.db.users.insert_one({"id": "dup", "email": "user0@example.com"})
+        except DuplicateKeyError:
+            return self.log_test("Unique email index", True)
+        return self.log_test("Unique email index", False, "- duplicate email was inserted")
+
+    async def test_no_collscan(self):
+        for name, collection, query, sort in HOT_QUERIES:
+            cursor = self.db[collection].find(query)
+            if sort:
+                cursor = cursor.sort(sort)
+            plan = (await cursor.limit(20).explain())["queryPlanner"]["winningPlan"]
+            stages = plan_stages(plan)
+            self.log_test(f"Plan: {name}", "COLLSCAN" not in stages, f"- {' <- '.join(stages)}")
+
+    async def run(self):
+        try:
+            await self.test_registry_idempotent()
+            await self.seed()
+            await self.test_unique_email()
+            await self.test_no_collscan()
+        finally:
+            await self.client.drop_database(self.db.name)
+            self.client.close()
+
+
+def main():
+    print("🚀 Starting Index Plan Tests")
+    print("=" * 50)
+
+    tester = IndexPlanTester()
+    asyncio.run(tester.run())
+
+    print("\n" + "=" * 50)
+    print(f"📊 Test Results: {tester.tests_passed}/{tester.tests_run} passed")
+
+    if tester.tests_passed == tester.tests_run:
+        print("🎉 All tests passed!")
+        return 0
+    else:
+        print("⚠️  Some tests failed. Check the details above.")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
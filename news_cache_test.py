@@ -0,0 +1,178 @@
+"""
+News cache tests against a local fake GNews server: concurrent misses share one
+upstream fetch, stale entries are served while a single background refresh runs,
+queries are normalised and `count` shares one entry, the cache is LRU-bounded, and
+custom searches stop at their daily budget.
+
+    python news_cache_test.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+
+class FakeGNewsHandler(BaseHTTPRequestHandler):
+    delay = 0.1
+    lock = threading.Lock()
+    queries = []
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        q = query.get("q", [""])[0]
+        with FakeGNewsHandler.lock:
+            FakeGNewsHandler.queries.append(q)
+            version = len(FakeGNewsHandler.queries)
+        time.sleep(FakeGNewsHandler.delay)
+        body = json.dumps({
+            "articles": [
+                {"title": f"{q} v{version} #{i}", "url": f"https://news.example.com/{q}/{version}/{i}", "source": {"name": "Fake"}}
+                for i in range(int(query.get("max", ["10"])[0]))
+            ]
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class NewsCacheTester:
+    def __init__(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGNewsHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.environ["GNEWS_API_KEY"] = "test-key"
+        os.environ["GNEWS_BASE"] = f"http://127.0.0.1:{self.server.server_port}"
+        os.environ["NEWS_CACHE_PATH"] = os.path.join(self.tmp.name, "news_cache.json")
+        os.environ["NEWS_CACHE_SIZE"] = "3"
+        os.environ["NEWS_QUERY_DAILY_BUDGET"] = "8"
+        from modules import news_feed
+        self.nf = news_feed
+        self.tests_run = 0
+        self.tests_passed = 0
+
+    def log_test(self, name, success, details=""):
+        """Log test results"""
+        self.tests_run += 1
+        if success:
+            self.tests_passed += 1
+            print(f"✅ {name} - PASSED {details}")
+        else:
+            print(f"❌ {name} - FAILED {details}")
+        return success
+
+    def upstream_calls(self):
+        return len(FakeGNewsHandler.queries)
+
+    async def test_single_flight_miss(self):
+        results = await asyncio.gather(*(self.nf.get_cached_job_news(count=5, query="python jobs") for _ in range(20)))
+        same = all(r == results[0] for r in results) and len(results[0]) == 5
+        self.log_test("20 concurrent misses make one upstream call", self.upstream_calls() == 1 and same, f"- {self.upstream_calls()} calls")
+
+    async def test_normalised_key(self):
+        before = self.upstream_calls()
+        articles = await self.nf.get_cached_job_news(count=500, query="  Python   JOBS ")
+        self.log_test(
+            "Case, whitespace and count share one entry; count is clamped",
+            self.upstream_calls() == before and len(articles) == self.nf.NEWS_MAX_COUNT,
+        )
+        try:
+            await self.nf.get_cached_job_news(query="x" * (self.nf.NEWS_QUERY_MAX_CHARS + 1))
+            rejected = False
+        except ValueError:
+            rejected = True
+        self.log_test("Over-long query is rejected", rejected and self.upstream_calls() == before)
+
+    async def test_stale_while_revalidate(self):
+        entry = self.nf._load_news_cache()["python jobs"]
+        entry["fetched_at"] -= self.nf.NEWS_CACHE_TTL + 1
+        old_title = entry["articles"][0]["title"]
+        before = self.upstream_calls()
+        start = time.perf_counter()
+        served = await asyncio.gather(*(self.nf.get_cached_job_news(query="python jobs") for _ in range(10)))
+        elapsed = time.perf_counter() - start
+        immediate = all(r[0]["title"] == old_title for r in served) and elapsed < FakeGNewsHandler.delay
+        await asyncio.sleep(FakeGNewsHandler.delay * 3)
+        fresh = await self.nf.get_cached_job_news(query="python jobs")
+        self.log_test(
+            "Stale entry served at once while one background refresh runs",
+            immediate and self.upstream_calls() == before + 1 and fresh[0]["title"] != old_title,
+            f"- served in {elapsed * 1000:.1f} ms",
+        )
+
+    async def test_lru_bound(self):
+        for q in ("java", "rust", "python jobs", "golang"):
+            await self.nf.get_cached_job_news(query=q)
+        cache = self.nf._load_news_cache()
+        with open(self.nf.NEWS_CACHE_PATH, encoding="utf-8") as f:
+            persisted = json.load(f)
+        self.log_test(
+            "Cache keeps the NEWS_CACHE_SIZE most recently used queries",
+            list(cache) == ["rust", "python jobs", "golang"] and set(persisted) == set(cache),
+            f"- {list(cache)}",
+        )
+
+    async def test_concurrent_persist(self):
+        await asyncio.gather(*(self.nf._persist_news_cache() for _ in range(20)))
+        with open(self.nf.NEWS_CACHE_PATH, encoding="utf-8") as f:
+            persisted = json.load(f)
+        leftovers = [name for name in os.listdir(self.tmp.name) if name.endswith(".tmp")]
+        self.log_test("Concurrent persists leave one complete file", set(persisted) == set(self.nf._load_news_cache()) and not leftovers)
+
+    async def test_daily_budget(self):
+        for i in range(5):
+            await self.nf.get_cached_job_news(query=f"budget {i}")
+        stats = self.nf.news_cache_stats()
+        self.log_test(
+            "Custom searches stop at NEWS_QUERY_DAILY_BUDGET",
+            self.upstream_calls() == 8 and stats["budget_skips"] == 2 and stats["query_budget_used"] == 8,
+            f"- {self.upstream_calls()} upstream calls",
+        )
+
+    async def run(self):
+        try:
+            await self.test_single_flight_miss()
+            await self.test_normalised_key()
+            await self.test_stale_while_revalidate()
+            await self.test_lru_bound()
+            await self.test_concurrent_persist()
+            await self.test_daily_budget()
+        finally:
+            from modules.http_client import close_http_client
+            await close_http_client()
+            self.server.shutdown()
+            self.tmp.cleanup()
+
+
+def main():
+    print("🚀 Starting News Cache Tests (local fake server)")
+    print("=" * 50)
+
+    tester = NewsCacheTester()
+    asyncio.run(tester.run())
+
+    print("\n" + "=" * 50)
+    print(f"📊 Test Results: {tester.tests_passed}/{tester.tests_run} passed")
+
+    if tester.tests_passed == tester.tests_run:
+        print("🎉 All tests passed!")
+        return 0
+    else:
+        print("⚠️  Some tests failed. Check the details above.")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Latency benchmark for the job news feed against a local mock GNews server.
+Compares the old pattern (fresh client per query, queries in series) with
+get_job_news (shared keep-alive client, queries fanned out concurrently).
+
+    python news_feed_benchmark.py [iterations]
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+# Simulated upstream costs: connection setup (TCP + TLS handshake) and response time
+CONNECT_DELAY = 0.08
+RESPONSE_DELAY = 0.12
+
+
+class MockGNewsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        time.sleep(CONNECT_DELAY)
+        super().setup()
+
+    def do_GET(self):
+        time.sleep(RESPONSE_DELAY)
+        q = parse_qs(urlparse(self.path).query).get("q", [""])[0]
+        body = json.dumps({
+            "articles": [
+                {
+                    "title": f"{q} story {i}",
+                    "description": "Hiring update",
+                    "url": f"https://news.example.com/{abs(hash(q)) % 1000}/{i}",
+                    "publishedAt": "2025-01-01T00:00:00Z",
+                    "source": {"name": "Mock"},
+                }
+                for i in range(5)
+            ]
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def baseline_get_job_news(news_feed, count=15):
+    """The previous implementation: one new AsyncClient per query, awaited in series."""
+    import httpx
+
+    all_articles, seen = [], set()
+    for q in news_feed.DEFAULT_QUERIES:
+        async with httpx.AsyncClient(timeout=15) as client:
+            resp = await client.get(
+                f"{news_feed.GNEWS_BASE}/search",
+                params={"q": q, "lang": "en", "country": "in", "max": 5, "token": os.environ["GNEWS_API_KEY"]},
+            )
+            data = resp.json()
+        for a in data.get("articles", []):
+            if a["url"] not in seen:
+                seen.add(a["url"])
+                all_articles.append(a)
+    return all_articles[:count]
+
+
+def summarize(name, samples):
+    samples = sorted(samples)
+    p95 = samples[max(0, int(len(samples) * 0.95) - 1)]
+    print(f"{name:<28} p50 {statistics.median(samples) * 1000:7.1f} ms   p95 {p95 * 1000:7.1f} ms")
+    return statistics.median(samples)
+
+
+async def run(iterations):
+    from modules import news_feed
+    from modules.http_client import close_http_client
+
+    baseline, pooled = [], []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await baseline_get_job_news(news_feed)
+        baseline.append(time.perf_counter() - start)
+
+    first = None
+    for _ in range(iterations):
+        start = time.perf_counter()
+        articles = await news_feed.get_job_news()
+        pooled.append(time.perf_counter() - start)
+        if first is None:
+            first = [a["url"] for a in articles]
+        elif [a["url"] for a in articles] != first:
+            print("⚠️  Dedup order changed between runs")
+    await close_http_client()
+
+    print(f"{len(news_feed.DEFAULT_QUERIES)} queries, connect {CONNECT_DELAY * 1000:.0f} ms, response {RESPONSE_DELAY * 1000:.0f} ms, {iterations} iterations")
+    b = summarize("sequential, fresh clients", baseline)
+    p = summarize("concurrent, shared client", pooled)
+    print(f"speedup (p50): {b / p:.1f}x")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockGNewsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["GNEWS_API_KEY"] = "bench-key"
+    os.environ["GNEWS_BASE"] = f"http://127.0.0.1:{server.server_port}"
+    try:
+        asyncio.run(run(iterations))
+    finally:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
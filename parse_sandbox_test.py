@@ -0,0 +1,337 @@
+"""
+Hostile-document tests for the parsing sandbox (backend/modules/document_sandbox.py).
+Builds a corpus of decompression bombs, pathological PDFs, malformed files and
+seeded random mutations of valid resumes, uploads each through the API (embedded
+storage backend, in-process), and checks that every one ends in a 200 or a 400 within
+the deadline - never a 5xx or a dead worker. It then measures valid-upload throughput
+and /api/ latency with and without a second user uploading the bomb corpus alongside,
+and checks that valid uploads keep at least THROUGHPUT_FLOOR of their baseline rate.
+
+    python parse_sandbox_test.py [seconds_per_phase]
+"""
+
+import io
+import os
+import random
+import resource
+import statistics
+import sys
+import threading
+import time
+import zipfile
+import zlib
+
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+os.environ.setdefault("NEWS_INGEST_ENABLED", "0")
+os.environ.setdefault("PARSE_CPU_SECONDS", "2")
+os.environ.setdefault("PARSE_TIMEOUT", "5")
+os.environ.setdefault("PARSE_MEMORY_MB", "384")
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend")
+sys.path.insert(0, BACKEND_DIR)
+
+import docx
+import fitz
+
+# Share of baseline valid-upload throughput that must survive a bomb-uploading client
+THROUGHPUT_FLOOR = 0.3
+RESUME_TEXT = "Built Python and React services with Docker and SQL; 3 years of Java and AWS."
+DOCX_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+CONTENT_TYPES = (
+    b'<?xml version="1.0" encoding="UTF-8"?><Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    b'<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    b'<Override PartName="/word/document.xml" '
+    b'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/></Types>'
+)
+RELS = (
+    b'<?xml version="1.0" encoding="UTF-8"?><Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    b'<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    b'Target="word/document.xml"/></Relationships>'
+)
+W_NS = b'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+# ---------- corpus ----------
+
+def valid_docx():
+    document = docx.Document()
+    document.add_paragraph(RESUME_TEXT)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def valid_pdf():
+    pdf = fitz.open()
+    pdf.new_page().insert_text((72, 72), RESUME_TEXT)
+    return pdf.tobytes()
+
+
+def docx_with_body(write_body):
+    """A minimal DOCX whose word/document.xml is streamed by write_body(file)."""
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", CONTENT_TYPES)
+        archive.writestr("_rels/.rels", RELS)
+        with archive.open("word/document.xml", "w", force_zip64=True) as body:
+            write_body(body)
+    return out.getvalue()
+
+
+def docx_zip_bomb(megabytes=256):
+    # Declares far more than the uncompressed-size cap
+    def body(f):
+        f.write(b'<?xml version="1.0"?><w:document ' + W_NS + b"><w:body>")
+        chunk = b" " * (1024 * 1024)
+        for _ in range(megabytes):
+            f.write(chunk)
+        f.write(b"</w:body></w:document>")
+    return docx_with_body(body)
+
+
+def docx_element_flood(megabytes=48):
+    # Under the size cap, but millions of elements - the XML tree outgrows the memory limit
+    def body(f):
+        f.write(b'<?xml version="1.0"?><w:document ' + W_NS + b"><w:body>")
+        chunk = b"<w:p><w:r><w:t>a</w:t></w:r></w:p>" * 30000
+        for _ in range(megabytes * 1024 * 1024 // len(chunk)):
+            f.write(chunk)
+        f.write(b"</w:body></w:document>")
+    return docx_with_body(body)
+
+
+def docx_billion_laughs():
+    entities = b'<!ENTITY a0 "lol">' + b"".join(
+        b'<!ENTITY a%d "%s">' % (i, b"&a%d;" % (i - 1) * 10) for i in range(1, 10)
+    )
+    xml = (
+        b'<?xml version="1.0"?><!DOCTYPE w:document [' + entities + b"]><w:document " + W_NS
+        + b"><w:body><w:p><w:r><w:t>&a9;</w:t></w:r></w:p></w:body></w:document>"
+    )
+    return docx_with_body(lambda f: f.write(xml))
+
+
+def pdf_from_objects(objects):
+    """Serialise numbered PDF objects (1-based; 1 is the catalog) with a valid xref table."""
+    out = io.BytesIO()
+    out.write(b"%PDF-1.7\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def pdf_stream_bomb(megabytes=512):
+    # One page whose Flate content stream inflates to hundreds of MB of text operators
+    compressor = zlib.compressobj(9)
+    line = b"BT /F1 12 Tf 72 720 Td (" + b"A" * 200 + b") Tj ET\n"
+    chunk = line * (1024 * 1024 // len(line))
+    data = b"".join(compressor.compress(chunk) for _ in range(megabytes)) + compressor.flush()
+    return pdf_from_objects([
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(data) + data + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ])
+
+
+def pdf_page_flood(pages=40000):
+    # Many pages sharing one text-heavy content stream: small file, lots of work
+    content = (b"BT /F1 6 Tf 10 780 Td (" + b"python java docker " * 20 + b") Tj ET\n") * 60
+    kids = b" ".join(b"%d 0 R" % (5 + i) for i in range(pages))
+    page = b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 3 0 R /Resources << /Font << /F1 4 0 R >> >> >>"
+    return pdf_from_objects([
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % pages,
+        b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        *[page] * pages,
+    ])
+
+
+def mutations(seed_bytes, count, rng):
+    """Byte flips, truncations and spliced garbage of a valid file."""
+    cases = []
+    for i in range(count):
+        data = bytearray(seed_bytes)
+        kind = i % 3
+        if kind == 0:
+            for _ in range(rng.randint(1, 50)):
+                data[rng.randrange(len(data))] = rng.randrange(256)
+        elif kind == 1:
+            data = data[:rng.randrange(1, len(data))]
+        else:
+            at = rng.randrange(len(data))
+            data[at:at] = bytes(rng.randrange(256) for _ in range(rng.randint(1, 4096)))
+        cases.append(bytes(data))
+    return cases
+
+
+def build_corpus(seed=1234):
+    rng = random.Random(seed)
+    good_docx, good_pdf = valid_docx(), valid_pdf()
+    bombs = [
+        ("docx zip bomb (256 MB declared)", "bomb.docx", docx_zip_bomb()),
+        ("docx element flood (48 MB of XML)", "flood.docx", docx_element_flood()),
+        ("docx billion laughs", "laughs.docx", docx_billion_laughs()),
+        ("pdf content-stream bomb (512 MB inflated)", "bomb.pdf", pdf_stream_bomb()),
+        ("pdf page flood (40k pages)", "pages.pdf", pdf_page_flood()),
+    ]
+    malformed = [
+        ("empty pdf", "empty.pdf", b""),
+        ("empty docx", "empty.docx", b""),
+        ("random bytes as pdf", "noise.pdf", rng.randbytes(64 * 1024)),
+        ("random bytes as docx", "noise.docx", rng.randbytes(64 * 1024)),
+        ("pdf header only", "header.pdf", b"%PDF-1.7\n" + rng.randbytes(1024)),
+    ]
+    fuzz = [(f"fuzzed docx #{i}", "fuzz.docx", data) for i, data in enumerate(mutations(good_docx, 15, rng))]
+    fuzz += [(f"fuzzed pdf #{i}", "fuzz.pdf", data) for i, data in enumerate(mutations(good_pdf, 15, rng))]
+    return good_docx, good_pdf, bombs, malformed, fuzz
+
+
+# ---------- tests ----------
+
+def rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class ParseSandboxTester:
+    def __init__(self, client, headers, attacker_headers, deadline):
+        self.client = client
+        self.headers = headers
+        self.attacker_headers = attacker_headers
+        self.deadline = deadline
+        self.tests_run = 0
+        self.tests_passed = 0
+
+    def log_test(self, name, success, details=""):
+        """Log test results"""
+        self.tests_run += 1
+        if success:
+            self.tests_passed += 1
+            print(f"✅ {name} - PASSED {details}")
+        else:
+            print(f"❌ {name} - FAILED {details}")
+        return success
+
+    def upload(self, filename, data, headers=None):
+        content_type = DOCX_TYPE if filename.endswith(".docx") else "application/pdf"
+        start = time.perf_counter()
+        r = self.client.post("/api/resume/upload", headers=headers or self.headers, files={"file": (filename, data, content_type)})
+        return r, time.perf_counter() - start
+
+    def test_valid(self, good_docx, good_pdf):
+        for name, data in (("cv.docx", good_docx), ("cv.pdf", good_pdf)):
+            r, _ = self.upload(name, data)
+            self.log_test(f"Valid {name} parses in the sandbox", r.status_code == 200 and "python" in r.json()["extracted_skills"])
+
+    def test_hostile(self, cases, expect_rejected):
+        for label, filename, data in cases:
+            r, elapsed = self.upload(filename, data)
+            ok = r.status_code == 400 if expect_rejected else r.status_code in (200, 400)
+            detail = r.json().get("detail", "") if r.status_code != 200 else "parsed"
+            self.log_test(label, ok and elapsed < self.deadline, f"- {r.status_code} in {elapsed:.2f}s ({detail})")
+
+    def test_oversize(self):
+        r, _ = self.upload("huge.pdf", b"%PDF-1.7\n" + b"0" * (11 * 1024 * 1024))
+        self.log_test("Oversized upload rejected before parsing", r.status_code == 400 and "too large" in r.json()["detail"])
+
+    def measure(self, seconds, good_docx, attack_corpus):
+        """Valid-upload throughput and /api/ latency, optionally with bombs uploading alongside."""
+        stop = time.monotonic() + seconds
+        uploads, pings, failures = [], [], []
+
+        def valid_uploader():
+            while time.monotonic() < stop:
+                r, elapsed = self.upload("cv.docx", good_docx)
+                (uploads if r.status_code == 200 else failures).append(elapsed)
+
+        def pinger():
+            while time.monotonic() < stop:
+                start = time.perf_counter()
+                self.client.get("/api/")
+                pings.append(time.perf_counter() - start)
+                time.sleep(0.02)
+
+        def attacker():
+            i = 0
+            while time.monotonic() < stop:
+                label, filename, data = attack_corpus[i % len(attack_corpus)]
+                r, _ = self.upload(filename, data, self.attacker_headers)
+                if r.status_code >= 500:
+                    failures.append(label)
+                i += 1
+
+        threads = [threading.Thread(target=valid_uploader) for _ in range(2)] + [threading.Thread(target=pinger)]
+        threads += [threading.Thread(target=attacker) for _ in range(2 if attack_corpus else 0)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        pings.sort()
+        p95 = pings[int(len(pings) * 0.95) - 1] if pings else float("inf")
+        return len(uploads) / seconds, statistics.median(pings) if pings else 0.0, p95, failures
+
+    def test_throughput(self, seconds, good_docx, bombs):
+        rss_before = rss_mb()
+        base_rate, base_p50, base_p95, base_fail = self.measure(seconds, good_docx, [])
+        rate, p50, p95, failures = self.measure(seconds, good_docx, bombs)
+        print(f"   baseline:     {base_rate:6.1f} valid uploads/s, /api/ p50 {base_p50 * 1000:6.1f} ms p95 {base_p95 * 1000:6.1f} ms")
+        print(f"   under attack: {rate:6.1f} valid uploads/s, /api/ p50 {p50 * 1000:6.1f} ms p95 {p95 * 1000:6.1f} ms")
+        self.log_test("No failed valid uploads or 5xx under attack", not base_fail and not failures, f"- {failures[:3]}")
+        self.log_test(
+            f"Valid uploads keep at least {THROUGHPUT_FLOOR:.0%} of baseline under attack",
+            base_rate > 0 and rate >= THROUGHPUT_FLOOR * base_rate,
+            f"- {rate / base_rate:.0%} of baseline" if base_rate else "",
+        )
+        self.log_test("Event loop stays responsive under attack", p95 < 0.5, f"- /api/ p95 {p95 * 1000:.0f} ms")
+        self.log_test("API process memory stays flat", rss_mb() - rss_before < 100, f"- max RSS {rss_before:.0f} -> {rss_mb():.0f} MB")
+
+
+def main():
+    from fastapi.testclient import TestClient
+
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    print("🚀 Starting Parse Sandbox Tests")
+    print("=" * 50)
+
+    good_docx, good_pdf, bombs, malformed, fuzz = build_corpus()
+    os.chdir(BACKEND_DIR)
+    import server
+
+    with TestClient(server.app) as c:
+        token = c.post("/api/auth/register", json={"email": "sandbox@example.com", "password": "pw12345"}).json()["token"]
+        attacker = c.post("/api/auth/register", json={"email": "bombs@example.com", "password": "pw12345"}).json()["token"]
+        from modules.document_sandbox import PARSE_TIMEOUT
+
+        tester = ParseSandboxTester(
+            c, {"Authorization": f"Bearer {token}"}, {"Authorization": f"Bearer {attacker}"}, deadline=PARSE_TIMEOUT + 2
+        )
+        tester.test_valid(good_docx, good_pdf)
+        tester.test_hostile(bombs, expect_rejected=True)
+        tester.test_hostile(malformed, expect_rejected=True)
+        tester.test_hostile(fuzz, expect_rejected=False)
+        tester.test_oversize()
+        tester.test_throughput(seconds, good_docx, bombs)
+        print(f"   sandbox: {server.document_sandbox.stats()}")
+
+    print("\n" + "=" * 50)
+    print(f"📊 Test Results: {tester.tests_passed}/{tester.tests_run} passed")
+
+    if tester.tests_passed == tester.tests_run:
+        print("🎉 All tests passed!")
+        return 0
+    else:
+        print("⚠️  Some tests failed. Check the details above.")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+Resume job queue tests. Exercises backend/modules/resume_jobs.py with a stub pipeline
+(event order, failures, queue limit, ownership, shutdown), then queues a real upload
+through the API on the embedded storage backend and follows its Server-Sent Events.
+
+    python resume_jobs_test.py
+"""
+
+import asyncio
+import io
+import os
+import sys
+
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+os.environ.setdefault("NEWS_INGEST_ENABLED", "0")
+os.environ.setdefault("ADMIN_EMAILS", "jobs@example.com")
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend")
+sys.path.insert(0, BACKEND_DIR)
+
+from modules.resume_jobs import DONE, FAILED, QueueFullError, ResumeJobQueue, UserQueueFullError
+
+
+async def stub_pipeline(user_id, filename, payload, stage):
+    for name in ("extract", "skills", "store"):
+        stage(name)
+        await asyncio.sleep(0.01)
+    if payload == b"bad":
+        raise ValueError("Could not extract text.")
+    return {"resume_id": f"{user_id}:{filename}"}
+
+
+class ResumeJobsTester:
+    def __init__(self):
+        self.tests_run = 0
+        self.tests_passed = 0
+
+    def log_test(self, name, success, details=""):
+        """Log test results"""
+        self.tests_run += 1
+        if success:
+            self.tests_passed += 1
+            print(f"✅ {name} - PASSED {details}")
+        else:
+            print(f"❌ {name} - FAILED {details}")
+        return success
+
+    async def test_events_and_failures(self):
+        queue = ResumeJobQueue(stub_pipeline, workers=2, max_queued=10)
+        queue.start()
+        ok_job = queue.submit("u1", "cv.pdf", b"ok")
+        bad_job = queue.submit("u1", "cv.docx", b"bad")
+        events = [e["event"] async for e in queue.events(ok_job) if e]
+        failed = [e async for e in queue.events(bad_job) if e][-1]
+        self.log_test(
+            "Events: queued, each stage, done",
+            events == ["queued", "stage", "stage", "stage", "done"] and ok_job.status == DONE
+            and ok_job.view()["result"] == {"resume_id": "u1:cv.pdf"},
+            f"- {events}",
+        )
+        self.log_test(
+            "ValueError becomes a failed event with its message",
+            bad_job.status == FAILED and failed["data"]["error"] == "Could not extract text." and bad_job.payload is None,
+        )
+        self.log_test("Jobs are only visible to their owner", queue.get(ok_job.id, "u1") is ok_job and queue.get(ok_job.id, "u2") is None)
+        stats = queue.stats()
+        self.log_test(
+            "Stats report counts and stage latency",
+            stats["completed"] == 1 and stats["failed"] == 1 and stats["stages"]["extract"]["count"] == 2,
+        )
+        await queue.close()
+
+    async def test_queue_limit_and_shutdown(self):
+        queue = ResumeJobQueue(stub_pipeline, workers=1, max_queued=3)
+        queue.start()
+        jobs = [queue.submit("u1", f"cv{i}.pdf", b"ok") for i in range(3)]
+        try:
+            queue.submit("u1", "one-too-many.pdf", b"ok")
+            rejected = False
+        except QueueFullError as e:
+            rejected = e.retry_after >= 1
+        self.log_test("Full queue rejects with a retry delay", rejected and queue.stats()["queue_depth"] == 3)
+        await asyncio.sleep(0)
+        await queue.close()
+        self.log_test("Shutdown fails unfinished jobs", all(j.status == FAILED for j in jobs[1:]))
+
+    async def test_per_user_limit(self):
+        queue = ResumeJobQueue(stub_pipeline, workers=1, max_queued=10, max_per_user=2)
+        queue.start()
+        mine = [queue.submit("greedy", f"cv{i}.pdf", b"ok") for i in range(2)]
+        try:
+            queue.submit("greedy", "cv2.pdf", b"ok")
+            capped = False
+        except UserQueueFullError as e:
+            capped = e.retry_after >= 1
+        other = queue.submit("patient", "cv.pdf", b"ok")
+        for job in mine + [other]:
+            [e async for e in queue.events(job)]
+        queue.submit("greedy", "cv3.pdf", b"ok")  # accepted again once theirs have run
+        stats = queue.stats()
+        await queue.close()
+        self.log_test(
+            "Per-user cap turns one user away while others still submit",
+            capped and other.status == DONE and stats["submitted"] == 4 and stats["user_rejected"] == 1,
+            f"- {stats['user_rejected']} rejected",
+        )
+
+    def test_api_async_upload(self):
+        import docx
+        from fastapi.testclient import TestClient
+
+        os.chdir(BACKEND_DIR)
+        import server
+
+        document = docx.Document()
+        document.add_paragraph("Built Python and React services with Docker and SQL; 3 years of Java.")
+        upload = io.BytesIO()
+        document.save(upload)
+        content_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+        with TestClient(server.app) as c:
+            token = c.post("/api/auth/register", json={"email": "jobs@example.com", "password": "pw12345"}).json()["token"]
+            h = {"Authorization": f"Bearer {token}"}
+            r = c.post("/api/resume/upload?async=true", headers=h, files={"file": ("cv.docx", upload.getvalue(), content_type)})
+            self.log_test("Async upload returns 202 with a job", r.status_code == 202 and r.json()["status"] == "queued")
+            with c.stream("GET", r.json()["events_url"], headers=h) as stream:
+                body = stream.read().decode()
+            names = [line[len("event: "):] for line in body.splitlines() if line.startswith("event: ")]
+            self.log_test("SSE stream ends with done", names[0] == "queued" and names[-1] == "done", f"- {names}")
+            job = c.get(r.json()["status_url"], headers=h).json()
+            self.log_test("Job status carries the result", job["status"] == "done" and job["result"]["extracted_skills"])
+            metrics = c.get("/api/metrics", headers=h).json()["resume_jobs"]
+            self.log_test("Metrics expose queue depth and stage latency", "queue_depth" in metrics and "extract" in metrics["stages"])
+            other = c.post("/api/auth/register", json={"email": "not-admin@example.com", "password": "pw12345"}).json()["token"]
+            denied = [c.get("/api/metrics").status_code, c.get("/api/metrics", headers={"Authorization": f"Bearer {other}"}).status_code]
+            self.log_test("Metrics are admin-only", denied == [403, 403], f"- {denied}")
+
+
+def main():
+    print("🚀 Starting Resume Job Tests")
+    print("=" * 50)
+
+    tester = ResumeJobsTester()
+    asyncio.run(tester.test_events_and_failures())
+    asyncio.run(tester.test_queue_limit_and_shutdown())
+    asyncio.run(tester.test_per_user_limit())
+    tester.test_api_async_upload()
+
+    print("\n" + "=" * 50)
+    print(f"📊 Test Results: {tester.tests_passed}/{tester.tests_run} passed")
+
+    if tester.tests_passed == tester.tests_run:
+        print("🎉 All tests passed!")
+        return 0
+    else:
+        print("⚠️  Some tests failed. Check the details above.")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+Insert throughput / latency benchmark: direct insert_one vs the write-behind buffer.
+Concurrent clients each insert analysis-sized documents. By default the collection is
+a simulated MongoDB (network round trip, per-operation and per-document cost, limited
+server concurrency); pass --mongo to use a real server at MONGO_URL instead.
+
+    python write_behind_benchmark.py [clients] [inserts_per_client] [--mongo]
+
+Write-behind latency is the time to enqueue (the write is acknowledged before it is
+durable); its throughput includes the final flush.
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+# Simulated server costs
+ROUND_TRIP = 0.0005
+PER_OPERATION = 0.0002
+PER_DOCUMENT = 0.00002
+SERVER_CONCURRENCY = 8
+
+
+class SimulatedCollection:
+    def __init__(self, name="skill_analyses"):
+        self.name = name
+        self.docs = 0
+        self._server = asyncio.Semaphore(SERVER_CONCURRENCY)
+
+    async def _op(self, n):
+        await asyncio.sleep(ROUND_TRIP / 2)
+        async with self._server:
+            await asyncio.sleep(PER_OPERATION + PER_DOCUMENT * n)
+        await asyncio.sleep(ROUND_TRIP / 2)
+        self.docs += n
+
+    async def insert_one(self, doc):
+        await self._op(1)
+
+    async def insert_many(self, docs, ordered=True):
+        await self._op(len(docs))
+
+
+def make_doc(user):
+    return {
+        "id": str(uuid.uuid4()),
+        "user_id": f"user-{user}",
+        "company": "Google",
+        "role": "Software Engineer",
+        "resume_skills": ["python", "react", "docker", "sql", "java"],
+        "job_skills": ["python", "java", "c++", "algorithms", "data structures", "system design"],
+        "missing_skills": ["c++", "algorithms", "data structures", "system design"],
+        "match_percentage": 33.3,
+        "bundle_id": "0" * 32,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+async def drive(insert, clients, per_client):
+    latencies = []
+
+    async def client(user):
+        for _ in range(per_client):
+            start = time.perf_counter()
+            await insert(make_doc(user))
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(client(u) for u in range(clients)))
+    return latencies
+
+
+def summarize(name, latencies, elapsed):
+    latencies = sorted(latencies)
+    p99 = latencies[max(0, int(len(latencies) * 0.99) - 1)]
+    rate = len(latencies) / elapsed
+    print(f"{name:<14} {rate:9.0f} inserts/s   p50 {statistics.median(latencies) * 1000:7.2f} ms   p99 {p99 * 1000:7.2f} ms")
+    return rate
+
+
+async def run(clients, per_client, use_mongo):
+    from modules.write_behind import WriteBehindBuffer
+
+    if use_mongo:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        mongo = AsyncIOMotorClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+        db = mongo[f"skillgap_bench_{uuid.uuid4().hex[:8]}"]
+        direct_coll, buffered_coll = db.direct, db.buffered
+    else:
+        direct_coll, buffered_coll = SimulatedCollection(), SimulatedCollection()
+
+    start = time.perf_counter()
+    direct = await drive(direct_coll.insert_one, clients, per_client)
+    direct_elapsed = time.perf_counter() - start
+
+    buffer = WriteBehindBuffer(buffered_coll)
+    buffer.start()
+    start = time.perf_counter()
+    buffered = await drive(buffer.insert, clients, per_client)
+    await buffer.close()
+    buffered_elapsed = time.perf_counter() - start
+
+    print(f"{clients} clients x {per_client} inserts ({'MongoDB' if use_mongo else 'simulated server'})")
+    d = summarize("insert_one", direct, direct_elapsed)
+    b = summarize("write-behind", buffered, buffered_elapsed)
+    print(f"throughput: {b / d:.1f}x   batches: {buffer.stats()['batches']}")
+    if use_mongo:
+        await mongo.drop_database(db.name)
+        mongo.close()
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    clients = int(args[0]) if args else 64
+    per_client = int(args[1]) if len(args) > 1 else 100
+    asyncio.run(run(clients, per_client, "--mongo" in sys.argv))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
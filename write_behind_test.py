@@ -0,0 +1,244 @@
+"""
+Write-behind buffer tests. Exercises backend/modules/write_behind.py on the embedded
+storage backend, with a collection wrapper that injects failures: transient errors are
+requeued, rejected documents are retried then reported as failed, backpressure holds
+inserts at max_pending, and a user's pending writes are visible once flushed. Finally
+checks through the API that memoized analyses are inserted directly even with
+WRITE_BEHIND_ENABLED=1.
+
+    python write_behind_test.py
+"""
+
+import asyncio
+import io
+import os
+import sys
+import uuid
+
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+os.environ.setdefault("NEWS_INGEST_ENABLED", "0")
+os.environ.setdefault("WRITE_BEHIND_ENABLED", "1")
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend")
+sys.path.insert(0, BACKEND_DIR)
+
+from pymongo.errors import AutoReconnect, BulkWriteError, DuplicateKeyError
+
+from modules.storage import open_client
+from modules.write_behind import WriteBehindBuffer
+
+
+class FlakyCollection:
+    """Passes writes through, failing the next `outages` batches and rejecting docs marked `poison`."""
+
+    def __init__(self, collection, outages=0):
+        self.collection = collection
+        self.name = collection.name
+        self.outages = outages
+
+    async def insert_many(self, docs, ordered=True):
+        if self.outages:
+            self.outages -= 1
+            raise AutoReconnect("connection reset")
+        good = [doc for doc in docs if not doc.get("poison")]
+        errors = [
+            {"index": i, "code": 121, "errmsg": "Document failed validation"}
+            for i, doc in enumerate(docs) if doc.get("poison")
+        ]
+        inserted = 0
+        try:
+            if good:
+                await self.collection.insert_many(good, ordered=False)
+            inserted = len(good)
+        except BulkWriteError as e:
+            inserted = e.details["nInserted"]
+            positions = [i for i, doc in enumerate(docs) if not doc.get("poison")]
+            errors += [{**err, "index": positions[err["index"]]} for err in e.details["writeErrors"]]
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "writeConcernErrors": [], "nInserted": inserted})
+
+
+def make_doc(user, **extra):
+    return {"id": str(uuid.uuid4()), "user_id": user, **extra}
+
+
+class WriteBehindTester:
+    def __init__(self):
+        self.tests_run = 0
+        self.tests_passed = 0
+
+    def log_test(self, name, success, details=""):
+        """Log test results"""
+        self.tests_run += 1
+        if success:
+            self.tests_passed += 1
+            print(f"✅ {name} - PASSED {details}")
+        else:
+            print(f"❌ {name} - FAILED {details}")
+        return success
+
+    async def test_requeue_after_outage(self, db):
+        collection = FlakyCollection(db.requeue, outages=1)
+        buffer = WriteBehindBuffer(collection, max_batch=10, flush_interval=60)
+        buffer.start()
+        for i in range(5):
+            await buffer.insert(make_doc(f"u{i % 2}"))
+        await buffer.flush()
+        kept = buffer.stats()["pending"] == 5 and await db.requeue.count_documents({}) == 0
+        await buffer.flush()
+        stored = await db.requeue.count_documents({})
+        stats = buffer.stats()
+        await buffer.close()
+        self.log_test(
+            "Failed flush requeues the batch and the next flush writes it",
+            kept and stored == 5 and stats["written"] == 5 and stats["pending"] == 0 and stats["errors"] == 1,
+            f"- {stats}",
+        )
+
+    async def test_rejected_documents(self, db):
+        collection = FlakyCollection(db.rejected)
+        buffer = WriteBehindBuffer(collection, max_batch=10, flush_interval=60, max_pending=5, max_attempts=3, keep_failed=1)
+        buffer.start()
+        poison = make_doc("u1", poison=True)
+        for doc in (make_doc("u1"), poison, make_doc("u2")):
+            await buffer.insert(doc)
+        await buffer.flush()
+        retrying = buffer.stats()["pending"] == 1 and not buffer.failed and buffer.has_pending("u1")
+        await buffer.flush()
+        await buffer.flush()
+        stats = buffer.stats()
+        # Every slot is free again: max_pending inserts go through without a flush
+        await asyncio.wait_for(asyncio.gather(*(buffer.insert(make_doc("u3")) for _ in range(5))), timeout=1)
+        self.log_test("Rejected document is retried while the rest are written", retrying)
+        self.log_test(
+            "After max_attempts it is kept in `failed` and its slot is released",
+            list(buffer.failed) == [poison] and stats["failed"] == 1 and stats["written"] == 2
+            and stats["pending"] == 0 and not buffer.has_pending("u1") and buffer.stats()["backpressure_waits"] == 0,
+            f"- {stats}",
+        )
+        later = make_doc("u4", poison=True)
+        await buffer.insert(later)
+        for _ in range(3):
+            await buffer.flush()
+        self.log_test(
+            "Only the last keep_failed rejected documents are held",
+            list(buffer.failed) == [later] and buffer.stats()["failed"] == 2,
+        )
+        await buffer.close()
+
+    async def test_duplicate_ids_after_partial_write(self, db):
+        buffer = WriteBehindBuffer(db.partial, max_batch=10, flush_interval=60)
+        buffer.start()
+        docs = [make_doc("u1", _id=f"d{i}") for i in range(3)]
+        await db.partial.insert_one(dict(docs[0]))  # landed before an interrupted flush
+        for doc in docs:
+            await buffer.insert(doc)
+        await buffer.flush()
+        stats = buffer.stats()
+        await buffer.close()
+        self.log_test(
+            "Documents already written are counted as duplicates, not failures",
+            stats["duplicates"] == 1 and stats["written"] == 2 and stats["failed"] == 0
+            and await db.partial.count_documents({}) == 3,
+        )
+
+    async def test_backpressure(self, db):
+        buffer = WriteBehindBuffer(db.backpressure, max_batch=100, flush_interval=60, max_pending=3)
+        buffer.start()
+        for _ in range(3):
+            await buffer.insert(make_doc("u1"))
+        blocked = asyncio.create_task(buffer.insert(make_doc("u1")))
+        await asyncio.sleep(0.05)
+        held = not blocked.done() and buffer.stats()["backpressure_waits"] == 1
+        await buffer.flush()
+        await asyncio.wait_for(blocked, timeout=1)
+        await buffer.flush()
+        stats = buffer.stats()
+        await buffer.close()
+        self.log_test(
+            "Inserts wait at max_pending and resume after a flush",
+            held and stats["pending"] == 0 and await db.backpressure.count_documents({}) == 4,
+            f"- {stats}",
+        )
+
+    async def test_read_your_writes(self, db):
+        buffer = WriteBehindBuffer(db.ryw, max_batch=100, flush_interval=60)
+        buffer.start()
+        doc = make_doc("reader")
+        await buffer.insert(doc)
+        before = buffer.has_pending("reader") and not buffer.has_pending("someone-else")
+        unseen = await db.ryw.find_one({"id": doc["id"]}) is None
+        await buffer.flush()
+        seen = await db.ryw.find_one({"id": doc["id"]}) is not None
+        self.log_test("Pending writes are tracked per user and visible after flush", before and unseen and seen and not buffer.has_pending("reader"))
+
+        await buffer.insert(make_doc("leftover"))
+        await buffer.close()
+        self.log_test("Shutdown flushes what is still queued", await db.ryw.count_documents({"user_id": "leftover"}) == 1)
+
+    async def run_buffer_tests(self):
+        client = open_client("memory")
+        db = client["write_behind_test"]
+        try:
+            await self.test_requeue_after_outage(db)
+            await self.test_rejected_documents(db)
+            await self.test_duplicate_ids_after_partial_write(db)
+            await self.test_backpressure(db)
+            await self.test_read_your_writes(db)
+        finally:
+            client.close()
+
+    def test_memoized_analyses_bypass_buffer(self):
+        import docx
+        from fastapi.testclient import TestClient
+
+        os.chdir(BACKEND_DIR)
+        import server
+
+        document = docx.Document()
+        document.add_paragraph("Built Python and React services with Docker and SQL; 3 years of Java.")
+        upload = io.BytesIO()
+        document.save(upload)
+        content_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+        with TestClient(server.app) as c:
+            token = c.post("/api/auth/register", json={"email": "wb@example.com", "password": "pw12345"}).json()["token"]
+            h = {"Authorization": f"Bearer {token}"}
+            c.post("/api/resume/upload", headers=h, files={"file": ("cv.docx", upload.getvalue(), content_type)})
+            r = c.post("/api/skill-analysis", headers=h, json={"company": "Google", "role": "Software Engineer"})
+            analysis_id = r.json()["id"]
+            stored = asyncio.run(server.db.skill_analyses.find_one({"id": analysis_id}))
+            self.log_test(
+                "Memoized analysis is stored immediately with write-behind on",
+                "skill_analyses" in server.write_buffers and stored is not None
+                and server.write_buffers["skill_analyses"].stats()["queued"] == 0,
+            )
+            duplicate = {"id": str(uuid.uuid4()), "user_id": stored["user_id"], "memo_key": stored["memo_key"]}
+            try:
+                asyncio.run(server.insert_history("skill_analyses", duplicate))
+                raised = False
+            except DuplicateKeyError:
+                raised = True
+            self.log_test("A memo_key conflict reaches the caller as DuplicateKeyError", raised)
+
+
+def main():
+    print("🚀 Starting Write-Behind Tests")
+    print("=" * 50)
+
+    tester = WriteBehindTester()
+    asyncio.run(tester.run_buffer_tests())
+    tester.test_memoized_analyses_bypass_buffer()
+
+    print("\n" + "=" * 50)
+    print(f"📊 Test Results: {tester.tests_passed}/{tester.tests_run} passed")
+
+    if tester.tests_passed == tester.tests_run:
+        print("🎉 All tests passed!")
+        return 0
+    else:
+        print("⚠️  Some tests failed. Check the details above.")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
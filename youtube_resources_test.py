@@ -0,0 +1,155 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+
+class FakeYouTubeHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the YouTube Data API search endpoint."""
+
+    delay = 0.2
+    lock = threading.Lock()
+    requests_seen = 0
+    in_flight = 0
+    max_in_flight = 0
+
+    def do_GET(self):
+        cls = FakeYouTubeHandler
+        with cls.lock:
+            cls.requests_seen += 1
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        time.sleep(cls.delay)
+        with cls.lock:
+            cls.in_flight -= 1
+
+        query = parse_qs(urlparse(self.path).query)
+        q = query.get("q", [""])[0]
+        body = json.dumps({
+            "items": [
+                {"id": {"videoId": f"vid{i}"}, "snippet": {"title": f"{q} #{i}", "thumbnails": {}}}
+                for i in range(int(query.get("maxResults", ["3"])[0]))
+            ]
+        }).encode()
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except ConnectionError:
+            pass  # the client gave up (deadline test)
+
+    def log_message(self, *args):
+        pass
+
+
+class YouTubeResourcesTester:
+    def __init__(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeYouTubeHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        os.environ["YOUTUBE_API_KEY"] = "test-key"
+        os.environ["YOUTUBE_API_BASE"] = f"http://127.0.0.1:{self.server.server_port}"
+        os.environ["YOUTUBE_CONCURRENCY"] = "4"
+        os.environ["YOUTUBE_DAILY_QUOTA"] = "1000"  # 10 searches
+        from modules import learning_resources
+        self.lr = learning_resources
+        self.tests_run = 0
+        self.tests_passed = 0
+
+    def log_test(self, name, success, details=""):
+        """Log test results"""
+        self.tests_run += 1
+        if success:
+            self.tests_passed += 1
+            print(f"✅ {name} - PASSED {details}")
+        else:
+            print(f"❌ {name} - FAILED {details}")
+        return success
+
+    async def test_concurrent_fan_out(self):
+        skills = ["docker", "kubernetes", "aws", "sql", "git", "redis", "java", "rust"]
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        tick_task = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        videos = await self.lr.fetch_youtube_for_skills(skills)
+        elapsed = time.perf_counter() - start
+        tick_task.cancel()
+
+        ok = (
+            len(videos) == len(skills)
+            and FakeYouTubeHandler.max_in_flight <= 4
+            and elapsed < FakeYouTubeHandler.delay * len(skills) / 2
+            and ticks > 10
+        )
+        return self.log_test(
+            "Concurrent fan-out",
+            ok,
+            f"- {len(skills)} skills in {elapsed:.2f}s, max in flight {FakeYouTubeHandler.max_in_flight}, loop ticks {ticks}",
+        )
+
+    async def test_cached_per_skill(self):
+        before = FakeYouTubeHandler.requests_seen
+        videos, complete = await self.lr.fetch_youtube_for_skills_checked(["docker", "aws", "git"])
+        new_requests = FakeYouTubeHandler.requests_seen - before
+        return self.log_test("Per-skill TTL cache", new_requests == 0 and len(videos) == 3 and complete, f"- {new_requests} upstream calls")
+
+    async def test_quota_budget(self):
+        before = FakeYouTubeHandler.requests_seen
+        videos, complete = await self.lr.fetch_youtube_for_skills_checked(["go", "swift", "kotlin", "scala"])
+        new_requests = FakeYouTubeHandler.requests_seen - before
+        stats = self.lr.youtube_stats()
+        ok = new_requests == 2 and len(videos) == 2 and stats["quota_used"] == 1000 and not complete
+        return self.log_test("Daily quota budget (result marked incomplete)", ok, f"- {new_requests} upstream calls, {stats['quota_used']} units used")
+
+    async def test_deadline_marks_incomplete(self):
+        FakeYouTubeHandler.delay = 0.5
+        self.lr._youtube_quota["used"] = 0
+        videos, complete = await self.lr.fetch_youtube_for_skills_checked(["haskell"], deadline=0.1)
+        FakeYouTubeHandler.delay = 0.2
+        return self.log_test("Deadline overrun is reported as incomplete", videos == {} and not complete)
+
+    async def run(self):
+        try:
+            for test in (self.test_concurrent_fan_out, self.test_cached_per_skill, self.test_quota_budget,
+                         self.test_deadline_marks_incomplete):
+                await test()
+        finally:
+            from modules.http_client import close_http_client
+            await close_http_client()
+            self.server.shutdown()
+
+
+def main():
+    print("🚀 Starting YouTube Resource Fetching Tests (local fake server)")
+    print("=" * 50)
+
+    tester = YouTubeResourcesTester()
+    asyncio.run(tester.run())
+
+    print("\n" + "=" * 50)
+    print(f"📊 Test Results: {tester.tests_passed}/{tester.tests_run} passed")
+
+    if tester.tests_passed == tester.tests_run:
+        print("🎉 All tests passed!")
+        return 0
+    else:
+        print("⚠️  Some tests failed. Check the details above.")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())